@@ -15,24 +15,28 @@ class WorldConfig(BaseModel):
 
 router = APIRouter()
 
+# These set the process-wide defaults that new sessions start from; a running session keeps its own
+# SimulationSettings (change those with /sessions/{id}/config or the "configure" WebSocket command)
+
 @router.get("/config/world", response_model=WorldConfig)
 def get_world_config():
     return {"world_width": config.WORLD_WIDTH, "world_height": config.WORLD_HEIGHT}
 
 @router.post("/config/speed")
 def set_speed(settings: SpeedSetting):
+    """Default dt stretch for new sessions (coarser physics); use /sessions/{id}/playback to fast-forward a session at fixed dt."""
     config.SPEED_MULTIPLIER = max(0.1, settings.multiplier)
     return {"status": "success", "speed_multiplier": config.SPEED_MULTIPLIER}
 
 # --- THIS IS THE CORRECTED AND FINAL VERSION OF THIS ENDPOINT ---
 @router.post("/config/ai_level")
 def set_ai_level(settings: AiLevelSetting):
-    """Sets AI difficulty level and prints a confirmation to the console."""
+    """Sets the default AI difficulty level for new sessions and prints a confirmation to the console."""
     level = settings.level
-    if level not in ("basic", "normal", "advanced", "adaptive"):
+    if level not in ("basic", "normal", "advanced", "adaptive", "squad"):
         return {"error": "invalid level"}, 400
     
-    # This is the line that updates the global configuration
+    # This is the line that updates the default configuration
     config.AI_INTELLIGENCE_LEVEL = level
     
     # Added a print statement for immediate feedback in your terminal
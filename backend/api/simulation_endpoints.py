@@ -1,13 +1,16 @@
 # api/simulation_endpoints.py
 
-import asyncio  # <-- This import is essential for the WebSocket logic
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import List
+import asyncio, json, time  # <-- asyncio is essential for the WebSocket logic
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from typing import Dict, List, Optional
 
-from manager.simulation_manager import SimulationManager
-from schemas.api_schemas import Command, ScenarioInfo
+from manager.session_registry import SessionLimitError, SimulationSession, registry
+from manager.simulation_runner import FrameSubscriber, SimulationRunner, ViewportSubscriber
+from schemas.api_schemas import Command, PlaybackSettings, ProfileSettings, RecordingInfo, ReplayCreate, ScenarioInfo, SessionCreate, SessionInfo
+from schemas.batch_schemas import ConfigValue
+from services.lod_service import Viewport
+from services.recording_service import list_recordings, recording_path
 from services.scenario_service import get_scenario_list
-from core import config
 
 router = APIRouter()
 
@@ -16,62 +19,177 @@ def list_scenarios():
     """Provides the list of available scenarios to the GUI."""
     return get_scenario_list()
 
+# --- Sessions ---
+@router.get("/sessions", response_model=List[SessionInfo], tags=["Sessions"])
+async def list_sessions():
+    return registry.list()
+
+@router.post("/sessions", response_model=SessionInfo, status_code=status.HTTP_201_CREATED, tags=["Sessions"])
+async def create_session(settings: SessionCreate):
+    """
+    Starts a shared simulation that viewers join with /simulation?session_id=<id>.
+    Sessions have no owner: every viewer can send control commands, so share the id only with clients allowed to steer the run.
+    """
+    try:
+        return registry.create(settings.name, record=settings.record, settings=settings.settings).info()
+    except SessionLimitError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+def _get_session_or_404(session_id: str) -> SimulationSession:
+    session = registry.get(session_id)
+    if session is None: raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown session")
+    return session
+
+@router.get("/sessions/{session_id}", response_model=SessionInfo, tags=["Sessions"])
+async def get_session(session_id: str):
+    return _get_session_or_404(session_id).info()
+
+@router.delete("/sessions/{session_id}", tags=["Sessions"])
+async def delete_session(session_id: str):
+    if not await registry.close(session_id): raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown session")
+    return {"status": "success", "session_id": session_id}
+
+# --- Recordings ---
+@router.get("/recordings", response_model=List[RecordingInfo], tags=["Recordings"])
+async def get_recordings():
+    # Reading new or grown recordings blocks on file I/O; a thread keeps every session's tick loop running meanwhile
+    return await asyncio.to_thread(list_recordings)
+
+@router.post("/recordings/{name}/replay", response_model=SessionInfo, status_code=status.HTTP_201_CREATED, tags=["Recordings"])
+async def replay_recording(name: str, settings: ReplayCreate):
+    """Starts a replay session; viewers join with /simulation?session_id=<id> and can pause, resume and seek."""
+    path = recording_path(name)
+    if path is None: raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown recording")
+    try:
+        return registry.create_replay(path, settings.name).info()
+    except SessionLimitError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+# --- Settings ---
+@router.get("/sessions/{session_id}/config", tags=["Sessions"])
+async def get_session_config(session_id: str) -> Dict:
+    """The session's SimulationSettings (a replay reports the settings it was recorded with)."""
+    return _get_session_or_404(session_id).runner.settings()
+
+@router.post("/sessions/{session_id}/config", tags=["Sessions"])
+async def configure_session(session_id: str, changes: Dict[str, ConfigValue]) -> Dict:
+    """
+    Changes settings for this session only, e.g. {"AI_INTELLIGENCE_LEVEL": "advanced", "SPEED_MULTIPLIER": 2}.
+    Private sessions send the same changes over the WebSocket as {"command": "configure", "settings": {...}}.
+    """
+    try:
+        return _get_session_or_404(session_id).runner.configure(changes)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+# --- Playback ---
+@router.get("/sessions/{session_id}/playback", tags=["Sessions"])
+async def get_session_playback(session_id: str) -> Dict:
+    return _get_session_or_404(session_id).runner.playback()
+
+@router.post("/sessions/{session_id}/playback", tags=["Sessions"])
+async def configure_session_playback(session_id: str, settings: PlaybackSettings) -> Dict:
+    """
+    Fast-forward / slow motion without touching the physics: `speed` simulated seconds run per wall-clock
+    second as fixed DELTA_TIME ticks, and at most `frame_rate` frames per second are streamed.
+    Private sessions send the same settings over the WebSocket as {"command": "speed", ...}.
+    """
+    return _get_session_or_404(session_id).runner.set_playback(settings.speed, settings.frame_rate)
+
+# --- Profiling ---
+@router.get("/sessions/{session_id}/profile", tags=["Sessions"])
+async def get_session_profile(session_id: str) -> Dict:
+    """Rolling p50/p95/p99 per tick phase, entity counts and runner stats (tick rate, lag, dropped frames)."""
+    return _get_session_or_404(session_id).runner.profile()
+
+@router.post("/sessions/{session_id}/profile", tags=["Sessions"])
+async def configure_session_profile(session_id: str, settings: ProfileSettings) -> Dict:
+    runner = _get_session_or_404(session_id).runner
+    profiler = runner.profiler
+    if settings.enabled is not None: profiler.enabled = settings.enabled
+    if settings.embed_in_stream is not None: profiler.embed = settings.embed_in_stream
+    if settings.clear: profiler.clear()
+    return runner.profile()
+
+# --- Streaming ---
+def _change_view(runner: SimulationRunner, subscriber: FrameSubscriber, command: Command):
+    """"view" commands belong to one connection, so they never reach the shared runner; no viewport means the whole world."""
+    if not isinstance(subscriber, ViewportSubscriber): raise ValueError("connect with ?viewport= to change the view")
+    settings = runner.settings()
+    bounds = command.viewport if command.viewport is not None else [0, 0, settings["WORLD_WIDTH"], settings["WORLD_HEIGHT"]]
+    subscriber.set_view(Viewport.create(bounds, command.detail or subscriber.viewport.detail))
+
+async def _receive_commands(websocket: WebSocket, runner: SimulationRunner, subscriber: FrameSubscriber):
+    """Forwards client commands to the runner's queue until the client disconnects; malformed messages are skipped."""
+    while True:
+        text = await websocket.receive_text()
+        try:
+            command = Command(**json.loads(text))  # TypeError when the JSON is not an object
+            if command.command == "view": _change_view(runner, subscriber, command)
+            else: runner.submit(command)
+        except (TypeError, ValueError) as e:
+            print(f"Ignoring invalid command {text[:200]}: {e}")
+
 @router.websocket("/simulation")
-async def simulation_websocket(websocket: WebSocket):
-    """Handles simulation loop via WebSocket."""
+async def simulation_websocket(websocket: WebSocket, encoding: str = "json", session_id: Optional[str] = None,
+                               viewport: Optional[str] = None, detail: Optional[str] = None):
+    """
+    Streams frames from a session's fixed-timestep simulation task; commands are received concurrently.
+    Pass ?session_id= to join a shared session, otherwise a private one is created for this connection.
+    Every viewer of a shared session controls it: start, pause, resume, reset, speed and configure from any
+    connection apply to the whole session; only "view" is per connection.
+    Connect with ?encoding=delta for binary keyframe/delta frames instead of full JSON frames.
+    Connect with ?viewport=x0,y0,x1,y1 (and optionally &detail=high|medium|low) for JSON frames with full detail
+    inside the viewport and cluster summaries outside it; {"command": "view", "viewport": [...]} moves the view.
+    """
     await websocket.accept()
-    print("Client connected to simulation WebSocket.")
-    manager = SimulationManager()
+    view = None
+    if viewport is not None and encoding != "delta":
+        try: view = Viewport.parse(viewport, detail)
+        except ValueError as e:
+            await websocket.close(code=4400, reason=str(e)); return
+    if session_id is not None:
+        session = registry.get(session_id)
+        if session is None:
+            await websocket.close(code=4404, reason="Unknown session"); return
+    else:
+        try: session = registry.create(persistent=False)
+        except SessionLimitError as e:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason=str(e)); return
+    print(f"Client connected to simulation session {session.id} ({encoding}).")
+    runner = session.runner; profiler = runner.profiler
+    subscriber = runner.subscribe(encoding, view)
+    receiver = asyncio.create_task(_receive_commands(websocket, runner, subscriber))
 
     try:
         while True:
-            try:
-                # Non-blocking wait for a command from the client
-                command_json = await asyncio.wait_for(
-                    websocket.receive_json(), 
-                    timeout=config.DELTA_TIME
-                )
-                command = Command(**command_json)
-
-                if command.command == "start":
-                        # If custom counts are provided, use the new method
-                        if command.num_friendly is not None and command.num_enemy is not None:
-                            manager.start_custom(command.num_friendly, command.num_enemy)
-                        # Otherwise, fall back to the old scenario ID logic
-                        elif command.scenario_id:
-                            manager.start(command.scenario_id)
-
-                elif command.command == "pause":
-                        manager.pause()
-                    
-                    # --- ADD THESE TWO BLOCKS ---
-                elif command.command == "resume":
-                        manager.resume()
-
-                elif command.command == "reset":
-                        manager.reset()
-                    # -----------------------------
-
-            except asyncio.TimeoutError:
-                # This is normal - no command was received, so we just proceed
-                pass
-            except WebSocketDisconnect:
-                # Handle client disconnecting gracefully
+            # Wait for the newest frame (or for the client to go away)
+            frame_task = asyncio.create_task(subscriber.get())
+            done, _ = await asyncio.wait({frame_task, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver in done:
+                frame_task.cancel()
+                receiver.result()  # re-raises WebSocketDisconnect / errors
                 break
-
-            # Always update the simulation state
-            state = manager.update()
-
-            # Send the new state to the client
-            await websocket.send_json(state.dict())
-
-            # Wait for the next frame
-            await asyncio.sleep(config.DELTA_TIME)
+            frame = frame_task.result()
+            if frame is None:  # session was closed, or stopped by a failed tick
+                error = getattr(runner, "error", None)
+                if error: await websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason=error[:120])
+                else: await websocket.close()
+                break
+            started = time.perf_counter()
+            if subscriber.encoding == "delta": await websocket.send_bytes(frame)
+            else: await websocket.send_text(frame)
+            profiler.record("send", time.perf_counter() - started)
 
     except WebSocketDisconnect:
         print("Client disconnected from simulation WebSocket.")
     except Exception as e:
         print(f"An unexpected error occurred in the simulation loop: {e}")
     finally:
-        manager.reset()
-        print("Simulation session ended and manager has been reset.")
+        receiver.cancel()
+        await registry.leave(session, subscriber)
+        print(f"Client left simulation session {session.id}.")
@@ -0,0 +1,192 @@
+# backend/benchmarks/simulation_benchmark.py
+"""
+Headless throughput and scaling benchmarks for SimulationManager: ticks/sec, per-tick latency
+percentiles, stream frame size and encode time (JSON and binary delta), and peak memory.
+
+    cd backend
+    python -m benchmarks.simulation_benchmark --out bench.json                   # full matrix
+    python -m benchmarks.simulation_benchmark --quick --baseline bench.json     # exit code 1 on regression
+    python -m benchmarks.simulation_benchmark --scaling                         # exit code 1 if a tick grows like friendlies x enemies
+
+Every case runs in a fresh process, so config changes never leak between cases and the peak RSS
+belongs to that case alone; a case whose tick hangs past --timeout is killed and reported as such.
+"""
+import argparse, json, multiprocessing, platform, resource, subprocess, sys, time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+from core import config
+from core.simulation_settings import SimulationSettings
+from manager.simulation_manager import SimulationManager
+from schemas.benchmark_schemas import BenchmarkCase, BenchmarkResult, LatencySummary
+from services.frame_serializer import encode_frame
+from services.scenario_service import SCENARIOS_BLUEPRINT
+from services.stream_codec import DeltaEncoder
+
+AI_LEVELS = ("basic", "normal", "advanced", "adaptive", "squad")
+SWARM_SIZES = (10, 100, 1000, 10000)  # total drones, split evenly between the teams
+QUICK_SIZES = (10, 100)
+SCALING_SIZES = (1000, 2000, 4000)
+MAX_SCALING_EXPONENT = 1.8  # tick time ~ drones^exponent; building any friendly x enemy matrix per tick shows up as ~2
+# (metric path, direction): +1 means higher is worse, -1 means lower is worse
+REGRESSION_METRICS = (("tick.p50_ms", 1), ("tick.p95_ms", 1), ("ticks_per_sec", -1), ("json_frame.p50_ms", 1),
+                      ("json_frame_bytes", 1), ("delta_frame_bytes", 1), ("peak_rss_mb", 1))
+
+# --- Case matrix ---
+def build_cases(sizes: Iterable[int] = SWARM_SIZES, ai_levels: Iterable[str] = AI_LEVELS, scenario_ids: Iterable[str] = tuple(SCENARIOS_BLUEPRINT),
+                **settings) -> List[BenchmarkCase]:
+    """Every blueprint scenario and every swarm size at every AI level; `settings` go to each BenchmarkCase."""
+    cases = []
+    for level in ai_levels:
+        cases += [BenchmarkCase(name=f"{s}/{level}", ai_level=level, scenario_id=s, **settings) for s in scenario_ids]
+        cases += [BenchmarkCase(name=f"custom_{n}/{level}", ai_level=level, num_friendly=n // 2, num_enemy=n - n // 2, **settings) for n in sizes]
+    return cases
+
+# --- Measurement (runs inside the case's process) ---
+def _summary(seconds: List[float]) -> Optional[LatencySummary]:
+    if not seconds: return None
+    ms = np.asarray(seconds) * 1000
+    p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+    return LatencySummary(mean_ms=float(ms.mean()), p50_ms=float(p50), p95_ms=float(p95), p99_ms=float(p99), max_ms=float(ms.max()))
+
+def run_case(case: BenchmarkCase) -> BenchmarkResult:
+    settings = SimulationSettings.defaults(AI_INTELLIGENCE_LEVEL=case.ai_level,
+                                           MAX_CUSTOM_DRONES_PER_TEAM=max(config.MAX_CUSTOM_DRONES_PER_TEAM, case.num_friendly or 0, case.num_enemy or 0))
+    manager = SimulationManager(save_results=False, settings=settings)
+    if case.scenario_id: manager.start(case.scenario_id, seed=case.seed)
+    else: manager.start_custom(case.num_friendly or 0, case.num_enemy or 0, seed=case.seed)
+    drones = len(manager.swarm)
+
+    encoder = DeltaEncoder()
+    tick_times, json_times, json_sizes, delta_times, delta_sizes = [], [], [], [], []
+    started = time.perf_counter()
+    for _ in range(case.warmup_ticks):
+        if manager.status != "running" or time.perf_counter() - started > case.max_seconds: break
+        manager.step()
+    started = time.perf_counter()
+    while len(tick_times) < case.ticks and manager.status == "running" and time.perf_counter() - started < case.max_seconds:
+        t0 = time.perf_counter(); manager.step(); tick_times.append(time.perf_counter() - t0)
+        if len(tick_times) % case.serialize_every: continue
+        t0 = time.perf_counter(); text = encode_frame(manager); json_times.append(time.perf_counter() - t0)
+        json_sizes.append(len(text.encode("utf-8")))
+        t0 = time.perf_counter(); payload, snapshot = encoder.encode(manager, {}); encoder.commit(snapshot); delta_times.append(time.perf_counter() - t0)
+        delta_sizes.append(len(payload))
+
+    return BenchmarkResult(
+        case=case, status="ok", drones=drones, ticks=len(tick_times), finished_early=manager.status != "running",
+        ticks_per_sec=len(tick_times) / sum(tick_times) if tick_times else 0.0, tick=_summary(tick_times),
+        json_frame=_summary(json_times), json_frame_bytes=float(np.mean(json_sizes)) if json_sizes else 0.0,
+        delta_frame=_summary(delta_times), delta_frame_bytes=float(np.mean(delta_sizes)) if delta_sizes else 0.0,
+        peak_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)  # ru_maxrss is in KiB on Linux
+
+def _case_process(case: Dict, connection):
+    try: connection.send(run_case(BenchmarkCase(**case)).dict())
+    except Exception as e: connection.send(BenchmarkResult(case=BenchmarkCase(**case), status="error", error=repr(e)).dict())
+
+def run_isolated(case: BenchmarkCase, timeout: float) -> BenchmarkResult:
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_case_process, args=(case.dict(), sender), daemon=True)
+    process.start(); sender.close()
+    try:
+        if receiver.poll(timeout): return BenchmarkResult(**receiver.recv())
+        process.kill()
+        return BenchmarkResult(case=case, status="timeout", error=f"No result within {timeout:.0f}s (a single tick may exceed the budget)")
+    except EOFError:  # the process died without reporting, e.g. killed for running out of memory
+        return BenchmarkResult(case=case, status="error", error=f"Benchmark process exited with code {process.exitcode}")
+    finally:
+        process.join()
+
+# --- Baseline comparison ---
+def _metric(result: Dict, path: str) -> Optional[float]:
+    value = result
+    for key in path.split("."):
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+def compare(results: List[BenchmarkResult], baseline: Dict, tolerance: float) -> List[Tuple[str, str, float, float, float]]:
+    """(case, metric, baseline, current, relative change) for every metric that got worse by more than `tolerance`."""
+    previous = {r["case"]["name"]: r for r in baseline.get("results", []) if r["status"] == "ok"}
+    regressions = []
+    for result in results:
+        base = previous.get(result.case.name)
+        if result.status != "ok" or base is None: continue
+        current = result.dict()
+        for path, direction in REGRESSION_METRICS:
+            old, new = _metric(base, path), _metric(current, path)
+            if not old or new is None: continue
+            change = (new - old) / old
+            if change * direction > tolerance: regressions.append((result.case.name, path, old, new, change))
+    return regressions
+
+def scaling(results: List[BenchmarkResult]) -> List[Tuple[str, int, int, float]]:
+    """(AI level, smallest size, largest size, exponent) per level: the least-squares slope of log p50 tick time over log drones."""
+    by_level: Dict[str, List[BenchmarkResult]] = {}
+    for result in results:
+        if result.status == "ok" and result.case.scenario_id is None and result.ticks: by_level.setdefault(result.case.ai_level, []).append(result)
+    growth = []
+    for level, runs in by_level.items():
+        drones = np.array([r.drones for r in runs], dtype=float); p50 = np.array([r.tick.p50_ms for r in runs])
+        if len(np.unique(drones)) < 2 or not np.all(p50 > 0): continue
+        growth.append((level, int(drones.min()), int(drones.max()), float(np.polyfit(np.log(drones), np.log(p50), 1)[0])))
+    return growth
+
+def _environment() -> Dict:
+    try: commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError): commit = None
+    return {"timestamp": datetime.now().isoformat(timespec="seconds"), "git_commit": commit, "python": platform.python_version(),
+            "numpy": np.__version__, "platform": platform.platform(), "cpu_count": multiprocessing.cpu_count()}
+
+# --- CLI ---
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark simulation throughput and scaling.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=None, help="Total drone counts for custom battles (default: 10 100 1000 10000)")
+    parser.add_argument("--ai-levels", nargs="+", default=list(AI_LEVELS), choices=AI_LEVELS)
+    parser.add_argument("--scenarios", nargs="*", default=None, choices=sorted(SCENARIOS_BLUEPRINT), help="Blueprint scenarios (default: all)")
+    parser.add_argument("--ticks", type=int, default=300, help="Measured ticks per case")
+    parser.add_argument("--warmup", type=int, default=30, help="Unmeasured ticks before measuring")
+    parser.add_argument("--max-seconds", type=float, default=60.0, help="Wall-time budget per case; stops measuring early")
+    parser.add_argument("--timeout", type=float, default=None, help="Kill a case after this long (default: 3x max-seconds + 30)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="Small sizes and fewer ticks, for a fast regression check")
+    parser.add_argument("--scaling", action="store_true", help="Custom battles at growing sizes only; fails if tick time grows like friendlies x enemies")
+    parser.add_argument("--max-exponent", type=float, default=MAX_SCALING_EXPONENT, help="Largest tolerated growth exponent for --scaling")
+    parser.add_argument("--out", help="Write the results as JSON to this path (usable as a later --baseline)")
+    parser.add_argument("--baseline", help="Compare against a previous --out file")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Relative slowdown/growth that counts as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SCALING_SIZES if args.scaling else SWARM_SIZES)
+    ticks = min(args.ticks, 120) if args.quick or args.scaling else args.ticks
+    scenarios = () if args.scaling else SCENARIOS_BLUEPRINT if args.scenarios is None else args.scenarios
+    cases = build_cases(sizes, args.ai_levels, scenarios, seed=args.seed, warmup_ticks=args.warmup, ticks=ticks, max_seconds=args.max_seconds)
+    timeout = args.timeout or args.max_seconds * 3 + 30
+
+    print(f"[Benchmark] Running {len(cases)} cases...")
+    results = []
+    for case in cases:
+        result = run_isolated(case, timeout); results.append(result)
+        if result.status != "ok": print(f"  {case.name:<32} {result.status.upper()}: {result.error}"); continue
+        print(f"  {case.name:<32} {result.drones:>6} drones  {result.ticks_per_sec:>8.1f} ticks/s  p50={result.tick.p50_ms:.2f}ms p99={result.tick.p99_ms:.2f}ms  "
+              f"json={result.json_frame_bytes / 1024:.1f}KiB delta={result.delta_frame_bytes / 1024:.1f}KiB  rss={result.peak_rss_mb:.0f}MiB"
+              + ("  (battle ended early)" if result.finished_early else ""))
+
+    report = {"environment": _environment(), "results": [r.dict() for r in results]}
+    if args.out:
+        with open(args.out, "w") as f: json.dump(report, f, indent=2)
+    if args.scaling:
+        growth = scaling(results)
+        for level, small, large, exponent in growth:
+            print(f"[Benchmark] {level:<9} {small:>6}..{large:<6} drones: tick time ~ drones^{exponent:.2f}"
+                  + (f"  ABOVE {args.max_exponent}" if exponent > args.max_exponent else ""))
+        if any(exponent > args.max_exponent for *_, exponent in growth): return 1
+    if not args.baseline: return 0
+    with open(args.baseline) as f: baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for name, path, old, new, change in regressions:
+        print(f"[Benchmark] REGRESSION {name} {path}: {old:.3f} -> {new:.3f} ({change:+.0%})")
+    print(f"[Benchmark] {len(regressions)} regression(s) against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
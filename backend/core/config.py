@@ -1,17 +1,59 @@
 # backend/core/config.py
+from typing import Optional
 
 # --- Simulation Timing ---
 # Rate at which the simulation updates (in seconds). 60Hz is a good target.
 DELTA_TIME: float = 1 / 60.0
 # Initial speed multiplier for the simulation (can be changed via API)
 SPEED_MULTIPLIER: float = 1.0
+# Max ticks the runner executes in one wake-up to catch up after a stall; older backlog is skipped
+MAX_CATCHUP_TICKS: int = 5
+# Frames streamed per second, independent of the tick rate: fast-forwarded sessions run several fixed
+# DELTA_TIME ticks per frame instead of stretching dt like SPEED_MULTIPLIER (see /sessions/{id}/playback)
+STREAM_FRAME_RATE: float = 60.0
+# Upper bound for the playback speed (simulated seconds per wall-clock second)
+MAX_FAST_FORWARD: float = 20.0
+# Viewport streams (see services/lod_service.py): drones outside the viewport are summarized per cell of this size
+# (halved for detail=high, doubled for detail=low), and those summaries are only re-sent every LOD_FAR_INTERVAL frames
+LOD_CLUSTER_CELL_SIZE: float = 100.0
+LOD_FAR_INTERVAL: int = 4
+# Simulations that may run at once; each session is watched by any number of viewers
+MAX_SESSIONS: int = 8
+# Per-phase tick profiler (see core/profiler.py); can also be toggled per session via /sessions/{id}/profile
+PROFILING_ENABLED: bool = False
+# Samples kept per phase for the rolling percentiles (600 = 10 s at 60 Hz)
+PROFILER_WINDOW: int = 600
 
 # --- World & Scenario ---
 # These MUST match the frontend canvas dimensions for correct positioning
 WORLD_WIDTH: int = 1200
 WORLD_HEIGHT: int = 800
-# Path for saving simulation results
+# Cell size of the uniform grid used for proximity queries (see core/spatial_index.py)
+SPATIAL_CELL_SIZE: float = 100.0
+# Per-team cap for custom battles started from the GUI; raise it once benchmarks/ shows the tick budget holds
+MAX_CUSTOM_DRONES_PER_TEAM: int = 20
+# Live visual effects kept per session (see core/event_buffer.py); beyond this the oldest are dropped
+VISUAL_EVENT_CAPACITY: int = 4096
+
+# --- Results ---
+# Finished runs go through the background results sink (see services/results_sink.py)
+RESULTS_BACKEND: str = "csv" # Options: csv, sqlite, parquet (needs pyarrow)
+# Path for saving simulation results (per-drone stats go to <name>_drones.csv next to it)
 RESULTS_CSV_PATH: str = "simulation_results.csv"
+RESULTS_SQLITE_PATH: str = "simulation_results.db"
+RESULTS_PARQUET_DIR: str = "simulation_results"
+# The writer flushes once this many records are queued, or after this many seconds
+RESULTS_BATCH_SIZE: int = 200
+RESULTS_FLUSH_INTERVAL: float = 1.0
+# Where recorded runs (*.vrec, see services/recording_service.py) are written and replayed from
+RECORDINGS_DIR: str = "recordings"
+# Ticks between full keyframes in a recording; seeking decodes at most this many frames
+RECORDING_KEYFRAME_INTERVAL: int = 60
+# Per-tick trajectory store (see core/trajectory_store.py): set a directory to record every run, None disables it
+TRAJECTORY_DIR: Optional[str] = None
+# Ticks buffered in memory before they are appended to disk, and record every Nth tick only
+TRAJECTORY_CHUNK_TICKS: int = 600
+TRAJECTORY_STRIDE: int = 1
 
 # --- Drone Technical Specifications ---
 # Speeds are in meters per second (or units per second)
@@ -35,4 +77,30 @@ THREATENING_RANGE: float = ENEMY_DRONE_SPEED * 10.0
 # General sensor range for AI decisions (e.g., detecting nearby friendlies)
 SENSOR_RANGE: float = 800.0
 # Initial AI intelligence level (can be changed via API)
-AI_INTELLIGENCE_LEVEL: str = "basic" # Options: basic, normal, advanced, adaptive
\ No newline at end of file
+AI_INTELLIGENCE_LEVEL: str = "basic" # Options: basic, normal, advanced, adaptive, squad
+# Hunter/threat assignment solver for the advanced AI (see services/assignment_service.py)
+ASSIGNMENT_SOLVER: str = "auction" # Options: auction (warm-started), hungarian (exact)
+# Friendly AI planner (see services/planner_service.py): "incremental" keeps assignments and re-plans a drone only on
+# a trigger (target lost, guardian zone changed, threat ranking changed, intercept time worsened); "full" re-plans every tick.
+# Only the advanced, adaptive and squad levels plan incrementally; basic and normal always re-plan every tick
+AI_PLANNER: str = "incremental" # Options: incremental, full
+# Seconds a drone's time-to-intercept may worsen past the value it was assigned with before it is re-planned
+PLANNER_TTI_SLACK: float = 1.0
+# Top-N threat ranks watched for changes; a change queues every friendly for a budgeted re-plan
+PLANNER_THREAT_RANKS: int = 3
+# Ticks between full re-plans, and queued drones re-planned per tick while one is being worked through
+PLANNER_REFRESH_TICKS: int = 60
+PLANNER_REPLAN_BUDGET: int = 8
+# --- Analytics (see services/analytics_service.py) ---
+# Ticks between samples of the AnalysisData snapshot figures (6 ticks = 10 Hz at 60 Hz physics)
+ANALYTICS_INTERVAL_TICKS: int = 6
+# Sim seconds covered by the rolling kill rate, time-to-intercept histogram bin width and engagement heatmap cell size
+ANALYTICS_WINDOW: float = 10.0
+ANALYTICS_HISTOGRAM_BIN: float = 5.0
+ANALYTICS_HEATMAP_CELL: float = 100.0
+
+# --- Squad AI level (see services/squad_service.py) ---
+# Enemies per formation cluster, seconds of velocity mixed into the clustering, and k-means steps per tick
+SQUAD_SIZE: int = 24
+SQUAD_LOOKAHEAD: float = 2.0
+SQUAD_KMEANS_ITERATIONS: int = 2
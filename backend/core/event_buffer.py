@@ -0,0 +1,92 @@
+# backend/core/event_buffer.py
+from typing import Dict, List, Optional
+import numpy as np
+from core.swarm_state import TEAMS
+
+# --- Categorical encodings (array values index into these tuples) ---
+EVENT_TYPES = ("neutralization", "weapon_fire", "comm_link")
+NEUTRALIZATION, WEAPON_FIRE, COMM_LINK = 0, 1, 2
+NO_TEAM = -1
+
+
+class VisualEventBuffer:
+    """
+    Fixed-capacity ring buffer of short-lived visual events (tracers, explosions, comm links).
+    Event ids are consecutive integers and event `n` lives in slot n % capacity, so emission order is
+    id order; once the buffer is full the oldest live event is overwritten (counted in `dropped`).
+    TTLs decay in place and expiry is a mask update; events become dicts only in to_dicts().
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = max(1, capacity)
+        self.id = np.full(self.capacity, -1, dtype=np.int64)
+        self.type = np.zeros(self.capacity, dtype=np.int8)
+        self.team = np.full(self.capacity, NO_TEAM, dtype=np.int8)
+        self.position = np.zeros((self.capacity, 2))
+        self.target_position = np.zeros((self.capacity, 2))
+        self.has_target = np.zeros(self.capacity, dtype=bool)
+        self.ttl = np.zeros(self.capacity)
+        self.live = np.zeros(self.capacity, dtype=bool)
+        self.next_id: int = 0
+        self.dropped: int = 0
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.live))
+
+    def clear(self):
+        self.live[:] = False
+
+    def emit(self, kind: int, position, ttl: float, team: int = NO_TEAM, target_position=None) -> int:
+        slot = self.next_id % self.capacity
+        if self.live[slot]: self.dropped += 1
+        self.id[slot], self.type[slot], self.team[slot], self.ttl[slot] = self.next_id, kind, team, ttl
+        self.position[slot] = position
+        self.has_target[slot] = target_position is not None
+        if target_position is not None: self.target_position[slot] = target_position
+        self.live[slot] = True
+        self.next_id += 1
+        return self.next_id - 1
+
+    def emit_many(self, kind: int, positions: np.ndarray, ttl: float, teams: np.ndarray, target_positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """Vectorized emit of len(positions) events of one kind; returns their ids."""
+        count = len(positions)
+        ids = np.arange(self.next_id, self.next_id + count, dtype=np.int64)
+        self.next_id += count
+        # More events than slots: only the newest `capacity` are kept
+        keep = slice(max(0, count - self.capacity), None)
+        ids, positions, teams = ids[keep], positions[keep], np.broadcast_to(teams, (count,))[keep]
+        if target_positions is not None: target_positions = target_positions[keep]
+        self.dropped += count - len(ids)
+        slots = ids % self.capacity
+        self.dropped += int(np.count_nonzero(self.live[slots]))
+        self.id[slots], self.type[slots], self.team[slots], self.ttl[slots] = ids, kind, teams, ttl
+        self.position[slots] = positions
+        self.has_target[slots] = target_positions is not None
+        if target_positions is not None: self.target_position[slots] = target_positions
+        self.live[slots] = True
+        return ids
+
+    def decay(self, dt: float):
+        """Drops events whose ttl has run out, then ages the rest by dt."""
+        self.live &= self.ttl > 0
+        self.ttl[self.live] -= dt
+
+    def live_slots(self) -> np.ndarray:
+        """Slots of live events in emission order."""
+        slots = np.flatnonzero(self.live)
+        return slots[np.argsort(self.id[slots], kind='stable')]
+
+    def ids(self) -> np.ndarray:
+        return self.id[self.live_slots()]
+
+    def to_dicts(self, slots: Optional[np.ndarray] = None) -> List[Dict]:
+        """Wire format (the VisualEvent schema) for the given slots, default every live event in emission order."""
+        slots = self.live_slots() if slots is None else slots
+        teams = [None] + list(TEAMS)  # NO_TEAM indexes the leading None
+        return [
+            {"id": event_id, "type": EVENT_TYPES[kind], "position": {"x": pos[0], "y": pos[1]}, "ttl": ttl, "team": teams[team + 1],
+             "target_position": {"x": target[0], "y": target[1]} if has_target else None}
+            for event_id, kind, pos, ttl, team, target, has_target in zip(
+                self.id[slots].tolist(), self.type[slots].tolist(), self.position[slots].tolist(), self.ttl[slots].tolist(),
+                self.team[slots].tolist(), self.target_position[slots].tolist(), self.has_target[slots].tolist())
+        ]
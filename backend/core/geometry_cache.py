@@ -0,0 +1,55 @@
+# backend/core/geometry_cache.py
+from typing import Dict, Optional
+import numpy as np
+from core.swarm_state import SwarmState, FRIENDLY, ENEMY
+
+
+def distance_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(N, M) Euclidean distances between (N, 2) and (M, 2) points, bit-identical to physics_service.calculate_distance."""
+    diff = np.asarray(a, dtype=float).reshape(-1, 1, 2) - np.asarray(b, dtype=float).reshape(1, -1, 2)
+    # Same dot-product reduction as the 1-D np.linalg.norm, so ties and argmins match the scalar code
+    return np.sqrt((diff[..., None, :] @ diff[..., :, None])[..., 0, 0])
+
+
+class GeometryCache:
+    """
+    Per-tick geometry over SwarmState positions: the team rows and the drone x asset distance matrix, built on
+    first use and reused by every consumer until sync() sees moved positions or added/removed rows. Assets are few,
+    so that matrix grows with the drone count; nothing here is friendly x enemy. Nearest-neighbour and radius
+    queries go through SpatialIndex, and bounded blocks (e.g. hunters x open threats) use distance_matrix directly.
+    """
+
+    def __init__(self):
+        self.friendly = np.zeros(0, dtype=np.int64)
+        self.enemy = np.zeros(0, dtype=np.int64)
+        self._matrices: Dict[str, np.ndarray] = {}
+        self._state: Optional[SwarmState] = None
+        self._generation = -1
+        self._position = np.zeros((0, 2))
+        self._asset_position = np.zeros((0, 2))
+        self.builds: int = 0  # matrices computed since creation
+
+    def sync(self, state: SwarmState):
+        if state is self._state and state.generation == self._generation:
+            if np.array_equal(state.position, self._position) and np.array_equal(state.asset_position, self._asset_position): return
+        else:
+            self._state, self._generation = state, state.generation
+            self.friendly, self.enemy = state.team_indices(FRIENDLY), state.team_indices(ENEMY)
+        self._position = state.position.copy(); self._asset_position = state.asset_position.copy()
+        self._matrices.clear()
+
+    def _matrix(self, name: str, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        matrix = self._matrices.get(name)
+        if matrix is None:
+            matrix = self._matrices[name] = distance_matrix(a, b); self.builds += 1
+        return matrix
+
+    @property
+    def drone_asset(self) -> np.ndarray:
+        """Rows are drone rows, columns are asset indices."""
+        return self._matrix("drone_asset", self._position, self._asset_position)
+
+    def between(self, rows: np.ndarray, other_rows: np.ndarray) -> np.ndarray:
+        """Pairwise distance from rows[i] to other_rows[i] (same arithmetic as distance_matrix), never building a matrix."""
+        diff = self._position[np.asarray(rows, dtype=np.int64)] - self._position[np.asarray(other_rows, dtype=np.int64)]
+        return np.sqrt((diff[:, None, :] @ diff[:, :, None])[:, 0, 0])
@@ -0,0 +1,66 @@
+# backend/core/profiler.py
+import time
+from collections import deque
+from typing import Deque, Dict
+import numpy as np
+
+
+class _Phase:
+    """Reusable timer for one named phase; records the elapsed wall time on exit."""
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler: "TickProfiler", name: str):
+        self.profiler, self.name, self.started = profiler, name, 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.started)
+
+
+class _NullPhase:
+    __slots__ = ()
+    def __enter__(self): pass
+    def __exit__(self, *exc): pass
+
+_NULL_PHASE = _NullPhase()
+
+
+class TickProfiler:
+    """
+    Per-phase wall-clock timers over a rolling window of samples (`window` per phase).
+    While disabled, phase() hands back one shared no-op, so instrumented code pays a method call and nothing else.
+    """
+
+    def __init__(self, enabled: bool = False, window: int = 600, embed: bool = False):
+        self.enabled = enabled
+        self.embed = embed  # also publish report() inside every stream frame
+        self.window = window
+        self.samples: Dict[str, Deque[float]] = {}
+        self._phases: Dict[str, _Phase] = {}
+
+    def phase(self, name: str):
+        if not self.enabled: return _NULL_PHASE
+        timer = self._phases.get(name)
+        if timer is None: timer = self._phases[name] = _Phase(self, name)
+        return timer
+
+    def record(self, name: str, seconds: float):
+        if not self.enabled: return
+        samples = self.samples.get(name)
+        if samples is None: samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def clear(self):
+        self.samples.clear()
+
+    def report(self) -> Dict:
+        phases = {}
+        for name, samples in self.samples.items():
+            if not samples: continue
+            ms = np.fromiter(samples, dtype=float, count=len(samples)) * 1000
+            p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+            phases[name] = {"samples": len(ms), "mean_ms": round(float(ms.mean()), 4), "p50_ms": round(float(p50), 4),
+                            "p95_ms": round(float(p95), 4), "p99_ms": round(float(p99), 4), "max_ms": round(float(ms.max()), 4)}
+        return {"enabled": self.enabled, "embed_in_stream": self.embed, "window": self.window, "phases": phases}
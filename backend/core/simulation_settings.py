@@ -0,0 +1,82 @@
+# backend/core/simulation_settings.py
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Dict
+from core import config
+
+# Allowed values for the string settings
+CHOICES: Dict[str, tuple] = {
+    "AI_INTELLIGENCE_LEVEL": ("basic", "normal", "advanced", "adaptive", "squad"),
+    "ASSIGNMENT_SOLVER": ("auction", "hungarian"),
+    "AI_PLANNER": ("incremental", "full"),
+}
+# Number settings that may be 0; every other one must be positive
+NON_NEGATIVE = ("PLANNER_TTI_SLACK", "SQUAD_LOOKAHEAD")
+
+
+@dataclass(frozen=True)
+class SimulationSettings:
+    """
+    Everything one simulation reads while it runs, as an immutable value held by its SimulationManager.
+    Field names are the core.config names; the module values are only the defaults for new sessions.
+    A change swaps in a new object (replace()), so sessions in one process never see each other's settings.
+    """
+    # Timing
+    DELTA_TIME: float
+    SPEED_MULTIPLIER: float
+    # World & scenario
+    WORLD_WIDTH: int
+    WORLD_HEIGHT: int
+    SPATIAL_CELL_SIZE: float
+    MAX_CUSTOM_DRONES_PER_TEAM: int
+    VISUAL_EVENT_CAPACITY: int
+    # Drones & combat
+    FRIENDLY_DRONE_SPEED: float
+    ENEMY_DRONE_SPEED: float
+    DRONE_MAX_SPEED: float
+    FIRING_RANGE: float
+    WEAPON_COOLDOWN: float
+    WEAPON_DAMAGE: int
+    # AI & threat logic
+    COMMUNICATION_RANGE: float
+    THREATENING_RANGE: float
+    SENSOR_RANGE: float
+    AI_INTELLIGENCE_LEVEL: str
+    ASSIGNMENT_SOLVER: str
+    AI_PLANNER: str
+    PLANNER_TTI_SLACK: float
+    PLANNER_THREAT_RANKS: int
+    PLANNER_REFRESH_TICKS: int
+    PLANNER_REPLAN_BUDGET: int
+    SQUAD_SIZE: int
+    SQUAD_LOOKAHEAD: float
+    SQUAD_KMEANS_ITERATIONS: int
+    # Analytics
+    ANALYTICS_INTERVAL_TICKS: int
+    ANALYTICS_WINDOW: float
+    ANALYTICS_HISTOGRAM_BIN: float
+    ANALYTICS_HEATMAP_CELL: float
+
+    @classmethod
+    def defaults(cls, **changes) -> "SimulationSettings":
+        """The current core.config values, with `changes` applied (and validated)."""
+        return cls(**{f.name: getattr(config, f.name) for f in fields(cls)}).replace(**changes)
+
+    def replace(self, **changes) -> "SimulationSettings":
+        """A copy with `changes` applied; raises ValueError for unknown names or invalid values."""
+        types = {f.name: f.type for f in fields(self)}
+        unknown = [name for name in changes if name not in types]
+        if unknown: raise ValueError(f"Unknown simulation setting(s): {', '.join(unknown)}")
+        checked = {}
+        for name, value in changes.items():
+            kind = types[name]
+            if kind is str:
+                if value not in CHOICES.get(name, (value,)): raise ValueError(f"{name} must be one of {', '.join(CHOICES[name])}, not {value!r}")
+            elif isinstance(value, bool) or not isinstance(value, (int, float)) or (kind is int and value != int(value)):
+                raise ValueError(f"{name} must be a{'n integer' if kind is int else ' number'}, not {value!r}")
+            elif value < 0 or (value == 0 and name not in NON_NEGATIVE):
+                raise ValueError(f"{name} must be {'non-negative' if name in NON_NEGATIVE else 'positive'}, not {value!r}")
+            checked[name] = kind(value)
+        return replace(self, **checked) if checked else self
+
+    def dict(self) -> Dict:
+        return asdict(self)
@@ -0,0 +1,169 @@
+# backend/core/spatial_index.py
+from typing import Dict, Optional
+import numpy as np
+from core.swarm_state import SwarmState, TEAMS
+
+_CELL_OFFSET = 1 << 20  # keeps cell keys positive for drones slightly outside the world
+
+
+class _Grid:
+    """Drone rows bucketed by grid cell, stored as one array sorted by cell key."""
+
+    def __init__(self, rows: np.ndarray, keys: np.ndarray):
+        order = np.argsort(keys, kind='stable')
+        self.rows = rows[order]
+        self.keys = keys[order]
+        # Occupied cells as slices of `rows`
+        _, self.cell_start, self.cell_count = np.unique(self.keys, return_index=True, return_counts=True)
+
+    def rows_in_cells(self, cell_keys: np.ndarray) -> np.ndarray:
+        starts = np.searchsorted(self.keys, cell_keys, side='left')
+        ends = np.searchsorted(self.keys, cell_keys, side='right')
+        filled = ends > starts
+        if not filled.any(): return np.zeros(0, dtype=np.int64)
+        return np.concatenate([self.rows[s:e] for s, e in zip(starts[filled], ends[filled])])
+
+
+class SpatialIndex:
+    """
+    Uniform-grid index over SwarmState positions, one grid per team.
+    sync() rebuilds after drones are added/removed and otherwise only re-buckets
+    when some drone crossed a cell boundary. All queries return row indices.
+    """
+
+    def __init__(self, cell_size: float = 100.0):
+        self.cell_size = float(cell_size)
+        self.position = np.zeros((0, 2))
+        self.team = np.zeros(0, dtype=np.int8)
+        self._cell = np.zeros((0, 2), dtype=np.int64)
+        self._grids: Dict[int, _Grid] = {}
+        self._state: Optional[SwarmState] = None
+        self._generation = -1
+
+    def sync(self, state: SwarmState):
+        if state is not self._state or state.generation != self._generation:
+            self.rebuild(state)
+            return
+        self.position = state.position.copy()
+        cell = self._cells(self.position)
+        if not np.array_equal(cell, self._cell):
+            self._cell = cell
+            self._bucket()
+
+    def rebuild(self, state: SwarmState):
+        self._state, self._generation = state, state.generation
+        self.position = state.position.copy()
+        self.team = state.team.copy()
+        self._cell = self._cells(self.position)
+        self._bucket()
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        return np.floor(points / self.cell_size).astype(np.int64) + _CELL_OFFSET
+
+    @staticmethod
+    def _keys(cells: np.ndarray) -> np.ndarray:
+        return (cells[..., 0] << 21) | cells[..., 1]
+
+    def _bucket(self):
+        keys = self._keys(self._cell)
+        self._grids = {team: _Grid(np.flatnonzero(self.team == team), keys[self.team == team]) for team in range(len(TEAMS))}
+
+    def _candidates(self, point: np.ndarray, radius: float, team: Optional[int]) -> np.ndarray:
+        return self._candidates_in(np.asarray(point) - radius, np.asarray(point) + radius, team)
+
+    def _candidates_in(self, low_point: np.ndarray, high_point: np.ndarray, team: Optional[int]) -> np.ndarray:
+        low, high = self._cells(low_point), self._cells(high_point)
+        cx, cy = np.meshgrid(np.arange(low[0], high[0] + 1), np.arange(low[1], high[1] + 1), indexing='ij')
+        cell_keys = np.sort(self._keys(np.stack([cx.ravel(), cy.ravel()], axis=1)))
+        teams = range(len(TEAMS)) if team is None else (team,)
+        return np.concatenate([self._grids[t].rows_in_cells(cell_keys) for t in teams])
+
+    def query_radius(self, point: np.ndarray, radius: float, team: Optional[int] = None, inclusive: bool = True) -> np.ndarray:
+        """Rows within `radius` of `point` (optionally of one team), in ascending row order."""
+        if not len(self.position): return np.zeros(0, dtype=np.int64)
+        rows = self._candidates(point, radius, team)
+        distance = np.linalg.norm(self.position[rows] - point, axis=1)
+        return np.sort(rows[distance <= radius if inclusive else distance < radius])
+
+    def query_rect(self, low: np.ndarray, high: np.ndarray, team: Optional[int] = None) -> np.ndarray:
+        """Rows inside the axis-aligned rectangle [low, high] (inclusive), in ascending row order."""
+        if not len(self.position): return np.zeros(0, dtype=np.int64)
+        # Only cells that can hold a drone are visited, however large the rectangle
+        low = np.maximum(np.asarray(low, dtype=float), self.position.min(axis=0)); high = np.minimum(np.asarray(high, dtype=float), self.position.max(axis=0))
+        if np.any(low > high): return np.zeros(0, dtype=np.int64)
+        rows = self._candidates_in(low, high, team)
+        inside = np.all((self.position[rows] >= low) & (self.position[rows] <= high), axis=1)
+        return np.sort(rows[inside])
+
+    def nearest(self, point: np.ndarray, k: int = 1, team: Optional[int] = None) -> np.ndarray:
+        """The k rows closest to `point`, nearest first (ties broken by row order)."""
+        population = np.count_nonzero(self.team == team) if team is not None else len(self.team)
+        k = min(k, population)
+        if k <= 0: return np.zeros(0, dtype=np.int64)
+        radius = self.cell_size
+        while True:
+            # Grow the search radius until it holds k rows; those are then provably the k nearest
+            rows = self.query_radius(point, radius, team)
+            if len(rows) >= k:
+                distance = np.linalg.norm(self.position[rows] - point, axis=1)
+                return rows[np.lexsort((rows, distance))[:k]]
+            radius *= 2.0
+
+    def nearest_each(self, points: np.ndarray, team: Optional[int] = None) -> np.ndarray:
+        """
+        The row closest to each of `points` (ties broken by row order, as nearest()), or -1 when there are no rows.
+        All points are answered together, coarse to fine. Every occupied cell is split into sub-cells of a few rows;
+        one sample row per sub-cell of the point's closest cell bounds its answer, and only the cells and then the
+        sub-cells whose rows' bounding box lies within that bound are searched row by row.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        out = np.full(len(points), -1, dtype=np.int64)
+        grids = [self._grids[t] for t in (range(len(TEAMS)) if team is None else (team,)) if t in self._grids and len(self._grids[t].rows)]
+        if not grids or not len(points): return out
+        rows = np.concatenate([grid.rows for grid in grids])
+        offset = np.cumsum([0] + [len(grid.rows) for grid in grids[:-1]])
+        start = np.concatenate([grid.cell_start + o for grid, o in zip(grids, offset)])
+        count = np.concatenate([grid.cell_count for grid in grids])
+        # Sub-cells: each cell's rows re-sorted by a finer grid sized to hold about four rows per sub-cell
+        cell_of = np.repeat(np.arange(len(start)), count)
+        split = max(1, int(np.sqrt(len(rows) / len(start) / 4)))
+        fine_key = np.floor(self.position[rows] / (self.cell_size / split)).astype(np.int64)
+        order = np.lexsort((fine_key[:, 1], fine_key[:, 0], cell_of))
+        rows, cell_of, fine_key = rows[order], cell_of[order], fine_key[order]
+        position = self.position[rows]
+        fine_start = np.flatnonzero(np.r_[True, (cell_of[1:] != cell_of[:-1]) | np.any(fine_key[1:] != fine_key[:-1], axis=1)])
+        fine_count = np.diff(np.r_[fine_start, len(rows)])
+        first_fine = np.searchsorted(fine_start, start); fine_per_cell = np.diff(np.r_[first_fine, len(fine_start)])
+        boxes = [(np.minimum.reduceat(position, s), np.maximum.reduceat(position, s)) for s in (start, fine_start)]
+        chunk = max(1, (1 << 20) // len(start))  # bounds the points x cells arrays
+        for first in range(0, len(points), chunk):
+            p = points[first:first + chunk]
+            gap = self._box_distance(p[:, None], *boxes[0])
+            # Bound: the nearest sub-cell sample within each point's closest cell
+            closest_cell = np.argmin(gap, axis=1)
+            fine, owner = self._expand(first_fine[closest_cell], fine_per_cell[closest_cell], np.arange(len(p)))
+            bound = np.minimum.reduceat(np.linalg.norm(position[fine_start[fine]] - p[owner], axis=1), np.searchsorted(owner, np.arange(len(p))))
+            bound = bound * (1 + 1e-9) + 1e-9  # slack so rows lying on a box edge survive rounding in the box distance
+            owner, cell = np.nonzero(gap <= bound[:, None])
+            fine, owner = self._expand(first_fine[cell], fine_per_cell[cell], owner)
+            keep = self._box_distance(p[owner], boxes[1][0][fine], boxes[1][1][fine]) <= bound[owner]
+            found, owner = self._expand(fine_start[fine[keep]], fine_count[fine[keep]], owner[keep])
+            distance = np.linalg.norm(position[found] - p[owner], axis=1)
+            groups = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+            closest = np.minimum.reduceat(distance, groups)
+            out[first:first + len(p)] = np.minimum.reduceat(np.where(distance == closest[owner], rows[found], len(self.position)), groups)
+        return out
+
+    @staticmethod
+    def _box_distance(points: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        """Distance from points to axis-aligned boxes (0 inside), broadcasting over leading axes."""
+        return np.linalg.norm(np.maximum(np.maximum(low - points, points - high), 0.0), axis=-1)
+
+    @staticmethod
+    def _expand(starts: np.ndarray, counts: np.ndarray, owner: np.ndarray):
+        """Flattens the slices [start, start + count) into one index array, each tagged with its owner."""
+        return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum()), np.repeat(owner, counts)
+
+    def within(self, rows: np.ndarray, other_rows: np.ndarray, radius: float) -> np.ndarray:
+        """Pairwise check: mask of rows[i] lying within `radius` of other_rows[i]."""
+        return np.linalg.norm(self.position[rows] - self.position[other_rows], axis=1) <= radius
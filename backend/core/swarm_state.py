@@ -0,0 +1,125 @@
+# backend/core/swarm_state.py
+from typing import Dict, List, Optional
+import numpy as np
+
+# --- Categorical encodings (array values index into these tuples) ---
+TEAMS = ("friendly", "enemy")
+FRIENDLY, ENEMY = 0, 1
+DRONE_TYPES = ("interceptor", "ground_attack", "air_to_air")
+INTERCEPTOR, GROUND_ATTACK, AIR_TO_AIR = 0, 1, 2
+STATUSES = ("patrolling", "engaging", "intercepting", "retreating")
+PATROLLING, ENGAGING, INTERCEPTING, RETREATING = 0, 1, 2, 3
+NO_TARGET = -1
+
+_TEAM_CODES = {name: i for i, name in enumerate(TEAMS)}
+_TYPE_CODES = {name: i for i, name in enumerate(DRONE_TYPES)}
+_STATUS_CODES = {name: i for i, name in enumerate(STATUSES)}
+
+
+class SwarmState:
+    """
+    Structure-of-arrays world state. Row i of every drone array describes the same drone;
+    rows are kept contiguous (friendlies first, then enemies) and dead drones are compacted away.
+    A drone's target is stored as a row index (`target`) or an asset index (`target_asset`).
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.generation: int = 0  # bumped whenever rows are added or removed
+        self.uid = np.zeros(0, dtype=np.int64)  # stable numeric handle per drone, unchanged by compaction
+        self.position = np.zeros((0, 2))
+        self.velocity = np.zeros((0, 2))
+        self.health = np.zeros(0, dtype=np.int64)
+        self.team = np.zeros(0, dtype=np.int8)
+        self.type = np.zeros(0, dtype=np.int8)
+        self.status = np.zeros(0, dtype=np.int8)
+        self.target = np.zeros(0, dtype=np.int64)
+        self.target_asset = np.zeros(0, dtype=np.int64)
+        self.last_shot = np.zeros(0)  # sim time of each drone's last shot (-inf: never fired), for weapon cooldowns
+        self.asset_ids: List[str] = []
+        self.asset_position = np.zeros((0, 2))
+        self.asset_health = np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def from_scenario(cls, scenario: Dict) -> "SwarmState":
+        """Builds the arrays straight from a scenario dict (see scenario_service)."""
+        state = cls()
+        drones = scenario["friendly_drones"] + scenario["enemy_drones"]
+        state.ids = [d["id"] for d in drones]
+        state.index = {drone_id: i for i, drone_id in enumerate(state.ids)}
+        state.uid = np.arange(len(drones), dtype=np.int64)
+        state.position = np.array([[d["position"]["x"], d["position"]["y"]] for d in drones], dtype=float).reshape(-1, 2)
+        state.velocity = np.array([[v["x"], v["y"]] for v in (d.get("velocity") or {"x": 0.0, "y": 0.0} for d in drones)], dtype=float).reshape(-1, 2)
+        state.health = np.array([d.get("health", 100) for d in drones], dtype=np.int64)
+        state.team = np.array([_TEAM_CODES[d["team"]] for d in drones], dtype=np.int8)
+        state.type = np.array([_TYPE_CODES[d["type"]] for d in drones], dtype=np.int8)
+        state.status = np.array([_STATUS_CODES[d.get("status", "patrolling")] for d in drones], dtype=np.int8)
+        state.target = np.full(len(drones), NO_TARGET, dtype=np.int64)
+        state.target_asset = np.full(len(drones), NO_TARGET, dtype=np.int64)
+        state.last_shot = np.full(len(drones), -np.inf)
+
+        assets = scenario["assets"]
+        state.asset_ids = [a["id"] for a in assets]
+        state.asset_position = np.array([[a["position"]["x"], a["position"]["y"]] for a in assets], dtype=float).reshape(-1, 2)
+        state.asset_health = np.array([a.get("health", 100) for a in assets], dtype=np.int64)
+        return state
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def team_indices(self, team: int) -> np.ndarray:
+        """Row indices of all live drones on a team, in row order."""
+        return np.flatnonzero(self.team == team)
+
+    def target_id(self, i: int) -> Optional[str]:
+        if self.target[i] != NO_TARGET: return self.ids[self.target[i]]
+        if self.target_asset[i] != NO_TARGET: return self.asset_ids[self.target_asset[i]]
+        return None
+
+    def apply_decisions(self, decisions: Dict[str, Dict]):
+        """Writes AI decisions ({drone_id: {"status", "target_id"}}) into the arrays."""
+        asset_index = {asset_id: i for i, asset_id in enumerate(self.asset_ids)}
+        for drone_id, decision in decisions.items():
+            i = self.index.get(drone_id)
+            if i is None: continue
+            if "status" in decision: self.status[i] = _STATUS_CODES[decision["status"]]
+            if "target_id" in decision:
+                target_id = decision["target_id"]
+                self.target[i] = self.index.get(target_id, NO_TARGET)
+                self.target_asset[i] = asset_index.get(target_id, NO_TARGET) if self.target[i] == NO_TARGET else NO_TARGET
+
+    def remove(self, rows: np.ndarray):
+        """Compacts the given rows out of every array and remaps targets (targets on removed rows are cleared)."""
+        keep = np.ones(len(self), dtype=bool); keep[rows] = False
+        remap = np.full(len(self), NO_TARGET, dtype=np.int64); remap[keep] = np.arange(int(keep.sum()))
+        target = self.target[keep]
+        has_target = target != NO_TARGET
+        target[has_target] = remap[target[has_target]]
+        kept_rows = np.flatnonzero(keep)
+        self.ids = [self.ids[i] for i in kept_rows]
+        self.index = {drone_id: i for i, drone_id in enumerate(self.ids)}
+        self.uid = self.uid[keep]; self.position = self.position[keep]; self.velocity = self.velocity[keep]
+        self.health = self.health[keep]; self.team = self.team[keep]; self.type = self.type[keep]
+        self.status = self.status[keep]; self.target = target; self.target_asset = self.target_asset[keep]
+        self.last_shot = self.last_shot[keep]
+        self.generation += 1
+
+    # --- API boundary: plain dicts matching the Drone / Asset schemas ---
+    def drone_dicts(self, rows: Optional[np.ndarray] = None) -> List[Dict]:
+        """Drone schema dicts for `rows` (default: every drone, in row order)."""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+        row_list = rows.tolist()
+        ids, target_ids = [self.ids[i] for i in row_list], [self.target_id(i) for i in row_list]
+        return [
+            {"id": drone_id, "team": TEAMS[team], "type": DRONE_TYPES[kind],
+             "position": {"x": pos[0], "y": pos[1]}, "velocity": {"x": vel[0], "y": vel[1]},
+             "status": STATUSES[status], "health": health, "target_id": target_id}
+            for drone_id, team, kind, pos, vel, status, health, target_id in zip(
+                ids, self.team[rows].tolist(), self.type[rows].tolist(), self.position[rows].tolist(), self.velocity[rows].tolist(),
+                self.status[rows].tolist(), self.health[rows].tolist(), target_ids)
+        ]
+
+    def asset_dicts(self) -> List[Dict]:
+        return [{"id": asset_id, "position": {"x": pos[0], "y": pos[1]}, "health": health}
+                for asset_id, pos, health in zip(self.asset_ids, self.asset_position.tolist(), self.asset_health.tolist())]
@@ -0,0 +1,139 @@
+# backend/core/trajectory_store.py
+"""
+Columnar on-disk trajectories: one fixed-width record per recorded tick, one slot per drone (its uid).
+
+    <run>.traj/
+        meta.json      ids/teams/types per slot, column layout, tick count (rewritten on every flush)
+        time.f64       (ticks,)             simulation time
+        position.f32   (ticks, drones, 2)
+        velocity.f32   (ticks, drones, 2)
+        health.i16     (ticks, drones)
+        status.u8      (ticks, drones)      DEAD once the drone has been removed
+
+The writer buffers `chunk_ticks` records and appends them to the column files, so memory stays at one chunk
+however long the run. TrajectoryStore maps the files with np.memmap: slicing by tick or by drone reads
+straight from the page cache without loading the history.
+"""
+import json, os
+from typing import Dict, Optional
+import numpy as np
+
+from core.swarm_state import SwarmState, TEAMS, DRONE_TYPES, STATUSES
+
+FORMAT_VERSION = 1
+DEAD = 255  # status of a slot whose drone has been removed
+# name -> (dtype, trailing shape, fill value for dead slots)
+COLUMNS = {
+    "position": ("<f4", (2,), np.nan),
+    "velocity": ("<f4", (2,), 0.0),
+    "health": ("<i2", (), 0),
+    "status": ("u1", (), DEAD),
+}
+_EXTENSIONS = {"<f4": "f32", "<i2": "i16", "u1": "u8", "<f8": "f64"}
+
+def _column_file(path: str, name: str, dtype: str) -> str:
+    return os.path.join(path, f"{name}.{_EXTENSIONS[dtype]}")
+
+
+class TrajectoryWriter:
+    """Appends the swarm's state tick by tick; every `stride`-th call to append() is recorded."""
+
+    def __init__(self, path: str, swarm: SwarmState, delta_time: float, chunk_ticks: int = 600, stride: int = 1, info: Optional[Dict] = None):
+        os.makedirs(path, exist_ok=True)
+        self.path, self.stride, self.chunk_ticks = path, max(1, stride), max(1, chunk_ticks)
+        self.drones = int(swarm.uid.max()) + 1 if len(swarm) else 0
+        self.ticks = 0; self._calls = 0; self._filled = 0
+        ids = [""] * self.drones; teams = [""] * self.drones; types = [""] * self.drones
+        for row, uid in enumerate(swarm.uid.tolist()):
+            ids[uid], teams[uid], types[uid] = swarm.ids[row], TEAMS[swarm.team[row]], DRONE_TYPES[swarm.type[row]]
+        self.meta = {"version": FORMAT_VERSION, "drones": self.drones, "ids": ids, "teams": teams, "types": types,
+                     "statuses": list(STATUSES), "delta_time": delta_time, "stride": self.stride, "ticks": 0, "complete": False,
+                     "columns": {name: {"dtype": dtype, "shape": list(shape)} for name, (dtype, shape, _) in COLUMNS.items()}, **(info or {})}
+        self._time = np.zeros(self.chunk_ticks)
+        self._chunk = {name: np.empty((self.chunk_ticks, self.drones, *shape), dtype=dtype) for name, (dtype, shape, _) in COLUMNS.items()}
+        self._files = {name: open(_column_file(path, name, dtype), "wb") for name, (dtype, _, _) in COLUMNS.items()}
+        self._files["time"] = open(_column_file(path, "time", "<f8"), "wb")
+        self._write_meta()
+
+    def append(self, swarm: SwarmState, sim_time: float):
+        self._calls += 1
+        if (self._calls - 1) % self.stride: return
+        k, slots = self._filled, swarm.uid
+        for name, (_, _, fill) in COLUMNS.items(): self._chunk[name][k] = fill
+        self._chunk["position"][k, slots] = swarm.position; self._chunk["velocity"][k, slots] = swarm.velocity
+        self._chunk["health"][k, slots] = np.clip(swarm.health, -32768, 32767); self._chunk["status"][k, slots] = swarm.status
+        self._time[k] = sim_time
+        self._filled += 1
+        if self._filled == self.chunk_ticks: self.flush()
+
+    def flush(self):
+        """Appends the buffered records to the column files and publishes the new tick count."""
+        if not self._filled: return
+        for name, values in self._chunk.items(): self._files[name].write(values[:self._filled].tobytes())
+        self._files["time"].write(self._time[:self._filled].tobytes())
+        for f in self._files.values(): f.flush()
+        self.ticks += self._filled; self._filled = 0
+        self.meta["ticks"] = self.ticks; self._write_meta()
+
+    def close(self, results: Optional[Dict] = None):
+        if not self._files: return
+        self.flush()
+        for f in self._files.values(): f.close()
+        self._files = {}
+        self.meta.update(complete=True, results=results); self._write_meta()
+
+    def _write_meta(self):
+        # Write-then-rename so a concurrent reader never sees a half-written meta.json
+        temporary = os.path.join(self.path, "meta.json.tmp")
+        with open(temporary, "w") as f: json.dump(self.meta, f)
+        os.replace(temporary, os.path.join(self.path, "meta.json"))
+
+
+class TrajectoryStore:
+    """
+    Read-only, memory-mapped view of a trajectory directory (also of one that is still being written;
+    reopen to see newer ticks). Every accessor returns NumPy views, not copies.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f: self.meta = json.load(f)
+        self.ticks, self.drones = self.meta["ticks"], self.meta["drones"]
+        self.ids = self.meta["ids"]
+        self._slots = {drone_id: slot for slot, drone_id in enumerate(self.ids)}
+        self.time = self._map("time", "<f8", ())
+        self.columns: Dict[str, np.ndarray] = {name: self._map(name, spec["dtype"], tuple(spec["shape"])) for name, spec in self.meta["columns"].items()}
+
+    def _map(self, name: str, dtype: str, shape: tuple) -> np.ndarray:
+        full_shape = (self.ticks,) if name == "time" else (self.ticks, self.drones, *shape)
+        if not self.ticks or (name != "time" and not self.drones): return np.zeros(full_shape, dtype=dtype)
+        return np.memmap(_column_file(self.path, name, dtype), dtype=dtype, mode="r", shape=full_shape)
+
+    def __len__(self) -> int:
+        return self.ticks
+
+    @property
+    def position(self) -> np.ndarray: return self.columns["position"]
+    @property
+    def velocity(self) -> np.ndarray: return self.columns["velocity"]
+    @property
+    def health(self) -> np.ndarray: return self.columns["health"]
+    @property
+    def status(self) -> np.ndarray: return self.columns["status"]
+
+    def slot(self, drone_id: str) -> int:
+        if drone_id not in self._slots: raise KeyError(f"Unknown drone: {drone_id}")
+        return self._slots[drone_id]
+
+    def at_tick(self, tick: int) -> Dict[str, np.ndarray]:
+        """Every drone's record at one recorded tick: arrays of shape (drones, ...)."""
+        return {"time": self.time[tick], **{name: values[tick] for name, values in self.columns.items()}}
+
+    def drone(self, drone_id: str, start: int = 0, stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """One drone's history over [start, stop): arrays of shape (ticks, ...); status DEAD after removal."""
+        slot = self.slot(drone_id)
+        return {"time": self.time[start:stop], **{name: values[start:stop, slot] for name, values in self.columns.items()}}
+
+    def alive(self, tick: int) -> np.ndarray:
+        """Boolean mask over slots of the drones still in play at `tick`."""
+        return self.columns["status"][tick] != DEAD
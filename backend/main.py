@@ -3,6 +3,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 # Assuming your endpoints are in a folder named 'api'
 from api import simulation_endpoints, config_endpoints
+from services.results_sink import close_results_sink
 
 app = FastAPI(
     title="VAJRA",
@@ -29,6 +30,11 @@ app.add_middleware(
 app.include_router(simulation_endpoints.router)
 app.include_router(config_endpoints.router)
 
+@app.on_event("shutdown")
+def flush_results():
+    """Writes any results still buffered in the sink before the server exits."""
+    close_results_sink()
+
 @app.get("/", tags=["Root"])
 async def read_root():
     """Root endpoint to check if the server is running."""
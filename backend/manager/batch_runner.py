@@ -0,0 +1,134 @@
+# backend/manager/batch_runner.py
+"""
+Headless Monte Carlo sweeps: steps SimulationManager as fast as the CPU allows (no WebSocket,
+no frame building) across a ProcessPoolExecutor and aggregates the outcomes.
+
+    cd backend
+    python -m manager.batch_runner --scenarios small_swarm large_swarm_threat --ai-levels basic advanced \
+        --seeds 50 --override FIRING_RANGE=200,250 --workers 8 --out sweep.json --save-results
+"""
+import argparse, itertools, json, statistics, time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.simulation_settings import SimulationSettings
+from manager.simulation_manager import SimulationManager
+from schemas.batch_schemas import AggregateResult, ConfigValue, RunResult, RunSpec
+from services.results_sink import close_results_sink, get_results_sink
+from services.scenario_service import SCENARIOS_BLUEPRINT
+
+# --- Grid construction ---
+def build_grid(scenario_ids: Iterable[str] = (), custom_counts: Iterable[Tuple[int, int]] = (), ai_levels: Iterable[str] = ("basic",),
+               overrides: Optional[Dict[str, List[ConfigValue]]] = None, seeds: int = 1, base_seed: int = 0, max_ticks: int = 36000,
+               save_results: bool = False) -> List[RunSpec]:
+    """Cartesian product of scenarios x AI levels x config override values, repeated for `seeds` seeds."""
+    scenarios = [{"scenario_id": s} for s in scenario_ids] + [{"num_friendly": f, "num_enemy": e} for f, e in custom_counts]
+    override_names = sorted(overrides or {})
+    override_cells = [dict(zip(override_names, values)) for values in itertools.product(*(overrides[n] for n in override_names))]
+    specs = []
+    for scenario, level, cell in itertools.product(scenarios, ai_levels, override_cells):
+        for k in range(seeds):
+            specs.append(RunSpec(run_id=len(specs), seed=base_seed + k, ai_level=level, config_overrides=cell, max_ticks=max_ticks, save_results=save_results, **scenario))
+    return specs
+
+# --- Single run (executes inside a worker process) ---
+def _classify(manager: SimulationManager, summary: Dict) -> str:
+    if manager.status != "finished": return "timeout"
+    if summary["enemy_remaining"] == 0: return "friendly_victory"
+    if summary["friendly_remaining"] == 0: return "enemy_victory"
+    return "assets_lost"
+
+def run_single(spec: RunSpec) -> RunResult:
+    # Overrides only touch this run's SimulationSettings, so reused workers need no rollback
+    settings = SimulationSettings.defaults(AI_INTELLIGENCE_LEVEL=spec.ai_level, **{k.upper(): v for k, v in spec.config_overrides.items()})
+    manager = SimulationManager(save_results=False, settings=settings)
+    if spec.scenario_id: manager.start(spec.scenario_id, seed=spec.seed)
+    else: manager.start_custom(spec.num_friendly or 0, spec.num_enemy or 0, seed=spec.seed)
+    started = time.perf_counter(); ticks = 0
+    while manager.status == "running" and ticks < spec.max_ticks:
+        manager.step(); ticks += 1
+    wall_time = time.perf_counter() - started
+    summary = manager.results()
+    return RunResult(spec=spec, outcome=_classify(manager, summary), ticks=ticks,
+                     sim_time_sec=summary["sim_time_sec"], wall_time_sec=wall_time,
+                     neutralizations=summary["neutralizations"], friendly_losses=summary["friendly_losses"],
+                     friendly_remaining=summary["friendly_remaining"], enemy_remaining=summary["enemy_remaining"],
+                     assets_saved=summary["assets_saved"], avg_interception_time=summary["avg_interception_time"],
+                     record=manager.result_record() if spec.save_results else None)
+
+# --- Fan-out and aggregation ---
+def run_batch(specs: List[RunSpec], workers: Optional[int] = None) -> List[RunResult]:
+    if workers == 1: return [run_single(spec) for spec in specs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_single, specs, chunksize=max(1, len(specs) // (8 * (workers or 4)))))
+
+def aggregate(results: List[RunResult]) -> List[AggregateResult]:
+    cells: Dict[Tuple, List[RunResult]] = defaultdict(list)
+    for r in results:
+        scenario = r.spec.scenario_id or f"custom_{r.spec.num_friendly}v{r.spec.num_enemy}"
+        cells[(scenario, r.spec.ai_level, json.dumps(r.spec.config_overrides, sort_keys=True))].append(r)
+    summaries = []
+    for (scenario, level, overrides), runs in cells.items():
+        sim_times = [r.sim_time_sec for r in runs]
+        outcomes = Counter(r.outcome for r in runs)
+        summaries.append(AggregateResult(
+            scenario=scenario, ai_level=level, config_overrides=json.loads(overrides), runs=len(runs), outcomes=dict(outcomes),
+            win_rate=outcomes["friendly_victory"] / len(runs),
+            mean_neutralizations=statistics.fmean(r.neutralizations for r in runs),
+            mean_friendly_losses=statistics.fmean(r.friendly_losses for r in runs),
+            mean_sim_time_sec=statistics.fmean(sim_times), std_sim_time_sec=statistics.pstdev(sim_times),
+            mean_interception_time=statistics.fmean(r.avg_interception_time for r in runs)))
+    return summaries
+
+# --- CLI ---
+def _parse_value(raw: str) -> ConfigValue:
+    for cast in (int, float):
+        try: return cast(raw)
+        except ValueError: pass
+    return raw
+
+def _parse_override(text: str) -> Tuple[str, List[ConfigValue]]:
+    name, _, values = text.partition("=")
+    if not values: raise argparse.ArgumentTypeError(f"Expected NAME=v1,v2,... got '{text}'")
+    return name.strip().upper(), [_parse_value(v.strip()) for v in values.split(",")]
+
+def _parse_counts(text: str) -> Tuple[int, int]:
+    friendly, _, enemy = text.lower().partition("v")
+    return int(friendly), int(enemy)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run headless Monte Carlo scenario sweeps.")
+    parser.add_argument("--scenarios", nargs="*", default=[], choices=sorted(SCENARIOS_BLUEPRINT), help="Blueprint scenario IDs")
+    parser.add_argument("--custom", nargs="*", default=[], type=_parse_counts, help="Custom battles as FRIENDLYvENEMY, e.g. 10v12")
+    parser.add_argument("--ai-levels", nargs="+", default=["basic"], choices=["basic", "normal", "advanced", "adaptive", "squad"])
+    parser.add_argument("--override", action="append", default=[], type=_parse_override, help="Config sweep, e.g. FIRING_RANGE=200,250")
+    parser.add_argument("--seeds", type=int, default=10, help="Seeded runs per grid cell")
+    parser.add_argument("--base-seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=36000)
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--out", help="Write runs and aggregates as JSON to this path")
+    parser.add_argument("--save-results", action="store_true", help="Also write every run to the configured results sink (config.RESULTS_BACKEND)")
+    args = parser.parse_args(argv)
+    if not args.scenarios and not args.custom: args.scenarios = sorted(SCENARIOS_BLUEPRINT)
+
+    specs = build_grid(args.scenarios, args.custom, args.ai_levels, dict(args.override), args.seeds, args.base_seed, args.max_ticks, args.save_results)
+    print(f"[Batch] Running {len(specs)} simulations...")
+    started = time.perf_counter()
+    results = run_batch(specs, args.workers)
+    summaries = aggregate(results)
+    if args.save_results:
+        # Workers only build records; this process is the single writer and flushes them in batches
+        sink = get_results_sink()
+        for r in results: sink.submit(r.record)
+        close_results_sink()
+    print(f"[Batch] Finished in {time.perf_counter() - started:.1f}s")
+    for s in summaries:
+        print(f"  {s.scenario:<22} {s.ai_level:<9} {json.dumps(s.config_overrides):<30} win={s.win_rate:.0%} "
+              f"kills={s.mean_neutralizations:.1f} losses={s.mean_friendly_losses:.1f} t={s.mean_sim_time_sec:.1f}s")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"runs": [r.dict(exclude={"record"}) for r in results], "aggregates": [s.dict() for s in summaries]}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
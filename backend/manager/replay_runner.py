@@ -0,0 +1,217 @@
+# backend/manager/replay_runner.py
+"""
+Playback of recorded runs (see services/recording_service.py), and exact re-simulation for checking
+that an AI change leaves a recorded run untouched:
+
+    cd backend
+    python -m manager.replay_runner info recordings/<file>.vrec
+    python -m manager.replay_runner verify recordings/<file>.vrec    # exit code 1 if the run diverges
+"""
+import argparse, asyncio, json, math, sys
+from dataclasses import fields
+from typing import Dict, List, Optional, Set
+
+from core import config
+from core.profiler import TickProfiler
+from core.simulation_settings import SimulationSettings
+from manager.simulation_manager import SimulationManager
+from manager.simulation_runner import DeltaSubscriber, FrameSubscriber
+from schemas.api_schemas import Command
+from services.frame_serializer import dumps
+from services.recording_service import Recording
+from services.stream_codec import DeltaDecoder, restamp
+
+
+class ReplayRunner:
+    """
+    Streams a recording at its recorded tick rate with the same interface as SimulationRunner, so a
+    replay is just another session: frames come from disk instead of the AI, and the commands are
+    pause / resume / seek (to a tick) / start (replay from the top) / reset (back to the top, paused) /
+    speed (playback speed and frame rate, as on a live session).
+    """
+
+    def __init__(self, recording: Recording, max_catchup_ticks: int = config.MAX_CATCHUP_TICKS):
+        self.recording = recording
+        self.delta_time = recording.delta_time
+        self.max_catchup_ticks = max(1, max_catchup_ticks)
+        self.speed: float = 1.0
+        self.frame_rate: float = config.STREAM_FRAME_RATE
+        self._next_frame: float = 0.0
+        self.commands: asyncio.Queue = asyncio.Queue()
+        self.subscribers: Set[FrameSubscriber] = set()
+        self.profiler = TickProfiler(config.PROFILING_ENABLED, config.PROFILER_WINDOW)
+        self.decoder = DeltaDecoder()
+        self.tick: int = 0  # frames applied so far
+        self.playing: bool = True
+        self.dropped_ticks: int = 0
+        self._dirty: bool = True  # publish even without new frames (after a seek, a pause, or a new viewer)
+        self._task: Optional[asyncio.Task] = None
+
+    # --- Lifecycle ---
+    def start(self):
+        if self._task is None: self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None: return
+        self._task.cancel()
+        try: await self._task
+        except asyncio.CancelledError: pass
+        self._task = None
+
+    def close(self):
+        self.recording.close()
+
+    @property
+    def status(self) -> str:
+        if self.tick >= len(self.recording): return "finished"
+        return "running" if self.playing else "paused"
+
+    @property
+    def sim_time(self) -> float:
+        return self.decoder.simulation_state.get("time", 0.0)
+
+    # --- I/O side ---
+    def submit(self, command: Command):
+        self.commands.put_nowait(command)
+
+    def subscribe(self, encoding: str = "json", viewport=None) -> FrameSubscriber:
+        """Replays stream recorded frames as they are; a viewport is accepted but the full frame is sent."""
+        subscriber = DeltaSubscriber() if encoding == "delta" else FrameSubscriber()
+        self.subscribers.add(subscriber); self._dirty = True
+        return subscriber
+
+    def unsubscribe(self, subscriber: FrameSubscriber):
+        self.subscribers.discard(subscriber)
+
+    def set_playback(self, speed: Optional[float] = None, frame_rate: Optional[float] = None) -> Dict:
+        if speed is not None: self.speed = min(max(speed, 0.01), config.MAX_FAST_FORWARD)
+        if frame_rate is not None: self.frame_rate = max(frame_rate, 1.0)
+        return self.playback()
+
+    def playback(self) -> Dict:
+        return {"speed": self.speed, "frame_rate": self.frame_rate}
+
+    def settings(self) -> Dict:
+        return self.recording.settings()
+
+    def configure(self, changes: Dict) -> Dict:
+        raise ValueError("A replay plays back its recorded settings; start a live session to change them")
+
+    def stats(self) -> Dict:
+        return {"mode": "replay", "recording": self.recording.name, "replay_tick": self.tick, "replay_ticks": len(self.recording), **self.playback(),
+                "target_tick_rate": round(self.speed / self.delta_time, 2), "skipped_ticks": self.dropped_ticks,
+                "dropped_frames": sum(s.dropped_frames for s in self.subscribers)}
+
+    def profile(self) -> Dict:
+        return {**self.profiler.report(), "entities": {"drones": len(self.decoder.columns["uid"]), "visual_events": len(self.decoder.events)},
+                "runner": self.stats(), "subscribers": len(self.subscribers)}
+
+    # --- Playback side ---
+    def seek(self, tick: int):
+        """Shows the state after `tick` frames (clamped to the recording)."""
+        target = min(max(tick, 1), len(self.recording)) - 1
+        with self.profiler.phase("seek"):
+            for frame in range(self.recording.keyframe_at_or_before(target), target + 1):
+                self.decoder.decode(self.recording.frame(frame))
+        self.tick = target + 1; self._dirty = True
+
+    def _apply_command(self, command: Command):
+        if command.command == "pause": self.playing = False
+        elif command.command == "resume": self.playing = True
+        elif command.command == "seek" and command.tick is not None: self.seek(command.tick)
+        elif command.command == "start": self.seek(1); self.playing = True
+        elif command.command == "reset": self.seek(1); self.playing = False
+        elif command.command == "speed": self.set_playback(command.speed, command.frame_rate)
+        self._dirty = True
+
+    def _drain_commands(self):
+        while not self.commands.empty():
+            command = self.commands.get_nowait()
+            try: self._apply_command(command)
+            except Exception as e: print(f"[Replay] Failed to apply command '{command.command}': {e}")
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        previous = loop.time(); accumulator = self.delta_time
+        if not self.tick: self.seek(1)
+        while True:
+            now = loop.time(); accumulator += (now - previous) * self.speed; previous = now
+            self._drain_commands()
+            if self.status != "running": accumulator = 0.0
+
+            frame_interval = 1.0 / self.frame_rate
+            budget = self.max_catchup_ticks * max(1, math.ceil(self.speed * frame_interval / self.delta_time))
+            frames: List[bytes] = []
+            while self.status == "running" and accumulator >= self.delta_time and len(frames) < budget:
+                with self.profiler.phase("tick"):
+                    payload = self.recording.frame(self.tick); self.decoder.decode(payload)
+                frames.append(payload); self.tick += 1; accumulator -= self.delta_time
+            if accumulator >= self.delta_time:
+                skipped = int(accumulator // self.delta_time)
+                self.dropped_ticks += skipped; accumulator -= skipped * self.delta_time
+
+            if frames or self._dirty:
+                # A recorded delta only applies to a client that saw the frame before it
+                with self.profiler.phase("publish"): self._publish(frames[0] if len(frames) == 1 and not self._dirty else None)
+                self._dirty = False; self._next_frame = max(self._next_frame + frame_interval, now)
+            await asyncio.sleep(max(0.0, (self.delta_time - accumulator) / self.speed, self._next_frame - loop.time()))
+
+    def _publish(self, delta: Optional[bytes]):
+        stats = {**self.stats(), "status": self.status}
+        json_subscribers = [s for s in self.subscribers if s.encoding == "json"]
+        delta_subscribers = [s for s in self.subscribers if isinstance(s, DeltaSubscriber)]
+        if json_subscribers:
+            frame = self.decoder.frame(); frame["simulation_state"].update(stats)
+            text = dumps(frame)
+            for subscriber in json_subscribers: subscriber.publish(text)
+        if delta_subscribers:
+            payload = restamp(delta, stats) if delta is not None else None
+            keyframe = None
+            for subscriber in delta_subscribers:
+                if payload is None or subscriber.needs_resync:
+                    if keyframe is None: keyframe = self.decoder.keyframe(stats)
+                    subscriber.publish(keyframe); subscriber.needs_keyframe = False
+                else:
+                    subscriber.publish(payload)
+
+
+# --- Re-simulation ---
+def resimulate(recording: Recording) -> Optional[int]:
+    """
+    Re-runs a recording from its seed, start command and config (including mid-run changes) and compares
+    every tick against the recorded state. Returns the first tick that differs, or None for an exact match.
+    """
+    header = recording.header
+    names = {f.name for f in fields(SimulationSettings)}
+    changes = {record["tick"]: {name: value for name, value in record["changes"].items() if name in names} for record in recording.config_changes}
+    manager = SimulationManager(save_results=False, settings=SimulationSettings.defaults(**recording.settings()))
+    command = header["command"]
+    if command.get("num_friendly") is not None and command.get("num_enemy") is not None:
+        manager.start_custom(command["num_friendly"], command["num_enemy"], seed=header["seed"])
+    else:
+        manager.start(command["scenario_id"], seed=header["seed"])
+    decoder = DeltaDecoder()
+    for tick in range(len(recording)):
+        if changes.get(tick): manager.configure(**changes[tick])
+        manager.step()
+        decoder.decode(recording.frame(tick))
+        if not decoder.matches(manager.swarm): return tick
+    return None
+
+# --- CLI ---
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or re-simulate recorded runs.")
+    parser.add_argument("action", choices=["info", "verify"])
+    parser.add_argument("path", help="Path to a .vrec recording")
+    args = parser.parse_args(argv)
+    recording = Recording(args.path)
+    print(json.dumps({**recording.info(), "commands": recording.commands, "config_changes": recording.config_changes,
+                      "results": (recording.footer or {}).get("results")}, indent=2))
+    if args.action == "info": return 0
+    diverged = resimulate(recording)
+    if diverged is None:
+        print(f"[Replay] Re-simulation matches all {len(recording)} recorded ticks."); return 0
+    print(f"[Replay] Re-simulation diverges from the recording at tick {diverged}."); return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
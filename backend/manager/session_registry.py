@@ -0,0 +1,96 @@
+# backend/manager/session_registry.py
+import time, uuid
+from typing import Dict, List, Optional, Union
+
+from manager.replay_runner import ReplayRunner
+from manager.simulation_manager import SimulationManager
+from manager.simulation_runner import FrameSubscriber, SimulationRunner
+from core.simulation_settings import SimulationSettings
+from schemas.api_schemas import SessionInfo
+from services.recording_service import Recording
+from core import config
+
+
+class SessionLimitError(Exception):
+    """Raised when creating a session would exceed config.MAX_SESSIONS."""
+
+
+class SimulationSession:
+    """One live simulation or replay (a runner task) shared by every viewer that joins it."""
+
+    def __init__(self, session_id: str, name: str, persistent: bool, runner: Union[SimulationRunner, ReplayRunner]):
+        self.id, self.name = session_id, name
+        # Persistent sessions outlive their viewers; private ones end when the last viewer leaves
+        self.persistent = persistent
+        self.created_at = time.time()
+        self.runner = runner
+
+    @property
+    def mode(self) -> str:
+        return "replay" if isinstance(self.runner, ReplayRunner) else "live"
+
+    @property
+    def viewers(self) -> int:
+        return len(self.runner.subscribers)
+
+    def info(self) -> SessionInfo:
+        return SessionInfo(id=self.id, name=self.name, mode=self.mode, status=self.runner.status, time=round(self.runner.sim_time, 2),
+                           viewers=self.viewers, created_at=self.created_at)
+
+
+class SessionRegistry:
+    """Creates, looks up and tears down sessions; at most `max_sessions` (live or replay) run at once."""
+
+    def __init__(self, max_sessions: int = config.MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self.sessions: Dict[str, SimulationSession] = {}
+
+    def create(self, name: Optional[str] = None, persistent: bool = True, record: bool = False, settings: Optional[Dict] = None) -> SimulationSession:
+        """
+        Starts a live simulation session with the core.config defaults plus `settings` (ValueError if invalid).
+        Must be called from the event loop, since it starts the runner task.
+        """
+        manager = SimulationManager(settings=SimulationSettings.defaults(**(settings or {})))
+        session_id = self._next_id()
+        return self._add(SimulationSession(session_id, name or f"session-{session_id}", persistent,
+                                           SimulationRunner(manager, record=record, label=session_id)))
+
+    def create_replay(self, path: str, name: Optional[str] = None) -> SimulationSession:
+        """Starts a session that streams a recorded run; raises ValueError if `path` is not a playable recording."""
+        session_id = self._next_id()
+        recording = Recording(path)
+        return self._add(SimulationSession(session_id, name or f"replay-{recording.name}", True, ReplayRunner(recording)))
+
+    def _next_id(self) -> str:
+        if len(self.sessions) >= self.max_sessions:
+            raise SessionLimitError(f"Session limit reached ({self.max_sessions} running)")
+        return uuid.uuid4().hex[:8]
+
+    def _add(self, session: SimulationSession) -> SimulationSession:
+        self.sessions[session.id] = session
+        session.runner.start()
+        print(f"[Sessions] Started '{session.name}' ({session.id}, {session.mode}); {len(self.sessions)}/{self.max_sessions} running")
+        return session
+
+    def get(self, session_id: str) -> Optional[SimulationSession]:
+        return self.sessions.get(session_id)
+
+    def list(self) -> List[SessionInfo]:
+        return [s.info() for s in self.sessions.values()]
+
+    async def close(self, session_id: str) -> bool:
+        session = self.sessions.pop(session_id, None)
+        if session is None: return False
+        await session.runner.stop()
+        for subscriber in list(session.runner.subscribers): subscriber.close()
+        session.runner.close()
+        print(f"[Sessions] Closed '{session.name}' ({session_id})")
+        return True
+
+    async def leave(self, session: SimulationSession, subscriber: FrameSubscriber):
+        session.runner.unsubscribe(subscriber)
+        if not session.persistent and not session.viewers: await self.close(session.id)
+
+
+# Shared by the HTTP and WebSocket endpoints
+registry = SessionRegistry()
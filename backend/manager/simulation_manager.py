@@ -1,51 +1,129 @@
 # backend/manager/simulation_manager.py
-import time, uuid, csv, os
+import math, uuid, os
 from datetime import datetime
-from collections import Counter, defaultdict
+from collections import Counter
 from typing import List, Dict, Optional
 import random
+import numpy as np
 
-from schemas.common_schemas import Drone, Asset, Position, VisualEvent
-from schemas.api_schemas import SimulationStreamData, AnalysisData, CoordinationTarget, SwarmStateSummary
-from services import scenario_service, ai_service, physics_service
+from schemas.api_schemas import SimulationStreamData
+from schemas.results_schemas import DroneStats, RunRecord
+from services import scenario_service, ai_service, physics_service, frame_serializer
 from core import config
-from services.ai_service import SAFE_POINT
+from core.swarm_state import SwarmState, TEAMS, DRONE_TYPES, FRIENDLY, ENEMY, ENGAGING, INTERCEPTING, NO_TARGET
+from core.spatial_index import SpatialIndex
+from core.geometry_cache import GeometryCache
+from core.event_buffer import VisualEventBuffer, WEAPON_FIRE, NEUTRALIZATION, COMM_LINK
+from core.profiler import TickProfiler
+from core.trajectory_store import TrajectoryWriter
+from core.simulation_settings import SimulationSettings
+from services.analytics_service import SwarmAnalytics
+from services.assignment_service import AssignmentEngine
+from services.planner_service import IncrementalPlanner
+from services.results_sink import get_results_sink
 
 class SimulationManager:
-    def __init__(self):
+    def __init__(self, save_results: bool = True, seed: Optional[int] = None, settings: Optional[SimulationSettings] = None):
+        # Headless/batch runs collect their own results instead of submitting them to the results sink
+        self.save_results = save_results
+        # This simulation's own immutable settings (default: the core.config values); see configure()
+        self.settings = settings or SimulationSettings.defaults()
+        # Each run gets its own seed (drawn from this source unless the start command pins one);
+        # spawn positions and comms rolls come from self.rng, so a run is reproducible from run_seed alone
+        self._seed_source = random.Random(seed)
+        self.run_seed: Optional[int] = None; self.rng = random.Random()
+        self.trajectory: Optional[TrajectoryWriter] = None
+        # Outlives reset() so timings keep accumulating across restarts
+        self.profiler = TickProfiler(config.PROFILING_ENABLED, config.PROFILER_WINDOW)
         self.reset()
 
     def reset(self):
-        if hasattr(self, 'status') and self.status in ['running', 'paused', 'finished']: self._save_results_to_csv()
-        self.status: str = "idle"; self.start_time: float = 0.0; self.scenario_id: Optional[str] = None
-        self.friendly_drones: List[Drone] = []; self.enemy_drones: List[Drone] = []; self.assets: List[Asset] = []
-        self.visual_events: List[VisualEvent] = []; self.event_log: List[Dict] = []; self.metrics: Dict = {}
-        self.weapon_cooldowns: Dict[str, float] = {}; self.pending_damage: Dict[str, List[int]] = defaultdict(list)
+        if self.save_results and hasattr(self, 'status') and self.status in ['running', 'paused', 'finished'] and self.scenario_id:
+            # Only enqueues; the sink's writer thread does the disk I/O off the event loop
+            try: get_results_sink().submit(self.result_record())
+            except Exception as e: print(f"[Results] Could not submit run: {e}")
+        self._close_trajectory()
+        self.status: str = "idle"; self.scenario_id: Optional[str] = None
+        # Simulation clock: advances by effective_dt per running tick, so it freezes on pause and
+        # scales with SPEED_MULTIPLIER / headless stepping instead of following the wall clock
+        self.sim_time: float = 0.0
+        settings = self.settings
+        self.swarm: SwarmState = SwarmState(); self.spatial_index = SpatialIndex(settings.SPATIAL_CELL_SIZE)
+        # Distance matrices shared by comms, AI, combat and analysis; rebuilt only after positions move
+        self.geometry = GeometryCache()
+        self.assignment_engine = AssignmentEngine(settings.ASSIGNMENT_SOLVER)
+        self.planner = IncrementalPlanner(self.assignment_engine)
+        self.visual_events = VisualEventBuffer(settings.VISUAL_EVENT_CAPACITY); self.event_log: List[Dict] = []; self.metrics: Dict = {}
+        # Hits from the last combat phase, applied at the start of the next tick: target rows in first-hit order and their damage
+        self.pending_targets = np.zeros(0, dtype=np.int64); self.pending_damage = np.zeros(0, dtype=np.int64)
         self.vengeance_buff_active: bool = False; self.vengeance_buff_timer: float = 0.0
-        self.interception_times: List[float] = []
-        self.percent_unattended_hostiles: float = 0.0
+        # Kill counters, rates, histograms and the sampled AnalysisData (also the source of the derived metrics)
+        self.analytics = SwarmAnalytics(settings)
+        # Per-drone combat stats for the results record: drone_stats holds id/team/type in uid order, the counters
+        # are indexed by SwarmState.uid; kills go to the last drone that hit the target
+        self.drone_stats: Dict[str, Dict] = {}; self._initial_counts: Dict[str, int] = {}
+        self._reset_combat_stats(0)
         self._reset_metrics()
 
+    def _reset_combat_stats(self, drones: int):
+        self._shots_fired = np.zeros(drones, dtype=np.int64); self._damage_dealt = np.zeros(drones, dtype=np.int64)
+        self._kills = np.zeros(drones, dtype=np.int64); self._destroyed_at = np.full(drones, np.nan)
+        self._last_hit_by = np.full(drones, -1, dtype=np.int64)
+
     def _reset_metrics(self):
         self.metrics = {
             "assets_saved": 0, "neutralizations": 0, "friendly_losses": 0,
             "avg_interception_time": 0.0, "percent_unattended_hostiles": 0.0
         }
 
-    def start_custom(self, num_friendly: int, num_enemy: int):
-        scenario = scenario_service.generate_custom_scenario(num_friendly, num_enemy)
+    def configure(self, **changes) -> SimulationSettings:
+        """
+        Swaps in settings with `changes` applied (ValueError if invalid). Most take effect on the next tick;
+        SPATIAL_CELL_SIZE, VISUAL_EVENT_CAPACITY and the world size apply from the next run.
+        """
+        settings = self.settings.replace(**changes)
+        if settings.ASSIGNMENT_SOLVER != self.settings.ASSIGNMENT_SOLVER:
+            self.assignment_engine = AssignmentEngine(settings.ASSIGNMENT_SOLVER); self.planner = IncrementalPlanner(self.assignment_engine)
+        self.settings = settings
+        return settings
+
+    def start(self, scenario_id: str, seed: Optional[int] = None):
+        scenario = scenario_service.get_scenario(scenario_id, self._seed_run(seed), self.settings)
+        self._load_and_run_scenario(scenario)
+
+    def start_custom(self, num_friendly: int, num_enemy: int, seed: Optional[int] = None):
+        scenario = scenario_service.generate_custom_scenario(num_friendly, num_enemy, self._seed_run(seed), self.settings)
         self._load_and_run_scenario(scenario)
 
+    def _seed_run(self, seed: Optional[int]) -> random.Random:
+        self.run_seed = seed if seed is not None else self._seed_source.randrange(2**32)
+        self.rng = random.Random(self.run_seed)
+        return self.rng
+
     def _load_and_run_scenario(self, scenario: Dict):
         self.reset()
         if not scenario: self.status = "idle"; return
-        self.status = "running"; self.start_time = time.time()
+        self.status = "running"
         self.scenario_id = scenario.get("name", "Custom Battle")
-        self.friendly_drones = [Drone(**d) for d in scenario["friendly_drones"]]
-        self.enemy_drones = [Drone(**d) for d in scenario["enemy_drones"]]
-        self.assets = [Asset(**a) for a in scenario["assets"]]
-        self._reset_metrics(); self.metrics['assets_saved'] = len(self.assets)
-        self.log_event(f"Simulation started: {self.scenario_id}")
+        self.swarm = SwarmState.from_scenario(scenario)
+        self._reset_metrics(); self.metrics['assets_saved'] = len(self.swarm.asset_ids)
+        swarm = self.swarm
+        self.drone_stats = {drone_id: {"drone_id": drone_id, "team": TEAMS[team], "type": DRONE_TYPES[kind]} for drone_id, team, kind in zip(swarm.ids, swarm.team.tolist(), swarm.type.tolist())}
+        self._reset_combat_stats(len(swarm))
+        self._initial_counts = self.entity_counts()
+        self.log_event(f"Simulation started: {self.scenario_id} (seed {self.run_seed})")
+        if config.TRAJECTORY_DIR: self._open_trajectory(config.TRAJECTORY_DIR)
+
+    def _open_trajectory(self, directory: str):
+        name = f"{datetime.now():%Y%m%d-%H%M%S}_seed{self.run_seed}_{uuid.uuid4().hex[:6]}.traj"
+        try:
+            self.trajectory = TrajectoryWriter(os.path.join(directory, name), self.swarm, self.settings.DELTA_TIME * self.settings.SPEED_MULTIPLIER,
+                                               config.TRAJECTORY_CHUNK_TICKS, config.TRAJECTORY_STRIDE, {"scenario": self.scenario_id, "seed": self.run_seed})
+        except OSError as e: print(f"[Trajectory] Could not start recording: {e}")
+
+    def _close_trajectory(self):
+        if self.trajectory is None: return
+        self.trajectory.close(self.results()); self.trajectory = None
 
     def pause(self):
         if self.status == 'running': self.status = 'paused'
@@ -53,168 +131,170 @@ class SimulationManager:
     def resume(self):
         if self.status == 'paused': self.status = 'running'
 
-    # Add this method inside the SimulationManager class
-
     def _handle_communication(self):
         """Simulates communication for Advanced AI, creating logs and visual events."""
+        geometry = self.geometry
+        friendly = geometry.friendly.tolist()
         # Only run this logic for the advanced AI level
-        if config.AI_INTELLIGENCE_LEVEL != 'advanced' or not self.friendly_drones:
+        if self.settings.AI_INTELLIGENCE_LEVEL != 'advanced' or not friendly:
             return
 
         # To avoid spamming, only a few drones communicate each tick
-        if random.random() > 0.05: # 5% chance per tick to generate a comms event
+        if self.rng.random() > 0.05: # 5% chance per tick to generate a comms event
             return
 
-        source_drone = random.choice(self.friendly_drones)
+        pos = self.swarm.position
+        source_drone = self.rng.choice(friendly)
         
         # Find nearby friendlies within communication range
-        nearby_friendlies = [
-            d for d in self.friendly_drones 
-            if d.id != source_drone.id and 
-            physics_service.calculate_distance(source_drone.position, d.position) <= config.COMMUNICATION_RANGE
-        ]
+        self.spatial_index.sync(self.swarm)
+        in_range = self.spatial_index.query_radius(pos[source_drone], self.settings.COMMUNICATION_RANGE, team=FRIENDLY)
+        nearby_friendlies = [f for f in in_range.tolist() if f != source_drone]
 
         if not nearby_friendlies:
             return
 
-        target_drone = random.choice(nearby_friendlies)
+        target_drone = self.rng.choice(nearby_friendlies)
 
         # Log the event for the Communication Panel
-        self.log_event(f"{source_drone.id} shared target data with {target_drone.id}")
+        self.log_event(f"{self.swarm.ids[source_drone]} shared target data with {self.swarm.ids[target_drone]}")
 
         # Create a visual event to be rendered on the frontend
-        self.visual_events.append(VisualEvent(
-            id=str(uuid.uuid4()),
-            type="comm_link",
-            position=source_drone.position,
-            target_position=target_drone.position,
-            ttl=0.5, # Link will last for 0.5 seconds
-            team='friendly'
-        ))
-
-    def update(self):
-        effective_dt = float(config.DELTA_TIME * config.SPEED_MULTIPLIER)
+        self.visual_events.emit(COMM_LINK, pos[source_drone], 0.5, FRIENDLY, target_position=pos[target_drone])  # Link will last for 0.5 seconds
+
+    def update(self) -> SimulationStreamData:
+        self.step()
+        return self.get_current_state()
+
+    def step(self):
+        """Advances the simulation by one tick without building a stream frame (used headless)."""
+        settings = self.settings
+        effective_dt = float(settings.DELTA_TIME * settings.SPEED_MULTIPLIER)
+        phase = self.profiler.phase
         if self.status == "running":
+            self.sim_time += effective_dt
             if self.vengeance_buff_active:
                 self.vengeance_buff_timer -= effective_dt
                 if self.vengeance_buff_timer <= 0:
                     self.vengeance_buff_active = False; self.log_event("Vengeance buff worn off.")
-            self._handle_communication() 
-            
-            self._apply_pending_damage()
-            all_drones = self.friendly_drones + self.enemy_drones
-            self._apply_pending_damage()
-            all_drones = self.friendly_drones + self.enemy_drones; drone_map = {d.id: d for d in all_drones}
-            friendly_decisions = ai_service.get_swarm_decisions(self.friendly_drones, self.enemy_drones, self.assets)
-            enemy_decisions = ai_service.get_enemy_decisions(self.enemy_drones, self.friendly_drones, self.assets)
-            for drone_id, decision in {**friendly_decisions, **enemy_decisions}.items():
-                drone = drone_map.get(drone_id)
-                if drone: drone.status = decision.get("status", drone.status); drone.target_id = decision.get("target_id", drone.target_id)
+            with phase("comms"):
+                self.geometry.sync(self.swarm)
+                self._handle_communication()
             
-            if self.enemy_drones:
-                friendly_target_ids = {f.target_id for f in self.friendly_drones}
-                unattended_count = sum(1 for e in self.enemy_drones if e.id not in friendly_target_ids)
-                self.percent_unattended_hostiles = (unattended_count / len(self.enemy_drones)) * 100
-            else:
-                self.percent_unattended_hostiles = 0.0
+            with phase("damage"):
+                self._apply_pending_damage()
+            swarm = self.swarm
+            with phase("ai"):
+                self.spatial_index.sync(swarm); self.geometry.sync(swarm)
+                friendly_decisions = self.planner.plan(swarm, self.spatial_index, self.geometry, settings)
+                enemy_decisions = ai_service.get_enemy_decisions(swarm, self.spatial_index, self.geometry)
+                swarm.apply_decisions({**friendly_decisions, **enemy_decisions})
             
-            for drone in all_drones:
-                drone_speed = config.FRIENDLY_DRONE_SPEED if drone.team == 'friendly' else config.ENEMY_DRONE_SPEED
-                if drone.status == "retreating": drone.position, drone.velocity = physics_service.move_towards(drone.position, SAFE_POINT, drone_speed, effective_dt); continue
-                target = drone_map.get(drone.target_id)
-                if drone.status in ["engaging", "intercepting"] and target:
-                    intercept_point = physics_service.calculate_intercept_point(drone.position, target.position, getattr(target, 'velocity', None), drone_speed)
-                    drone.position, drone.velocity = physics_service.move_towards(drone.position, intercept_point, drone_speed, effective_dt)
-                else: drone.velocity = Position(x=0.0, y=0.0)
-            self._handle_combat()
-            if not self.enemy_drones or not self.friendly_drones or all(asset.health <= 0 for asset in self.assets):
+            with phase("movement"):
+                speeds = np.where(swarm.team == FRIENDLY, settings.FRIENDLY_DRONE_SPEED, settings.ENEMY_DRONE_SPEED)
+                safe_point = ai_service.safe_point(settings)
+                physics_service.advance_swarm(swarm, speeds, np.array([safe_point.x, safe_point.y]), effective_dt)
+            with phase("combat"):
+                self.geometry.sync(swarm)
+                self._handle_combat()
+            with phase("analytics"):
+                self.analytics.tick(self, settings)
+            if self.trajectory is not None: self.trajectory.append(swarm, self.sim_time)
+            if not (swarm.team == ENEMY).any() or not (swarm.team == FRIENDLY).any() or np.all(swarm.asset_health <= 0):
                 self.status = "finished"; self.log_event("Simulation finished.")
-        return self.get_current_state()
-
-   # backend/manager/simulation_manager.py
-# (Only showing the changed method, the rest of the file is correct from the last version)
-
-# ... (all other methods remain the same) ...
+                self._close_trajectory()
+        if self.status != "paused":
+            with phase("effects"):
+                self.visual_events.decay(effective_dt)
 
     def _handle_combat(self):
-        all_drones = self.friendly_drones + self.enemy_drones
-        drone_map = {d.id: d for d in all_drones}
-        now = time.time()
-        
-        for drone in all_drones:
-            # --- NO MORE BUFFS ---
-            # All units now use the base weapon stats from the config file.
-            # Victory is determined by AI logic alone.
-            current_cooldown = config.WEAPON_COOLDOWN
-            current_damage = config.WEAPON_DAMAGE
-            # --------------------
-            
-            if drone.status in ["engaging", "intercepting"] and drone.target_id and (now - self.weapon_cooldowns.get(drone.id, 0) > current_cooldown):
-                target = drone_map.get(drone.target_id)
-                if target and physics_service.calculate_distance(drone.position, target.position) <= config.FIRING_RANGE:
-                    self.visual_events.append(VisualEvent(id=str(uuid.uuid4()), type="weapon_fire", position=drone.position, target_position=target.position, ttl=0.25, team=drone.team))
-                    self.pending_damage[target.id].append(current_damage)
-                    self.weapon_cooldowns[drone.id] = now
+        """Every armed drone off cooldown with its target within FIRING_RANGE fires once; the damage lands next tick."""
+        swarm, settings = self.swarm, self.settings
+        now = self.sim_time
+        armed = ((swarm.status == ENGAGING) | (swarm.status == INTERCEPTING)) & (swarm.target != NO_TARGET)
+        ready = np.flatnonzero(armed & (now - swarm.last_shot > settings.WEAPON_COOLDOWN))
+        if not ready.size: return
+        shooters = ready[self.geometry.between(ready, swarm.target[ready]) <= settings.FIRING_RANGE]
+        if not shooters.size: return
+        targets, damage = swarm.target[shooters], settings.WEAPON_DAMAGE
+        # Shooters are in row order, so event ids come out in the same order as one emit per shot
+        self.visual_events.emit_many(WEAPON_FIRE, swarm.position[shooters], 0.25, swarm.team[shooters], swarm.position[targets])
+        self.analytics.shots(swarm.position[targets])
+        swarm.last_shot[shooters] = now
+        # Damage per target (scatter-add), with targets in first-hit order: that is the order kills are reported in
+        hit, first, hits = np.unique(targets, return_index=True, return_counts=True)
+        order = np.argsort(first, kind='stable')
+        self.pending_targets, self.pending_damage = hit[order], hits[order] * damage
+        shooter_uid = swarm.uid[shooters]
+        self._shots_fired[shooter_uid] += 1; self._damage_dealt[shooter_uid] += damage
+        last = len(targets) - 1 - np.unique(targets[::-1], return_index=True)[1]  # each target's last shooter
+        self._last_hit_by[swarm.uid[targets[last]]] = shooter_uid[last]
 
     def _apply_pending_damage(self):
-        if not self.pending_damage: return
-        all_drones = self.friendly_drones + self.enemy_drones; drone_map = {d.id: d for d in all_drones}
-        drones_to_remove = set()
-        for target_id, damage_list in self.pending_damage.items():
-            target = drone_map.get(target_id)
-            if target and target.health > 0:
-                target.health -= sum(damage_list)
-                if target.health <= 0:
-                    self.log_event(f"{target.id} neutralized!"); drones_to_remove.add(target.id)
-                    self.visual_events.append(VisualEvent(id=str(uuid.uuid4()), type="neutralization", position=target.position, ttl=1.5, team=getattr(target, 'team', 'asset')))
-        if drones_to_remove:
-            sim_time = (time.time() - self.start_time) if self.start_time > 0 else 0
-            for removed_id in drones_to_remove:
-                removed_drone = drone_map.get(removed_id)
-                if removed_drone:
-                    if removed_drone.team == "friendly":
-                        self.metrics["friendly_losses"] += 1
-                        if not self.vengeance_buff_active and config.AI_INTELLIGENCE_LEVEL != 'advanced':
-                           self.log_event("Vengeance protocol activated!"); self.vengeance_buff_active = True; self.vengeance_buff_timer = 10.0
-                    else:
-                        self.metrics["neutralizations"] += 1
-                        self.interception_times.append(sim_time)
-            self.friendly_drones = [d for d in self.friendly_drones if d.id not in drones_to_remove]
-            self.enemy_drones = [d for d in self.enemy_drones if d.id not in drones_to_remove]
-        self.pending_damage.clear()
+        """Applies the pending hits with one scatter into the health column, reports the kills and compacts the dead away."""
+        rows, damage = self.pending_targets, self.pending_damage
+        if not rows.size: return
+        self.pending_targets, self.pending_damage = rows[:0], damage[:0]
+        swarm = self.swarm
+        swarm.health[rows] -= damage
+        dead = rows[swarm.health[rows] <= 0]
+        if not dead.size: return
+        dead_uid = swarm.uid[dead]
+        for row in dead.tolist(): self.log_event(f"{swarm.ids[row]} neutralized!")
+        self._destroyed_at[dead_uid] = self.sim_time
+        killers = self._last_hit_by[dead_uid]
+        np.add.at(self._kills, killers[killers >= 0], 1)
+        self.visual_events.emit_many(NEUTRALIZATION, swarm.position[dead], 1.5, swarm.team[dead])
+        friendly_lost = int(np.count_nonzero(swarm.team[dead] == FRIENDLY)); enemy_lost = len(dead) - friendly_lost
+        self.metrics["friendly_losses"] += friendly_lost
+        if friendly_lost and not self.vengeance_buff_active and self.settings.AI_INTELLIGENCE_LEVEL != 'advanced':
+            self.log_event("Vengeance protocol activated!"); self.vengeance_buff_active = True; self.vengeance_buff_timer = 10.0
+        self.metrics["neutralizations"] += enemy_lost
+        self.analytics.kills(self.sim_time, swarm.team[dead], swarm.position[dead])
+        swarm.remove(dead)
 
     def get_current_state(self) -> SimulationStreamData:
-        sim_time = (time.time() - self.start_time) if self.start_time > 0 else 0
-        self.visual_events = [e for e in self.visual_events if e.ttl > 0]
-        for e in self.visual_events: e.ttl -= float(config.DELTA_TIME * config.SPEED_MULTIPLIER)
-        avg_intercept_time = sum(self.interception_times) / len(self.interception_times) if self.interception_times else 0
-        self.metrics["avg_interception_time"] = avg_intercept_time
-        self.metrics["percent_unattended_hostiles"] = self.percent_unattended_hostiles
-        return SimulationStreamData(simulation_state={"status": self.status, "time": sim_time}, drones=[d.dict() for d in self.friendly_drones + self.enemy_drones], assets=[a.dict() for a in self.assets], visual_events=[e.dict() for e in self.visual_events], metrics=self.metrics, event_log=self.event_log[-20:], analysis=self._get_analysis_data())
-
-    def _get_analysis_data(self) -> AnalysisData:
-        drone_map = {d.id: d for d in self.friendly_drones + self.enemy_drones}
-        targets = [CoordinationTarget(source_id=d.id, target_id=d.target_id, distance=int(physics_service.calculate_distance(d.position, drone_map[d.target_id].position))) for d in self.friendly_drones if getattr(d, 'target_id', None) and d.target_id in drone_map]
-        return AnalysisData(coordination_targets=targets, swarm_state=[])
+        """The frame validated against the schema; the stream itself uses services/frame_serializer.py directly."""
+        return SimulationStreamData(**frame_serializer.build_frame(self))
+
+    def frame_metadata(self) -> Dict:
+        """The per-frame fields every stream encoding sends in full: simulation state, metrics and analysis."""
+        self._update_derived_metrics()
+        analysis = self.analytics.analysis  # sampled every ANALYTICS_INTERVAL_TICKS ticks, see services/analytics_service.py
+        return {"simulation_state": {"status": self.status, "time": self.sim_time}, "metrics": self.metrics, "analysis": analysis}
+
+    def _update_derived_metrics(self):
+        self.metrics["avg_interception_time"] = self.analytics.avg_interception_time
+        self.metrics["percent_unattended_hostiles"] = self.analytics.percent_unattended_hostiles
+
+    def entity_counts(self) -> Dict:
+        return {"friendly": int(np.count_nonzero(self.swarm.team == FRIENDLY)), "enemy": int(np.count_nonzero(self.swarm.team == ENEMY)),
+                "assets": len(self.swarm.asset_ids), "visual_events": len(self.visual_events), "event_log": len(self.event_log)}
+
+    def results(self) -> Dict:
+        """Summary of the current run: status, elapsed time, surviving forces and metrics."""
+        if self.analytics.stale: self.analytics.refresh(self)  # exact as of the last tick, not the last sample
+        self._update_derived_metrics()
+        return {"scenario_id": self.scenario_id, "status": self.status, "sim_time_sec": self.sim_time,
+                "friendly_remaining": int(np.count_nonzero(self.swarm.team == FRIENDLY)),
+                "enemy_remaining": int(np.count_nonzero(self.swarm.team == ENEMY)), **self.metrics}
 
     def log_event(self, message: str):
-        sim_time = (time.time() - self.start_time) if self.start_time > 0 else 0
-        self.event_log.append({"time": round(sim_time, 1), "message": message})
-
-    def _save_results_to_csv(self):
-        if not self.scenario_id: return
-        sim_time = (time.time() - self.start_time) if self.start_time > 0 else 0
-        header = ["timestamp", "scenario_id", "sim_time_sec", "neutralizations", "friendly_losses", "assets_saved", "avg_intercept_time"]
-        data = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "scenario_id": self.scenario_id, 
-            "sim_time_sec": round(sim_time, 2), "neutralizations": self.metrics["neutralizations"], 
-            "friendly_losses": self.metrics["friendly_losses"], "assets_saved": self.metrics["assets_saved"],
-            "avg_intercept_time": round(self.metrics["avg_interception_time"], 2)
-        }
-        try:
-            file_exists = os.path.isfile(config.RESULTS_CSV_PATH)
-            with open(config.RESULTS_CSV_PATH, 'a', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=header)
-                if not file_exists: writer.writeheader()
-                writer.writerow(data)
-        except IOError as e: print(f"[CSV Logger] Error: {e}")
\ No newline at end of file
+        self.event_log.append({"time": round(self.sim_time, 1), "message": message})
+
+    def result_record(self) -> RunRecord:
+        """The richer results-sink record for the current run: summary metrics, AI settings, seed and per-drone stats."""
+        summary = self.results(); swarm = self.swarm
+        final_health = dict(zip(swarm.ids, swarm.health.tolist()))
+        destroyed_at = [None if math.isnan(t) else t for t in self._destroyed_at.tolist()]
+        drones = [DroneStats(**stats, shots_fired=shots, damage_dealt=dealt, kills=kills, destroyed_at=at, final_health=max(0, final_health.get(drone_id, 0)))
+                  for (drone_id, stats), shots, dealt, kills, at in zip(self.drone_stats.items(), self._shots_fired.tolist(), self._damage_dealt.tolist(),
+                                                                          self._kills.tolist(), destroyed_at)]
+        return RunRecord(
+            run_id=uuid.uuid4().hex, timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"), scenario_id=self.scenario_id, status=self.status,
+            sim_time_sec=round(self.sim_time, 2), neutralizations=summary["neutralizations"], friendly_losses=summary["friendly_losses"],
+            assets_saved=summary["assets_saved"], avg_intercept_time=round(summary["avg_interception_time"], 2),
+            percent_unattended_hostiles=summary["percent_unattended_hostiles"], ai_level=self.settings.AI_INTELLIGENCE_LEVEL,
+            assignment_solver=self.settings.ASSIGNMENT_SOLVER, seed=self.run_seed,
+            initial_friendly=self._initial_counts.get("friendly", 0), initial_enemy=self._initial_counts.get("enemy", 0),
+            friendly_remaining=summary["friendly_remaining"], enemy_remaining=summary["enemy_remaining"], drones=drones)
@@ -0,0 +1,297 @@
+# backend/manager/simulation_runner.py
+import asyncio, math, os, traceback
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Optional, Set, Union
+
+from manager.simulation_manager import SimulationManager
+from schemas.api_schemas import Command
+from services.recording_service import FILE_EXTENSION, RunRecorder
+from services.frame_serializer import build_frame, dumps, frame_base
+from services.lod_service import Viewport, build_view_frame
+from services.stream_codec import DeltaEncoder, is_keyframe
+from core import config
+
+
+class FrameSubscriber:
+    """Holds only the newest serialized frame; a consumer that falls behind skips the stale ones."""
+    encoding = "json"
+
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self.dropped_frames: int = 0
+
+    def publish(self, frame):
+        if self._queue.full():
+            self._queue.get_nowait(); self.dropped_frames += 1
+        self._queue.put_nowait(frame)
+
+    def close(self):
+        self.publish(None)
+
+    async def get(self) -> Optional[Union[str, bytes]]:
+        """Next frame, or None once the stream has been closed."""
+        return await self._queue.get()
+
+
+class DeltaSubscriber(FrameSubscriber):
+    """Receives the shared binary keyframe/delta stream (see services/stream_codec.py)."""
+    encoding = "delta"
+
+    def __init__(self):
+        super().__init__()
+        self.needs_keyframe: bool = True
+
+    @property
+    def needs_resync(self) -> bool:
+        # A frame still waiting in the queue is about to be dropped, which breaks this consumer's delta chain
+        return self.needs_keyframe or self._queue.full()
+
+
+class ViewportSubscriber(FrameSubscriber):
+    """
+    Receives JSON frames cut down to its viewport (see services/lod_service.py); out-of-view clusters are
+    sent on the first frame, after a view change and then every config.LOD_FAR_INTERVAL frames.
+    """
+    encoding = "view"
+
+    def __init__(self, viewport: Viewport):
+        super().__init__()
+        self.viewport = viewport
+        self.frames: int = 0
+
+    def set_view(self, viewport: Viewport):
+        self.viewport = viewport; self.frames = 0
+
+    def next_is_far(self) -> bool:
+        far = self.frames % max(1, config.LOD_FAR_INTERVAL) == 0
+        self.frames += 1
+        return far
+
+
+class SimulationRunner:
+    """
+    Drives a SimulationManager on its own asyncio task with a fixed-timestep accumulator, so the
+    tick rate no longer depends on how fast clients send or receive. Commands arrive through
+    an asyncio.Queue and frames are published to subscribers after each batch of ticks; each frame
+    is serialized once per encoding no matter how many subscribers share it. A tick that raises stops the
+    session: the error is kept in `error`, status turns "stopped" and every subscriber's stream is closed.
+    `speed` (simulated seconds per wall-clock second) fast-forwards by running more DELTA_TIME ticks per
+    wake-up, and at most `frame_rate` frames per second are published whatever the tick rate.
+    """
+
+    def __init__(self, manager: SimulationManager, max_catchup_ticks: int = config.MAX_CATCHUP_TICKS, record: bool = False, label: str = "run"):
+        self.manager = manager
+        # Ticks run per wake-up to catch up after a stall; any backlog beyond that is skipped
+        self.max_catchup_ticks = max(1, max_catchup_ticks)
+        self.speed: float = 1.0
+        self.frame_rate: float = config.STREAM_FRAME_RATE
+        self.commands: asyncio.Queue = asyncio.Queue()
+        self.subscribers: Set[FrameSubscriber] = set()
+        self.encoder = DeltaEncoder()
+        self.ticks: int = 0; self.skipped_ticks: int = 0; self.lag: float = 0.0
+        self._tick_times: Deque[float] = deque(); self._frame_times: Deque[float] = deque()
+        self._next_frame: float = 0.0
+        self._task: Optional[asyncio.Task] = None
+        # With record=True every run started on this runner is written to config.RECORDINGS_DIR
+        self.record, self.label = record, label
+        self.recorder: Optional[RunRecorder] = None
+        self.error: Optional[str] = None  # why the session stopped, if a tick failed
+
+    # --- Lifecycle ---
+    def start(self):
+        if self._task is None: self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None: return
+        self._task.cancel()
+        try: await self._task
+        except asyncio.CancelledError: pass
+        self._task = None
+
+    def close(self):
+        """Final teardown once the task is stopped: finishes any recording and resets the manager."""
+        self._end_recording()
+        self.manager.reset()
+
+    @property
+    def delta_time(self) -> float:
+        """The session's DELTA_TIME, read on every wake-up so a reconfigured tick length paces the next one."""
+        return self.manager.settings.DELTA_TIME
+
+    @property
+    def profiler(self):
+        return self.manager.profiler
+
+    @property
+    def status(self) -> str:
+        return "stopped" if self.error else self.manager.status
+
+    @property
+    def sim_time(self) -> float:
+        return self.manager.sim_time
+
+    # --- I/O side ---
+    def submit(self, command: Command):
+        self.commands.put_nowait(command)
+
+    def subscribe(self, encoding: str = "json", viewport: Optional[Viewport] = None) -> FrameSubscriber:
+        """A viewport turns a JSON subscription into a level-of-detail one."""
+        if encoding == "delta": subscriber = DeltaSubscriber()
+        else: subscriber = ViewportSubscriber(viewport) if viewport is not None else FrameSubscriber()
+        self.subscribers.add(subscriber)
+        if self.error: subscriber.close()  # nothing will ever be published to it
+        return subscriber
+
+    def unsubscribe(self, subscriber: FrameSubscriber):
+        self.subscribers.discard(subscriber)
+
+    def set_playback(self, speed: Optional[float] = None, frame_rate: Optional[float] = None) -> Dict:
+        """Changes the fast-forward speed and/or the frame rate from the next wake-up on; the ticks themselves stay DELTA_TIME."""
+        if speed is not None: self.speed = min(max(speed, 0.01), config.MAX_FAST_FORWARD)
+        if frame_rate is not None: self.frame_rate = max(frame_rate, 1.0)
+        return self.playback()
+
+    def playback(self) -> Dict:
+        return {"speed": self.speed, "frame_rate": self.frame_rate}
+
+    def settings(self) -> Dict:
+        return self.manager.settings.dict()
+
+    def configure(self, changes: Dict) -> Dict:
+        """Changes this session's SimulationSettings (ValueError if invalid); a recording logs the change on the next tick."""
+        self.manager.configure(**changes)
+        return self.settings()
+
+    def stats(self) -> Dict:
+        return {
+            **self.playback(),
+            "target_tick_rate": round(self.speed / self.delta_time, 2),
+            "measured_tick_rate": float(len(self._tick_times)),  # ticks completed in the last second
+            "measured_frame_rate": float(len(self._frame_times)),
+            "lag_ms": round(self.lag * 1000, 2),
+            "ticks": self.ticks, "skipped_ticks": self.skipped_ticks,
+            "dropped_frames": sum(s.dropped_frames for s in self.subscribers),
+            "error": self.error,
+        }
+
+    def profile(self) -> Dict:
+        """Profiler percentiles plus the entity counts and runner stats they should be read against."""
+        return {**self.profiler.report(), "entities": self.manager.entity_counts(), "runner": self.stats(), "subscribers": len(self.subscribers)}
+
+    # --- Simulation side ---
+    def _apply_command(self, command: Command):
+        manager = self.manager
+        if command.command in ("start", "reset"): self._end_recording()  # before the manager drops the finished run's results
+        if command.command == "start":
+            # If custom counts are provided, use the new method
+            if command.num_friendly is not None and command.num_enemy is not None:
+                manager.start_custom(command.num_friendly, command.num_enemy, command.seed)
+            # Otherwise, fall back to the old scenario ID logic
+            elif command.scenario_id:
+                manager.start(command.scenario_id, command.seed)
+            self._begin_recording(command)
+            return
+        if command.command == "speed":
+            self.set_playback(command.speed, command.frame_rate); return  # wall-clock pacing only, the run itself is unchanged
+        if command.command == "configure":
+            self.configure(command.settings or {}); return  # recorded as a CONFIG record, not a command
+        if self.recorder is not None: self.recorder.command(command.dict(exclude_none=True))
+        if command.command == "pause": manager.pause()
+        elif command.command == "resume": manager.resume()
+        elif command.command == "reset": manager.reset()
+
+    def _drain_commands(self):
+        while not self.commands.empty():
+            command = self.commands.get_nowait()
+            try: self._apply_command(command)
+            except Exception as e: print(f"[Runner] Failed to apply command '{command.command}': {e}")
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        previous = loop.time(); accumulator = self.delta_time  # tick immediately on start
+        while True:
+            now = loop.time(); accumulator += (now - previous) * self.speed; previous = now
+            self._drain_commands()
+            delta_time = self.delta_time
+
+            # A frame's worth of ticks, times the catch-up allowance after a stall
+            frame_interval = 1.0 / self.frame_rate
+            budget = self.max_catchup_ticks * max(1, math.ceil(self.speed * frame_interval / delta_time))
+            steps = 0
+            while accumulator >= delta_time and steps < budget:
+                try:
+                    with self.profiler.phase("tick"): self.manager.step()
+                    if self.recorder is not None: self._capture()
+                except Exception as e:
+                    self._fail(e); return
+                accumulator -= delta_time; steps += 1; self.ticks += 1
+                self._tick_times.append(now)
+            if accumulator >= delta_time:
+                skipped = int(accumulator // delta_time)
+                self.skipped_ticks += skipped; accumulator -= skipped * delta_time
+            while self._tick_times and now - self._tick_times[0] > 1.0: self._tick_times.popleft()
+            while self._frame_times and now - self._frame_times[0] > 1.0: self._frame_times.popleft()
+            self.lag = accumulator / self.speed
+
+            if steps:
+                self._publish(); self._frame_times.append(now); self._next_frame = max(self._next_frame + frame_interval, now)
+            # Wake for the next tick, but not before the next frame is due: extra ticks batch into that frame
+            await asyncio.sleep(max(0.0, (delta_time - accumulator) / self.speed, self._next_frame - loop.time()))
+
+    def _fail(self, error: Exception):
+        """Ends the task after a failed tick instead of letting it die silently with viewers waiting for frames."""
+        self.error = f"{type(error).__name__}: {error}"
+        print(f"[Runner] Tick {self.ticks + 1} of '{self.label}' failed, session stopped: {self.error}"); traceback.print_exc()
+        try: self._end_recording()
+        except Exception as e: print(f"[Runner] Could not finish recording: {e}")
+        for subscriber in list(self.subscribers): subscriber.close()
+
+    # --- Recording ---
+    def _begin_recording(self, command: Command):
+        if not self.record or self.manager.status != "running": return
+        name = f"{datetime.now():%Y%m%d-%H%M%S}_{self.label}_seed{self.manager.run_seed}{FILE_EXTENSION}"
+        try: self.recorder = RunRecorder(os.path.join(config.RECORDINGS_DIR, name), self.manager, command.dict(exclude_none=True))
+        except OSError as e: print(f"[Runner] Could not start recording: {e}")
+
+    def _capture(self):
+        if self.manager.status == "paused": return  # paused ticks don't advance the simulation
+        self.recorder.capture(self.manager)
+        if self.manager.status == "finished": self._end_recording()
+
+    def _end_recording(self):
+        if self.recorder is None: return
+        self.recorder.close(self.manager.results()); self.recorder = None
+
+    def _publish(self):
+        profiler = self.profiler
+        stats = self.stats()
+        if profiler.enabled and profiler.embed: stats["profile"] = self.profile()
+        with profiler.phase("publish"): self._fan_out(stats)
+
+    def _fan_out(self, stats: Dict):
+        """Serializes the frame once per encoding in use (once per viewport for LOD subscribers) and fans it out to every subscriber."""
+        json_subscribers = [s for s in self.subscribers if s.encoding == "json"]
+        delta_subscribers = [s for s in self.subscribers if isinstance(s, DeltaSubscriber)]
+        view_subscribers = [s for s in self.subscribers if isinstance(s, ViewportSubscriber)]
+        base = None
+        if json_subscribers or view_subscribers:
+            with self.profiler.phase("frame_base"): base = frame_base(self.manager, stats)  # metadata, assets and log, shared by both
+        if json_subscribers:
+            text = dumps(build_frame(self.manager, base=base))
+            for subscriber in json_subscribers: subscriber.publish(text)
+        if view_subscribers:
+            with self.profiler.phase("view_frame"):
+                self.manager.spatial_index.sync(self.manager.swarm)  # once per frame, shared by every viewport query
+                for subscriber in view_subscribers: subscriber.publish(dumps(build_view_frame(self.manager, base, subscriber.viewport, subscriber.next_is_far())))
+        if delta_subscribers:
+            payload, snapshot = self.encoder.encode(self.manager, stats)
+            keyframe = payload if is_keyframe(payload) else None
+            for subscriber in delta_subscribers:
+                if subscriber.needs_resync:
+                    # Late joiners and consumers that skipped a frame restart from a keyframe (built once per tick)
+                    if keyframe is None: keyframe = self.encoder.encode(self.manager, stats, keyframe=True)[0]
+                    subscriber.publish(keyframe); subscriber.needs_keyframe = False
+                else:
+                    subscriber.publish(payload)
+            self.encoder.commit(snapshot)
@@ -2,6 +2,7 @@
 from pydantic import BaseModel, Field
 from typing import List, Literal, Optional, Dict
 from .common_schemas import Drone, Asset, VisualEvent, Position # Import Position
+from .batch_schemas import ConfigValue
 
 class CoordinationTarget(BaseModel):
     source_id: str
@@ -11,10 +12,37 @@ class CoordinationTarget(BaseModel):
 class SwarmStateSummary(BaseModel):
     status: str
     count: int
+    team: Optional[str] = None
+
+class AssetCoverage(BaseModel):
+    asset_id: str
+    health: int
+    defenders: int  # friendlies within THREATENING_RANGE
+    threats: int  # enemies within THREATENING_RANGE
+    nearest_threat: Optional[float] = None
+
+class KillRate(BaseModel):
+    window_sec: float
+    neutralizations_per_min: float
+    losses_per_min: float
+
+class Histogram(BaseModel):
+    bin_width: float
+    counts: List[int]
+
+class Heatmap(BaseModel):
+    cell_size: float
+    shots: List[List[int]]  # [x cell][y cell]
+    kills: List[List[int]]
 
 class AnalysisData(BaseModel):
     coordination_targets: List[CoordinationTarget] = []
     swarm_state: List[SwarmStateSummary] = []
+    asset_coverage: List[AssetCoverage] = []
+    kill_rate: Optional[KillRate] = None
+    intercept_histogram: Optional[Histogram] = None
+    engagement_heatmap: Optional[Heatmap] = None
+    updated_at: Optional[float] = None  # sim time of the last analytics sample
 
 class SimulationState(BaseModel):
     status: Literal['idle', 'running', 'paused', 'finished']
@@ -35,11 +63,54 @@ class SimulationStreamData(BaseModel):
     analysis: AnalysisData
     
 class Command(BaseModel):
-    command: Literal["start", "pause", "resume", "reset"]
+    command: Literal["start", "pause", "resume", "reset", "seek", "speed", "configure", "view"]
     scenario_id: Optional[str] = None
     num_friendly: Optional[int] = None
     num_enemy: Optional[int] = None
+    seed: Optional[int] = None  # pin the run's RNG seed (start)
+    tick: Optional[int] = None  # target tick (seek, replay sessions only)
+    speed: Optional[float] = None  # simulated seconds per wall-clock second (speed)
+    frame_rate: Optional[float] = None  # frames streamed per second (speed)
+    settings: Optional[Dict[str, ConfigValue]] = None  # SimulationSettings changes for this session (configure)
+    viewport: Optional[List[float]] = None  # [x0, y0, x1, y1] world rectangle, None for the whole world (view)
+    detail: Optional[str] = None  # "high", "medium" or "low" level of detail outside the viewport (view)
 
 class ScenarioInfo(BaseModel):
     id: str
-    name: str
\ No newline at end of file
+    name: str
+
+class SessionCreate(BaseModel):
+    name: Optional[str] = None
+    record: bool = False  # write every run to config.RECORDINGS_DIR
+    settings: Dict[str, ConfigValue] = {}  # SimulationSettings overrides, e.g. {"AI_INTELLIGENCE_LEVEL": "advanced"}
+
+class ReplayCreate(BaseModel):
+    name: Optional[str] = None
+
+class SessionInfo(BaseModel):
+    id: str
+    name: str
+    mode: Literal['live', 'replay'] = 'live'
+    status: str
+    time: float
+    viewers: int
+    created_at: float
+
+class ProfileSettings(BaseModel):
+    enabled: Optional[bool] = None
+    embed_in_stream: Optional[bool] = None
+    clear: bool = False
+
+class PlaybackSettings(BaseModel):
+    speed: Optional[float] = Field(None, gt=0)  # simulated seconds per wall-clock second, capped at MAX_FAST_FORWARD
+    frame_rate: Optional[float] = Field(None, gt=0)
+
+class RecordingInfo(BaseModel):
+    name: str
+    scenario: Optional[str] = None
+    seed: Optional[int] = None
+    ai_level: Optional[str] = None
+    ticks: int
+    started_at: Optional[float] = None
+    complete: bool
+    size_bytes: int
@@ -0,0 +1,46 @@
+# backend/schemas/batch_schemas.py
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional, Union
+from schemas.results_schemas import RunRecord
+
+ConfigValue = Union[int, float, str]
+
+class RunSpec(BaseModel):
+    """One headless run: a blueprint scenario or custom counts, an AI level and config overrides."""
+    run_id: int
+    seed: int
+    scenario_id: Optional[str] = None
+    num_friendly: Optional[int] = None
+    num_enemy: Optional[int] = None
+    ai_level: Literal['basic', 'normal', 'advanced', 'adaptive', 'squad'] = 'basic'
+    config_overrides: Dict[str, ConfigValue] = Field(default_factory=dict)
+    max_ticks: int = 36000  # 10 simulated minutes at 60Hz
+    save_results: bool = False  # also return the full RunRecord for the results sink
+
+class RunResult(BaseModel):
+    spec: RunSpec
+    outcome: Literal['friendly_victory', 'enemy_victory', 'assets_lost', 'timeout']
+    ticks: int
+    sim_time_sec: float
+    wall_time_sec: float
+    neutralizations: int
+    friendly_losses: int
+    friendly_remaining: int
+    enemy_remaining: int
+    assets_saved: int
+    avg_interception_time: float
+    record: Optional[RunRecord] = None
+
+class AggregateResult(BaseModel):
+    """Statistics over every seed of one parameter-grid cell."""
+    scenario: str
+    ai_level: str
+    config_overrides: Dict[str, ConfigValue]
+    runs: int
+    outcomes: Dict[str, int]
+    win_rate: float
+    mean_neutralizations: float
+    mean_friendly_losses: float
+    mean_sim_time_sec: float
+    std_sim_time_sec: float
+    mean_interception_time: float
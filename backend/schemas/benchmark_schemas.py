@@ -0,0 +1,38 @@
+# backend/schemas/benchmark_schemas.py
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+class BenchmarkCase(BaseModel):
+    """One benchmark measurement: a blueprint scenario or custom counts at one AI level."""
+    name: str
+    ai_level: Literal['basic', 'normal', 'advanced', 'adaptive', 'squad'] = 'basic'
+    scenario_id: Optional[str] = None
+    num_friendly: Optional[int] = None
+    num_enemy: Optional[int] = None
+    seed: int = 0
+    warmup_ticks: int = 30
+    ticks: int = 300
+    max_seconds: float = 60.0  # measurement stops after this much wall time, even if fewer ticks ran
+    serialize_every: int = 5   # measure frame serialization on every Nth tick
+
+class LatencySummary(BaseModel):
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+class BenchmarkResult(BaseModel):
+    case: BenchmarkCase
+    status: Literal['ok', 'timeout', 'error']
+    error: Optional[str] = None
+    drones: int = 0
+    ticks: int = 0
+    finished_early: bool = False  # the battle ended before the tick budget was used up
+    ticks_per_sec: float = 0.0
+    tick: Optional[LatencySummary] = None
+    json_frame: Optional[LatencySummary] = None
+    json_frame_bytes: float = 0.0
+    delta_frame: Optional[LatencySummary] = None
+    delta_frame_bytes: float = 0.0
+    peak_rss_mb: float = 0.0
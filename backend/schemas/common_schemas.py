@@ -22,7 +22,7 @@ class Asset(BaseModel):
     health: int = Field(default=100)
 
 class VisualEvent(BaseModel):
-    id: str
+    id: int
     # --- THE FIX: Add 'comm_link' as a valid event type ---
     type: Literal['neutralization', 'weapon_fire', 'comm_link']
     # -------------------------------------------------------
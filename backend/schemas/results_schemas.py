@@ -0,0 +1,38 @@
+# backend/schemas/results_schemas.py
+from pydantic import BaseModel
+from typing import List, Optional
+
+class DroneStats(BaseModel):
+    drone_id: str
+    team: str
+    type: str
+    shots_fired: int = 0
+    damage_dealt: int = 0
+    kills: int = 0
+    final_health: int = 0
+    destroyed_at: Optional[float] = None  # simulation time of neutralization
+
+class RunRecord(BaseModel):
+    """One finished (or abandoned) run as stored by the results sink. The first seven fields are the original CSV columns."""
+    timestamp: str
+    scenario_id: str
+    sim_time_sec: float
+    neutralizations: int
+    friendly_losses: int
+    assets_saved: int
+    avg_intercept_time: float
+    run_id: str
+    status: str
+    ai_level: str
+    assignment_solver: str
+    seed: Optional[int] = None
+    percent_unattended_hostiles: float
+    initial_friendly: int
+    initial_enemy: int
+    friendly_remaining: int
+    enemy_remaining: int
+    drones: List[DroneStats] = []
+
+# Flat columns of the runs and per-drone tables, in storage order
+RUN_FIELDS = [name for name in RunRecord.__fields__ if name != "drones"]
+DRONE_FIELDS = ["run_id"] + list(DroneStats.__fields__)
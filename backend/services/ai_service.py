@@ -1,94 +1,247 @@
 # backend/services/ai_service.py
-from typing import List, Dict, Set, Optional
-from schemas.common_schemas import Drone, Asset, Position
-from services.physics_service import calculate_distance, calculate_time_to_intercept
-from core import config
+from typing import List, Dict, Set, Optional, Tuple
+import numpy as np
+from schemas.common_schemas import Position
+from core.swarm_state import SwarmState, FRIENDLY, ENEMY, GROUND_ATTACK
+from core.spatial_index import SpatialIndex
+from core.geometry_cache import GeometryCache, distance_matrix
+from services.assignment_service import AssignmentEngine, solve_auction_batch
+from services.physics_service import calculate_time_to_intercept_matrix
+from services.squad_service import EnemyClusterer, form_squads
+from core.simulation_settings import SimulationSettings
 import random
 
+def _synced(state: SwarmState, geometry: Optional[GeometryCache]) -> GeometryCache:
+    # Callers that keep a GeometryCache across the tick share its matrices; one-off calls get a private cache
+    geometry = geometry or GeometryCache()
+    geometry.sync(state)
+    return geometry
+
+def _settings(settings: Optional[SimulationSettings]) -> SimulationSettings:
+    # Sessions pass their own settings; one-off calls read the core.config defaults
+    return settings or SimulationSettings.defaults()
+
 # --- MAIN AI ROUTER ---
-def get_swarm_decisions(friendly_drones: List[Drone], enemy_drones: List[Drone], assets: List[Asset]) -> Dict[str, Dict]:
-    level = config.AI_INTELLIGENCE_LEVEL
-    if level == 'basic': return _get_basic_decisions(friendly_drones, enemy_drones)
-    elif level in ('advanced', 'adaptive'): return _get_ultimate_strategy_decisions(friendly_drones, enemy_drones, assets)
-    else: return _get_normal_decisions(friendly_drones, enemy_drones, assets)
+def get_swarm_decisions(state: SwarmState, index: SpatialIndex, assignment_engine: Optional[AssignmentEngine] = None, geometry: Optional[GeometryCache] = None,
+                        rows: Optional[np.ndarray] = None, held: Optional[Dict[str, Dict]] = None, settings: Optional[SimulationSettings] = None,
+                        clusterer: Optional[EnemyClusterer] = None) -> Dict[str, Dict]:
+    """
+    Decisions for the friendly rows in `rows` (default: every friendly). `held` holds the decisions the other
+    friendlies keep (see services/planner_service.py), so re-planned hunters go for threats nobody else holds.
+    The squad level warm-starts its enemy clustering from `clusterer` when the caller keeps one across ticks.
+    """
+    settings = _settings(settings); level = settings.AI_INTELLIGENCE_LEVEL
+    geometry = _synced(state, geometry)
+    rows = geometry.friendly if rows is None else np.asarray(rows, dtype=np.int64)
+    if level == 'basic': return _get_basic_decisions(state, index, rows, geometry.enemy)
+    elif level in ('advanced', 'adaptive'):
+        return _get_ultimate_strategy_decisions(state, index, geometry, assignment_engine or AssignmentEngine(settings.ASSIGNMENT_SOLVER), rows, held or {}, settings)
+    elif level == 'squad':
+        return _get_squad_decisions(state, index, geometry, rows, held or {}, settings, clusterer or EnemyClusterer())
+    else: return _get_normal_decisions(state, index, geometry, rows)
+
+def threat_ranking(state: SwarmState, geometry: GeometryCache, settings: Optional[SimulationSettings] = None) -> np.ndarray:
+    """Enemy rows, most threatening first, as the session's AI level ranks them (empty when the level doesn't rank threats)."""
+    level = _settings(settings).AI_INTELLIGENCE_LEVEL
+    enemy = geometry.enemy
+    if level in ('advanced', 'adaptive', 'squad'): return enemy[np.argsort(-_get_advanced_threat_scores(state, geometry, enemy), kind='stable')]
+    if level == 'basic' or not len(state.asset_position): return enemy[:0]
+    asset_threat = _asset_threat(state, geometry, enemy)
+    return enemy[np.argsort(asset_threat, kind='stable')][:np.count_nonzero(np.isfinite(asset_threat))]
 
 # --- ENEMY AI LOGIC (Remains coordinated) ---
-def get_enemy_decisions(enemy_drones: List[Drone], friendly_drones: List[Drone], assets: List[Asset]) -> Dict[str, Dict]:
-    # ... (this logic is unchanged from the last version)
-    decisions = {}
-    if not friendly_drones and not assets: return {e.id: {"status": "patrolling"} for e in enemy_drones}
-    primary_target: Optional[Drone] = None
-    if assets and friendly_drones: primary_target = min(friendly_drones, key=lambda f: min(calculate_distance(f.position, a.position) for a in assets))
-    assigned_drones = set(); num_focus_fire = len(enemy_drones) // 2
-    if primary_target:
-        enemies_by_distance = sorted(enemy_drones, key=lambda e: calculate_distance(e.position, primary_target.position))
-        for i in range(min(num_focus_fire, len(enemies_by_distance))):
-            drone = enemies_by_distance[i]; decisions[drone.id] = {"status": "engaging", "target_id": primary_target.id}; assigned_drones.add(drone.id)
-    for enemy in enemy_drones:
-        if enemy.id in assigned_drones: continue
-        if enemy.type == 'ground_attack' and assets: decisions[enemy.id] = {"status": "engaging", "target_id": min(assets, key=lambda a: calculate_distance(enemy.position, a.position)).id}
-        elif friendly_drones: decisions[enemy.id] = {"status": "engaging", "target_id": min(friendly_drones, key=lambda f: calculate_distance(enemy.position, f.position)).id}
-        else: decisions[enemy.id] = {"status": "patrolling"}
-    return decisions
+def _nearest_k(distances: np.ndarray, k: int) -> np.ndarray:
+    """Mask of the k smallest distances, ties going to the lower index (the first k of a stable sort) in O(n)."""
+    chosen = np.zeros(len(distances), dtype=bool)
+    if k <= 0: return chosen
+    if k >= len(distances): chosen[:] = True; return chosen
+    cutoff = distances[np.argpartition(distances, k - 1)[k - 1]]
+    chosen[distances < cutoff] = True
+    ties = np.flatnonzero(distances == cutoff)
+    chosen[ties[:k - np.count_nonzero(chosen)]] = True
+    return chosen
+
+def get_enemy_decisions(state: SwarmState, index: SpatialIndex, geometry: Optional[GeometryCache] = None) -> Dict[str, Dict]:
+    """
+    Half the red force focus-fires on the friendly closest to any asset (nearest enemies first); the rest
+    of the ground attackers go for their nearest asset and everything else for its nearest friendly.
+    """
+    ids, assets, pos = state.ids, state.asset_position, state.position
+    geometry = _synced(state, geometry)
+    friendly, enemy = geometry.friendly, geometry.enemy
+    if not friendly.size and not len(assets): return {ids[e]: {"status": "patrolling"} for e in enemy}
+    targets: List[Optional[str]] = [None] * len(enemy)
+    if friendly.size:
+        targets = [ids[f] for f in index.nearest_each(pos[enemy], team=FRIENDLY).tolist()]
+    if len(assets):
+        ground = np.flatnonzero(state.type[enemy] == GROUND_ATTACK)
+        nearest_asset = np.argmin(geometry.drone_asset[enemy[ground]], axis=1)
+        for column, a in zip(ground.tolist(), nearest_asset.tolist()): targets[column] = state.asset_ids[a]
+        if friendly.size:
+            primary = np.argmin(geometry.drone_asset[friendly].min(axis=1))
+            focus = _nearest_k(distance_matrix(pos[friendly[primary]], pos[enemy])[0], len(enemy) // 2)
+            for column in np.flatnonzero(focus).tolist(): targets[column] = ids[friendly[primary]]
+    return {ids[e]: {"status": "engaging", "target_id": t} if t is not None else {"status": "patrolling"} for e, t in zip(enemy.tolist(), targets)}
 
 # ---  LEVEL 1: BASIC (Simple and greedy) ---
-def _get_basic_decisions(friendly_drones: List[Drone], enemy_drones: List[Drone]) -> Dict[str, Dict]:
+def _get_basic_decisions(state: SwarmState, index: SpatialIndex, friendly: np.ndarray, enemy: np.ndarray) -> Dict[str, Dict]:
+    ids, pos = state.ids, state.position
     decisions = {}
-    if not enemy_drones: return {f.id: {"status": "patrolling"} for f in friendly_drones}
-    for f_drone in friendly_drones:
-        closest_enemy = min(enemy_drones, key=lambda e: calculate_distance(f_drone.position, e.position))
-        decisions[f_drone.id] = {"status": "engaging", "target_id": closest_enemy.id}
+    if not enemy.size: return {ids[f]: {"status": "patrolling"} for f in friendly}
+    for f, closest_enemy in zip(friendly, index.nearest_each(pos[friendly], team=ENEMY)):
+        decisions[ids[f]] = {"status": "engaging", "target_id": ids[closest_enemy]}
     return decisions
 
 # --- LEVEL 2: NORMAL (Threat-based but uncoordinated) ---
-def _get_normal_decisions(friendly_drones: List[Drone], enemy_drones: List[Drone], assets: List[Asset]) -> Dict[str, Dict]:
-    decisions = {}
-    if not enemy_drones: return {f.id: {"status": "patrolling"} for f in friendly_drones}
-    for f_drone in friendly_drones:
-        threats = sorted(enemy_drones, key=lambda e: calculate_distance(f_drone.position, e.position))
-        if assets:
-            threats = sorted(threats, key=lambda e: min(calculate_distance(e.position, a.position) for a in assets) if e.type == 'ground_attack' else float('inf'))
-        decisions[f_drone.id] = {"status": "engaging", "target_id": threats[0].id}
-    return decisions
+def _asset_threat(state: SwarmState, geometry: GeometryCache, enemy: np.ndarray) -> np.ndarray:
+    """Distance from each ground attacker to its nearest asset (inf for other types or without assets)."""
+    if not len(state.asset_position): return np.full(len(enemy), np.inf)
+    return np.where(state.type[enemy] == GROUND_ATTACK, geometry.drone_asset[enemy].min(axis=1), np.inf)
+
+def _get_normal_decisions(state: SwarmState, index: SpatialIndex, geometry: GeometryCache, friendly: np.ndarray) -> Dict[str, Dict]:
+    ids, enemy, pos = state.ids, geometry.enemy, state.position
+    if not enemy.size: return {ids[f]: {"status": "patrolling"} for f in friendly}
+    # Ground attackers first (nearest to an asset), then everything else by distance to the friendly
+    asset_threat = _asset_threat(state, geometry, enemy)
+    if np.isfinite(asset_threat.min()):
+        # Every friendly takes the ground attacker nearest an asset; distance only splits exact ties
+        first = enemy[asset_threat == asset_threat.min()]
+        targets = first[np.argmin(distance_matrix(pos[friendly], pos[first]), axis=1)] if len(first) > 1 else np.repeat(first, len(friendly))
+    else: targets = index.nearest_each(pos[friendly], team=ENEMY)
+    return {ids[f]: {"status": "engaging", "target_id": ids[e]} for f, e in zip(friendly.tolist(), targets.tolist())}
 
 # ---  LEVEL 3: ADVANCED (The Unbeatable Tactician) ---
-SAFE_POINT = Position(x=config.WORLD_WIDTH / 2, y=config.WORLD_HEIGHT - 50)
-CRITICAL_HEALTH_THRESHOLD = 25; NUM_GUARDIANS = 3; GUARDIAN_ZONE_RADIUS = config.THREATENING_RANGE * 1.5
+CRITICAL_HEALTH_THRESHOLD = 25; NUM_GUARDIANS = 3; GUARDIAN_ZONE_FACTOR = 1.5  # guardian zone = THREATENING_RANGE * factor
+# Hunter cost = seconds to intercept - THREAT_SCORE_WEIGHT * threat score. Pairs with no intercept
+# solution fall back to the straight-line flight time plus a penalty.
+THREAT_SCORE_WEIGHT = 1.0; NO_INTERCEPT_PENALTY = 5.0
+
+def safe_point(settings: SimulationSettings) -> Position:
+    """Where retreating drones head: bottom centre of the session's world."""
+    return Position(x=settings.WORLD_WIDTH / 2, y=settings.WORLD_HEIGHT - 50)
+
+def _get_advanced_threat_scores(state: SwarmState, geometry: GeometryCache, enemy: np.ndarray) -> np.ndarray:
+    scores = np.ones(len(enemy))
+    if len(state.asset_position):
+        ground = state.type[enemy] == GROUND_ATTACK
+        scores[ground] = 1000.0 / (geometry.drone_asset[enemy[ground], 0] + 1)
+    scores[state.health[enemy] < 100] *= 2.0
+    return scores
+
+def _build_hunter_cost_matrix(state: SwarmState, geometry: GeometryCache, hunters: np.ndarray, enemy: np.ndarray, settings: SimulationSettings) -> np.ndarray:
+    """Hunters x threats; incremental re-plans pass only the re-planned hunters and the open threats, so the block stays small."""
+    pos, speed = state.position, settings.FRIENDLY_DRONE_SPEED
+    intercept_times = calculate_time_to_intercept_matrix(pos[hunters], pos[enemy], state.velocity[enemy], speed)
+    direct_times = distance_matrix(pos[hunters], pos[enemy]) / speed
+    intercept_times = np.where(np.isfinite(intercept_times), intercept_times, direct_times + NO_INTERCEPT_PENALTY)
+    threat_scores = _get_advanced_threat_scores(state, geometry, enemy)
+    return intercept_times - THREAT_SCORE_WEIGHT * threat_scores[None, :]
 
-def _get_advanced_threat_score(enemy: Drone, assets: List[Asset]) -> float:
-    score = 1000.0 / (calculate_distance(enemy.position, assets[0].position) + 1) if assets and enemy.type == 'ground_attack' else 1.0
-    if enemy.health < 100: score *= 2.0
-    return score
+def split_roles(state: SwarmState, geometry: GeometryCache) -> Tuple[List[int], List[int]]:
+    """(guardians, hunters): the NUM_GUARDIANS friendly rows closest to any asset defend, the rest hunt (nearest first)."""
+    friendly = geometry.friendly
+    drones_by_asset_proximity = (friendly[np.argsort(geometry.drone_asset[friendly].min(axis=1), kind='stable')] if len(state.asset_position) else friendly).tolist()
+    return drones_by_asset_proximity[:NUM_GUARDIANS], drones_by_asset_proximity[NUM_GUARDIANS:]
 
-def _get_ultimate_strategy_decisions(friendly_drones: List[Drone], enemy_drones: List[Drone], assets: List[Asset]) -> Dict[str, Dict]:
+def enemies_in_guardian_zone(state: SwarmState, index: SpatialIndex, settings: Optional[SimulationSettings] = None) -> np.ndarray:
+    radius = _settings(settings).THREATENING_RANGE * GUARDIAN_ZONE_FACTOR
+    return np.unique(np.concatenate([index.query_radius(a, radius, team=ENEMY, inclusive=False) for a in state.asset_position] or [np.zeros(0, dtype=np.int64)]))
+
+def _get_ultimate_strategy_decisions(state: SwarmState, index: SpatialIndex, geometry: GeometryCache, assignment_engine: AssignmentEngine,
+                                     friendly: np.ndarray, held: Dict[str, Dict], settings: SimulationSettings) -> Dict[str, Dict]:
+    ids, enemy, pos = state.ids, geometry.enemy, state.position
     decisions, assigned_drones = {}, set()
-    if not enemy_drones: return {f.id: {"status": "patrolling"} for f in friendly_drones}
-
-    drones_by_asset_proximity = sorted(friendly_drones, key=lambda f: min((calculate_distance(f.position, a.position) for a in assets), default=float('inf')))
-    guardians = drones_by_asset_proximity[:NUM_GUARDIANS]; hunters = drones_by_asset_proximity[NUM_GUARDIANS:]
-    
-    # Guardian Logic
-    enemies_in_zone = [e for e in enemy_drones if any(calculate_distance(e.position, a.position) < GUARDIAN_ZONE_RADIUS for a in assets)]
-    for g in guardians:
-        if enemies_in_zone:
-            threat = min(enemies_in_zone, key=lambda e: calculate_distance(g.position, e.position))
-            decisions[g.id] = {"status": "intercepting", "target_id": threat.id}; assigned_drones.add(g.id)
-        else: decisions[g.id] = {"status": "patrolling"}
-
-    # Hunter Logic: Optimal Target Allocation
-    available_hunters = [h for h in hunters if h.id not in assigned_drones]
-    enemy_threats = sorted(enemy_drones, key=lambda e: _get_advanced_threat_score(e, assets), reverse=True)
-    
-    for threat in enemy_threats:
-        if not available_hunters: break
-        # Find the single best hunter for this specific threat
-        best_hunter = min(available_hunters, key=lambda h: calculate_time_to_intercept(h.position, threat.position, threat.velocity, config.FRIENDLY_DRONE_SPEED))
-        decisions[best_hunter.id] = {"status": "engaging", "target_id": threat.id}
-        assigned_drones.add(best_hunter.id)
-        available_hunters.remove(best_hunter)
+    if not enemy.size: return {ids[f]: {"status": "patrolling"} for f in friendly}
+
+    guardian_rows, hunters = split_roles(state, geometry)
+    planned = set(friendly.tolist())
+
+    # Guardian Logic (distances to the few enemies in the zone only)
+    enemies_in_zone = enemies_in_guardian_zone(state, index, settings)
+    for g in guardian_rows:
+        if g not in planned: continue
+        if enemies_in_zone.size:
+            threat = enemies_in_zone[np.argmin(distance_matrix(pos[g], pos[enemies_in_zone])[0])]
+            decisions[ids[g]] = {"status": "intercepting", "target_id": ids[threat]}; assigned_drones.add(g)
+        else: decisions[ids[g]] = {"status": "patrolling"}
+
+    # Hunter Logic: Optimal Target Allocation (one hunter per threat, minimum total cost)
+    available_hunters = np.array([h for h in hunters if h in planned and h not in assigned_drones], dtype=np.int64)
+    if available_hunters.size:
+        # Threats already held by hunters that keep their assignment are left to them while any other threat is open
+        guardian_ids = {ids[g] for g in guardian_rows}
+        taken = {d.get("target_id") for drone_id, d in held.items() if drone_id not in guardian_ids and d.get("status") == "engaging"}
+        open_threats = np.array([e for e in enemy.tolist() if ids[e] not in taken], dtype=np.int64)
+        columns = open_threats if open_threats.size else enemy
+        cost = _build_hunter_cost_matrix(state, geometry, available_hunters, columns, settings)
+        for row, col in assignment_engine.assign([ids[h] for h in available_hunters], [ids[e] for e in columns], cost):
+            decisions[ids[available_hunters[row]]] = {"status": "engaging", "target_id": ids[columns[col]]}
 
     # Assign any remaining drones
-    for drone in friendly_drones:
-        if drone.id not in decisions: decisions[drone.id] = {"status": "patrolling"}
+    for f in friendly:
+        if ids[f] not in decisions: decisions[ids[f]] = {"status": "patrolling"}
         
     return decisions
+
+# --- LEVEL 5: SQUAD (Hierarchical: formations first, drones second) ---
+def _get_squad_decisions(state: SwarmState, index: SpatialIndex, geometry: GeometryCache, friendly: np.ndarray, held: Dict[str, Dict],
+                         settings: SimulationSettings, clusterer: EnemyClusterer) -> Dict[str, Dict]:
+    """
+    Guardians as in the advanced level. The enemies are clustered into formations (services/squad_service.py),
+    the hunters split into one squad per formation in proportion to its threat, and each squad's targets are assigned
+    within its own formation only. No friendly x enemy matrix is built: the per-squad blocks are about
+    SQUAD_SIZE wide and solved together in one batched auction, so the planning cost grows with the drone
+    count instead of with friendlies x enemies.
+    """
+    ids, enemy, pos = state.ids, geometry.enemy, state.position
+    decisions = {}
+    if not enemy.size: return {ids[f]: {"status": "patrolling"} for f in friendly}
+    planned = set(friendly.tolist())
+    guardian_rows, hunters = split_roles(state, geometry)
+
+    # Guardian Logic (distances to the few enemies in the zone, computed directly)
+    enemies_in_zone = enemies_in_guardian_zone(state, index, settings)
+    for g in guardian_rows:
+        if g not in planned: continue
+        if enemies_in_zone.size:
+            threat = enemies_in_zone[np.argmin(np.linalg.norm(pos[enemies_in_zone] - pos[g], axis=1))]
+            decisions[ids[g]] = {"status": "intercepting", "target_id": ids[threat]}
+        else: decisions[ids[g]] = {"status": "patrolling"}
+
+    # Squad Logic: formations, then one squad of hunters per formation
+    hunters = np.array(hunters, dtype=np.int64)
+    labels, centroids = clusterer.cluster(state, enemy, settings)
+    threat_scores = _get_advanced_threat_scores(state, geometry, enemy)
+    squad_of = form_squads(pos[hunters], centroids, np.bincount(labels, weights=threat_scores))
+    speed = settings.FRIENDLY_DRONE_SPEED
+    blocks = []
+    for k in np.unique(squad_of[squad_of >= 0]).tolist():
+        members = hunters[squad_of == k]
+        squad_planned = np.array([h for h in members.tolist() if h in planned], dtype=np.int64)
+        if not squad_planned.size: continue
+        formation = np.flatnonzero(labels == k)
+        # Targets held by squad mates that keep their assignment are left to them while any other one is open
+        taken = {held[ids[h]].get("target_id") for h in members.tolist() if h not in planned and ids[h] in held}
+        open_columns = np.array([c for c in formation.tolist() if ids[enemy[c]] not in taken], dtype=np.int64)
+        columns = open_columns if open_columns.size else formation
+        targets = enemy[columns]
+        intercept_times = calculate_time_to_intercept_matrix(pos[squad_planned], pos[targets], state.velocity[targets], speed)
+        direct_times = np.linalg.norm(pos[squad_planned][:, None, :] - pos[targets][None, :, :], axis=2) / speed
+        cost = np.where(np.isfinite(intercept_times), intercept_times, direct_times + NO_INTERCEPT_PENALTY) - THREAT_SCORE_WEIGHT * threat_scores[columns][None, :]
+        blocks.append((squad_planned, targets, cost))
+    if blocks:
+        # Every squad's block is solved in one batched auction (inf pads the smaller blocks). In a squad larger than
+        # its formation only the drones with the cheapest best options bid; the others double up on their cheapest target
+        bidders = [np.sort(np.argsort(cost.min(axis=1), kind='stable')[:cost.shape[1]]) for _, _, cost in blocks]
+        padded = np.full((len(blocks), max(len(b) for b in bidders), max(len(b[1]) for b in blocks)), np.inf)
+        for b, ((_, _, cost), rows) in enumerate(zip(blocks, bidders)): padded[b, :len(rows), :cost.shape[1]] = cost[rows]
+        for (squad_planned, targets, cost), rows, assigned in zip(blocks, bidders, solve_auction_batch(padded)):
+            columns = np.argmin(cost, axis=1); columns[rows] = assigned[:len(rows)]
+            for h, col in zip(squad_planned.tolist(), columns.tolist()):
+                decisions[ids[h]] = {"status": "engaging", "target_id": ids[targets[col]]}
+
+    # Assign any remaining drones
+    for f in friendly:
+        if ids[f] not in decisions: decisions[ids[f]] = {"status": "patrolling"}
+
+    return decisions
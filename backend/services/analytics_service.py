@@ -0,0 +1,116 @@
+# backend/services/analytics_service.py
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+import numpy as np
+
+from core.simulation_settings import SimulationSettings
+from core.swarm_state import SwarmState, TEAMS, STATUSES, FRIENDLY, ENEMY, NO_TARGET
+
+
+def empty_analysis() -> Dict:
+    """AnalysisData before the first sample; a new dict per call, so no session can mutate another's."""
+    return {"coordination_targets": [], "swarm_state": []}
+
+
+class SwarmAnalytics:
+    """
+    The dashboard side of a run, published as AnalysisData.
+    Event counters are updated from each tick's deltas as combat reports them (shots(), kills()): kills per team,
+    the rolling kill rate over ANALYTICS_WINDOW sim seconds, the time-to-intercept histogram and the engagement
+    heatmap. Snapshot figures (drones by team and status, coverage per asset, unattended hostiles, coordination
+    targets) are sampled by refresh() once every ANALYTICS_INTERVAL_TICKS ticks, starting with the first tick.
+    Frames between refreshes reuse the cached `analysis` dict, so the 60 Hz stream pays nothing for it.
+    All knobs come from the session's SimulationSettings; the histogram bin and heatmap cell are fixed per run.
+    """
+
+    def __init__(self, settings: SimulationSettings):
+        self.settings = settings
+        self.bin_width = settings.ANALYTICS_HISTOGRAM_BIN; self.cell_size = settings.ANALYTICS_HEATMAP_CELL
+        grid = (max(1, int(np.ceil(settings.WORLD_WIDTH / self.cell_size))), max(1, int(np.ceil(settings.WORLD_HEIGHT / self.cell_size))))
+        self.shot_heatmap = np.zeros(grid, dtype=np.int64); self.kill_heatmap = np.zeros(grid, dtype=np.int64)
+        self.intercept_histogram = np.zeros(0, dtype=np.int64)
+        self.kills_by_team = np.zeros(len(TEAMS), dtype=np.int64)
+        self._recent_kills: Deque[Tuple[float, int, int]] = deque()  # (sim time, friendly lost, enemy lost) per kill batch
+        self._intercept_sum: float = 0.0
+        self.ticks: int = 0; self._refreshed_at: int = 0
+        self.percent_unattended_hostiles: float = 0.0
+        self.analysis: Dict = empty_analysis()
+
+    # --- Tick deltas ---
+    def shots(self, target_positions: np.ndarray):
+        self._add_to(self.shot_heatmap, target_positions)
+
+    def kills(self, sim_time: float, teams: np.ndarray, positions: np.ndarray):
+        """Drones destroyed this tick; enemy kills are interceptions at `sim_time`."""
+        lost = np.bincount(teams, minlength=len(TEAMS))
+        self.kills_by_team += lost
+        self._recent_kills.append((sim_time, int(lost[FRIENDLY]), int(lost[ENEMY])))
+        self._add_to(self.kill_heatmap, positions)
+        for _ in range(int(lost[ENEMY])): self._intercept_sum += sim_time  # one addition per kill, as a running sum over a list of times
+        bin_index = int(sim_time // self.bin_width)
+        if bin_index >= len(self.intercept_histogram): self.intercept_histogram = np.pad(self.intercept_histogram, (0, bin_index + 1 - len(self.intercept_histogram)))
+        self.intercept_histogram[bin_index] += lost[ENEMY]
+
+    def _add_to(self, heatmap: np.ndarray, positions: np.ndarray):
+        cells = np.floor(np.asarray(positions).reshape(-1, 2) / self.cell_size).astype(np.int64)
+        cells = np.clip(cells, 0, np.array(heatmap.shape) - 1)  # drones slightly outside the world count at the edge
+        np.add.at(heatmap, (cells[:, 0], cells[:, 1]), 1)
+
+    @property
+    def avg_interception_time(self) -> float:
+        interceptions = int(self.kills_by_team[ENEMY])
+        return self._intercept_sum / interceptions if interceptions else 0
+
+    # --- Sampling ---
+    def tick(self, manager, settings: SimulationSettings):
+        """Called once per running tick, after combat; refreshes on the first tick and every ANALYTICS_INTERVAL_TICKS after it."""
+        self.settings = settings; self.ticks += 1
+        if (self.ticks - 1) % settings.ANALYTICS_INTERVAL_TICKS == 0: self.refresh(manager)
+
+    @property
+    def stale(self) -> bool:
+        return self._refreshed_at != self.ticks
+
+    def refresh(self, manager):
+        swarm, geometry, settings = manager.swarm, manager.geometry, self.settings
+        geometry.sync(swarm)
+        self._refreshed_at = self.ticks
+        enemy = swarm.team == ENEMY
+        if enemy.any():
+            friendly_targets = swarm.target[(swarm.team == FRIENDLY) & (swarm.target != NO_TARGET)]
+            attended = np.zeros(len(swarm), dtype=bool); attended[friendly_targets] = True
+            self.percent_unattended_hostiles = float(np.count_nonzero(enemy & ~attended) / np.count_nonzero(enemy)) * 100
+        else:
+            self.percent_unattended_hostiles = 0.0
+        now = manager.sim_time
+        while self._recent_kills and now - self._recent_kills[0][0] > settings.ANALYTICS_WINDOW: self._recent_kills.popleft()
+        self.analysis = {"coordination_targets": self._coordination_targets(swarm, geometry), "swarm_state": self._status_counts(swarm),
+                         "asset_coverage": self._asset_coverage(swarm, geometry, settings), "kill_rate": self._kill_rate(settings),
+                         "intercept_histogram": {"bin_width": self.bin_width, "counts": self.intercept_histogram.tolist()},
+                         "engagement_heatmap": {"cell_size": self.cell_size, "shots": self.shot_heatmap.tolist(), "kills": self.kill_heatmap.tolist()},
+                         "updated_at": now}
+
+    def _coordination_targets(self, swarm: SwarmState, geometry) -> List[Dict]:
+        sources = swarm.team_indices(FRIENDLY); sources = sources[swarm.target[sources] != NO_TARGET]
+        distances = geometry.between(sources, swarm.target[sources]) if len(sources) else []
+        return [{"source_id": swarm.ids[f], "target_id": swarm.ids[t], "distance": int(d)} for f, t, d in zip(sources.tolist(), swarm.target[sources].tolist(), distances)]
+
+    def _status_counts(self, swarm: SwarmState) -> List[Dict]:
+        counts = np.bincount(swarm.team.astype(np.int64) * len(STATUSES) + swarm.status, minlength=len(TEAMS) * len(STATUSES)).reshape(len(TEAMS), len(STATUSES))
+        return [{"team": TEAMS[team], "status": STATUSES[status], "count": int(counts[team, status])}
+                for team in range(len(TEAMS)) for status in range(len(STATUSES)) if counts[team, status]]
+
+    def _asset_coverage(self, swarm: SwarmState, geometry, settings: SimulationSettings) -> List[Dict]:
+        """Per asset: friendlies and enemies within THREATENING_RANGE, and the closest enemy's distance."""
+        if not len(swarm.asset_ids): return []
+        distance = geometry.drone_asset; in_range = distance <= settings.THREATENING_RANGE
+        friendly, enemy = swarm.team == FRIENDLY, swarm.team == ENEMY
+        defenders = np.count_nonzero(in_range & friendly[:, None], axis=0); threats = np.count_nonzero(in_range & enemy[:, None], axis=0)
+        nearest: List[Optional[float]] = distance[enemy].min(axis=0).round(1).tolist() if enemy.any() else [None] * len(swarm.asset_ids)
+        return [{"asset_id": asset_id, "health": health, "defenders": int(d), "threats": int(t), "nearest_threat": n}
+                for asset_id, health, d, t, n in zip(swarm.asset_ids, swarm.asset_health.tolist(), defenders, threats, nearest)]
+
+    def _kill_rate(self, settings: SimulationSettings) -> Dict:
+        window = settings.ANALYTICS_WINDOW
+        friendly_lost = sum(k[1] for k in self._recent_kills); enemy_lost = sum(k[2] for k in self._recent_kills)
+        return {"window_sec": window, "neutralizations_per_min": round(enemy_lost * 60 / window, 2), "losses_per_min": round(friendly_lost * 60 / window, 2)}
@@ -0,0 +1,185 @@
+# backend/services/assignment_service.py
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+
+# --- HUNGARIAN (exact, O(n^2 m)) ---
+def solve_hungarian(cost: np.ndarray) -> np.ndarray:
+    """Minimum-cost assignment of every row to a distinct column (shortest augmenting path form)."""
+    n, m = cost.shape
+    u, v = np.zeros(n + 1), np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.int64)  # match[j]: 1-based row holding column j (0 = free)
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        match[0] = i; j0 = 0
+        min_reduced = np.full(m + 1, np.inf); used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True; i0 = match[j0]
+            free = np.flatnonzero(~used[1:]) + 1
+            reduced = cost[i0 - 1, free - 1] - u[i0] - v[free]
+            improved = reduced < min_reduced[free]
+            min_reduced[free[improved]] = reduced[improved]; way[free[improved]] = j0
+            j1 = free[np.argmin(min_reduced[free])]; delta = min_reduced[j1]
+            u[match[used]] += delta; v[used] -= delta; min_reduced[free] -= delta
+            j0 = j1
+            if match[j0] == 0: break
+        while j0:
+            j1 = way[j0]; match[j0] = match[j1]; j0 = j1
+    columns = np.empty(n, dtype=np.int64)
+    assigned = np.flatnonzero(match[1:]) + 1
+    columns[match[assigned] - 1] = assigned - 1
+    return columns
+
+# --- AUCTION (epsilon-optimal, warm-startable) ---
+def solve_auction(cost: np.ndarray, prices: Optional[np.ndarray] = None, columns: Optional[np.ndarray] = None,
+                  epsilon: float = 0.01, max_rounds: int = 10_000, warm_rounds: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Jacobi auction: every unassigned row bids for its best column each round. Returns (columns, prices).
+    Cold starts use epsilon-scaling; passing the previous tick's prices (and columns) skips straight to
+    the final epsilon, so a barely changed problem settles in a handful of rounds. Warm prices are shifted to
+    start at zero and clipped to this problem's benefit range first (a stale price far above it would otherwise
+    start a price war of one epsilon per round), and a warm start that has not settled after `warm_rounds`
+    rounds is dropped for the cold path.
+    """
+    n, m = cost.shape
+    # Pad to a square problem with zero-benefit dummy rows so unassigned columns end up correctly priced
+    benefit = np.vstack([-cost, np.zeros((m - n, m))])
+    spread = float(np.ptp(benefit)) if benefit.size else 0.0
+    if prices is not None:
+        prices = np.clip(prices - prices.min(), 0.0, spread) if prices.size else prices.astype(float)
+        if columns is not None: columns = np.concatenate([columns, np.full(m - n, -1, dtype=np.int64)])
+        assigned, prices = _auction_rounds(benefit, prices, columns, epsilon, warm_rounds)
+        if (assigned >= 0).all(): return assigned[:n], prices
+    prices = np.zeros(m)
+    step = spread / 2
+    while step > epsilon:
+        prices = _auction_rounds(benefit, prices, None, step, max_rounds)[1]; step /= 4
+    assigned, prices = _auction_rounds(benefit, prices, None, epsilon, max_rounds)
+    # Round budget exhausted: hand leftover rows the cheapest free columns
+    for i in np.flatnonzero(assigned == -1):
+        free = np.setdiff1d(np.arange(m), assigned[assigned >= 0])
+        assigned[i] = free[np.argmax(benefit[i, free])]
+    return assigned[:n], prices
+
+def _auction_rounds(benefit: np.ndarray, prices: np.ndarray, columns: Optional[np.ndarray], epsilon: float, max_rounds: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Bidding rounds until every row holds a column or `max_rounds` is used up (rows left at -1)."""
+    n, m = benefit.shape
+    assigned = np.full(n, -1, dtype=np.int64); owner = np.full(m, -1, dtype=np.int64)
+    if columns is not None:
+        # Keep warm-start pairs that still satisfy epsilon-complementary slackness
+        values = benefit - prices
+        for i, j in enumerate(columns):
+            if 0 <= j < m and owner[j] == -1 and values[i, j] >= values[i].max() - epsilon:
+                assigned[i] = j; owner[j] = i
+    rows = np.arange(n)
+    for _ in range(max_rounds):
+        bidders = rows[assigned == -1]
+        if not bidders.size: break
+        values = benefit[bidders] - prices
+        best = np.argmax(values, axis=1)
+        best_value = values[np.arange(len(bidders)), best]
+        if m > 1:
+            values[np.arange(len(bidders)), best] = -np.inf
+            second_value = values.max(axis=1)
+        else:
+            second_value = best_value
+        bids = prices[best] + (best_value - second_value) + epsilon
+        # Each contested column goes to its highest bidder
+        order = np.lexsort((-bids, best))
+        first = np.ones(len(order), dtype=bool); first[1:] = best[order][1:] != best[order][:-1]
+        won_columns, winners, winning_bids = best[order][first], bidders[order][first], bids[order][first]
+        evicted = owner[won_columns]
+        assigned[evicted[evicted >= 0]] = -1
+        owner[won_columns] = winners; assigned[winners] = won_columns; prices[won_columns] = winning_bids
+    return assigned, prices
+
+def solve_auction_batch(cost: np.ndarray, epsilon: float = 0.01, max_rounds: int = 10_000) -> np.ndarray:
+    """
+    Many independent assignment problems at once, padded into one (problems, rows, columns) array with inf
+    for missing pairs: each round, the unassigned rows of every problem bid together, so the Python overhead
+    depends on the number of rounds only, not on the number of problems. Every problem needs at least as many
+    real columns as real rows (rows whose costs are all inf are padding). Returns the column per row, -1 for padding.
+    """
+    problems, n, m = cost.shape
+    valid = np.isfinite(cost)
+    real_rows, real_columns = valid.any(axis=2), valid.any(axis=1)
+    # As in solve_auction, each problem is padded to square with zero-benefit dummy rows on its real columns
+    spare = real_columns.sum(axis=1) - real_rows.sum(axis=1)
+    dummy = np.where((np.arange(m)[None, :, None] < spare[:, None, None]) & real_columns[:, None, :], 0.0, -np.inf)
+    benefit = np.concatenate([np.where(valid, -cost, -np.inf), dummy], axis=1)
+    real = np.concatenate([real_rows, np.arange(m)[None, :] < spare[:, None]], axis=1)
+    finite = benefit[np.isfinite(benefit)]
+    prices = np.zeros((problems, m))
+    step = float(np.ptp(finite)) / 2 if finite.size else 0.0
+    while step > epsilon:
+        prices = _batch_auction_rounds(benefit, real, prices, step, max_rounds)[1]; step /= 4
+    return _batch_auction_rounds(benefit, real, prices, epsilon, max_rounds)[0][:, :n]
+
+def _batch_auction_rounds(benefit: np.ndarray, real: np.ndarray, prices: np.ndarray, epsilon: float, max_rounds: int) -> Tuple[np.ndarray, np.ndarray]:
+    problems, n, m = benefit.shape
+    assigned = np.where(real, -1, -2); owner = np.full((problems, m), -1, dtype=np.int64)
+    for _ in range(max_rounds):
+        problem, bidders = np.nonzero(assigned == -1)
+        if not problem.size: break
+        values = benefit[problem, bidders] - prices[problem]
+        best = np.argmax(values, axis=1); pick = np.arange(len(best))
+        best_value = values[pick, best]
+        values[pick, best] = -np.inf
+        second_value = values.max(axis=1)
+        second_value = np.where(np.isfinite(second_value), second_value, best_value)
+        bids = prices[problem, best] + (best_value - second_value) + epsilon
+        # Each contested column goes to its highest bidder
+        key = problem * m + best
+        order = np.lexsort((-bids, key))
+        first = np.ones(len(order), dtype=bool); first[1:] = key[order][1:] != key[order][:-1]
+        won = order[first]
+        won_problem, won_columns = problem[won], best[won]
+        evicted = owner[won_problem, won_columns]
+        assigned[won_problem[evicted >= 0], evicted[evicted >= 0]] = -1
+        owner[won_problem, won_columns] = bidders[won]; assigned[won_problem, bidders[won]] = won_columns; prices[won_problem, won_columns] = bids[won]
+    else:
+        # Round budget exhausted: hand leftover rows the cheapest free columns
+        for p, i in zip(*np.nonzero(assigned == -1)):
+            free = np.flatnonzero((owner[p] == -1) & np.isfinite(benefit[p, i]))
+            j = free[np.argmax(benefit[p, i, free])]; assigned[p, i] = j; owner[p, j] = i
+    return np.where(assigned >= 0, assigned, -1), prices
+
+SOLVERS: Dict[str, Callable] = {"hungarian": solve_hungarian, "auction": solve_auction}
+
+
+class AssignmentEngine:
+    """
+    Solves row -> column assignments tick after tick. Rows and columns are identified by drone IDs
+    so the auction prices and previous pairs carry over to the next tick even as drones die.
+    """
+
+    def __init__(self, method: str = "auction", epsilon: float = 0.01):
+        if method not in SOLVERS: raise ValueError(f"Unknown assignment method: {method}")
+        self.method = method; self.epsilon = epsilon
+        self._prices: Dict[str, float] = {}
+        self._previous: Dict[str, str] = {}
+        self._transposed: Optional[bool] = None
+
+    def reset(self):
+        self._prices.clear(); self._previous.clear(); self._transposed = None
+
+    def assign(self, row_ids: List[str], column_ids: List[str], cost: np.ndarray) -> List[Tuple[int, int]]:
+        """Returns (row, column) index pairs; each row and each column is used at most once."""
+        if not row_ids or not column_ids: return []
+        transposed = len(row_ids) > len(column_ids)
+        bidder_ids, object_ids = (column_ids, row_ids) if transposed else (row_ids, column_ids)
+        matrix = cost.T if transposed else cost
+        if self.method == "hungarian":
+            columns = solve_hungarian(matrix)
+        else:
+            warm = transposed == self._transposed and any(o in self._prices for o in object_ids)
+            prices = columns = None
+            if warm:
+                prices = np.array([self._prices.get(o, 0.0) for o in object_ids])
+                object_index = {o: j for j, o in enumerate(object_ids)}
+                columns = np.array([object_index.get(self._previous.get(b), -1) for b in bidder_ids], dtype=np.int64)
+            columns, prices = solve_auction(matrix, prices, columns, self.epsilon)
+            self._prices = dict(zip(object_ids, prices.tolist()))
+        self._transposed = transposed
+        self._previous = {bidder_ids[i]: object_ids[j] for i, j in enumerate(columns)}
+        return [(int(j), i) if transposed else (i, int(j)) for i, j in enumerate(columns)]
@@ -0,0 +1,43 @@
+# backend/services/frame_serializer.py
+"""
+Lean JSON stream path: builds the frame as plain dicts/lists straight from SwarmState and the manager
+(no Pydantic models per entity) and encodes it once, with orjson when it is installed.
+The shape is exactly SimulationStreamData.dict(); SimulationManager.get_current_state() still wraps
+build_frame() in the schema for callers that want validation.
+"""
+import json
+from typing import Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LOG_TAIL = 20
+
+
+def dumps(data) -> str:
+    """Compact JSON text (orjson when available, otherwise the stdlib encoder)."""
+    if orjson is not None: return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data, separators=(",", ":"))
+
+
+def frame_base(manager, simulation_state: Optional[Dict] = None) -> Dict:
+    """Everything in a frame except drones and visual events; shared by full and viewport (services/lod_service.py) frames."""
+    base = manager.frame_metadata()
+    if simulation_state: base["simulation_state"].update(simulation_state)
+    base.update(assets=manager.swarm.asset_dicts(), event_log=manager.event_log[-LOG_TAIL:])
+    return base
+
+
+def build_frame(manager, simulation_state: Optional[Dict] = None, base: Optional[Dict] = None) -> Dict:
+    """The current frame in the SimulationStreamData.dict() shape; `simulation_state` adds runner stats."""
+    with manager.profiler.phase("frame"):
+        base = base or frame_base(manager, simulation_state)
+        return {"simulation_state": base["simulation_state"], "metrics": base["metrics"], "analysis": base["analysis"],
+                "drones": manager.swarm.drone_dicts(), "assets": base["assets"], "visual_events": manager.visual_events.to_dicts(),
+                "event_log": base["event_log"]}
+
+
+def encode_frame(manager, simulation_state: Optional[Dict] = None) -> str:
+    return dumps(build_frame(manager, simulation_state))
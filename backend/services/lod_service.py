@@ -0,0 +1,83 @@
+# backend/services/lod_service.py
+"""
+Viewport level-of-detail frames for observers that only display part of the world.
+Drones and visual events inside the viewport are sent exactly as in a full frame; everything outside it is
+summarized as per-cell clusters (centroid and team counts), and those summaries are only refreshed on "far"
+frames (every config.LOD_FAR_INTERVAL frames) so zoomed-in clients get small frames on huge swarms.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import numpy as np
+
+from core import config
+from core.swarm_state import ENEMY, FRIENDLY
+
+# Cluster cell size multiplier per detail level
+DETAIL_LEVELS: Dict[str, float] = {"high": 0.5, "medium": 1.0, "low": 2.0}
+
+
+@dataclass(frozen=True)
+class Viewport:
+    """Axis-aligned world rectangle [x0, x1] x [y0, y1] plus the detail level for what lies outside it."""
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    detail: str = "medium"
+
+    @classmethod
+    def create(cls, bounds: List[float], detail: Optional[str] = None) -> "Viewport":
+        """Raises ValueError for anything but four numbers with x0 <= x1, y0 <= y1 and a known detail level."""
+        if len(bounds) != 4: raise ValueError(f"viewport needs x0,y0,x1,y1, not {bounds!r}")
+        x0, y0, x1, y1 = (float(b) for b in bounds)
+        if not all(np.isfinite([x0, y0, x1, y1])) or x0 > x1 or y0 > y1: raise ValueError(f"Invalid viewport {bounds!r}")
+        detail = detail or "medium"
+        if detail not in DETAIL_LEVELS: raise ValueError(f"detail must be one of {', '.join(DETAIL_LEVELS)}, not {detail!r}")
+        return cls(x0, y0, x1, y1, detail)
+
+    @classmethod
+    def parse(cls, text: str, detail: Optional[str] = None) -> "Viewport":
+        """From the ?viewport=x0,y0,x1,y1 query parameter."""
+        return cls.create(text.split(","), detail)
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        points = np.asarray(points).reshape(-1, 2)
+        return (points[:, 0] >= self.x0) & (points[:, 0] <= self.x1) & (points[:, 1] >= self.y0) & (points[:, 1] <= self.y1)
+
+    def dict(self) -> Dict:
+        return {"x0": self.x0, "y0": self.y0, "x1": self.x1, "y1": self.y1}
+
+
+def clusters(swarm, rows: np.ndarray, cell_size: float) -> List[Dict]:
+    """One summary per occupied cell: drone centroid and friendly/enemy counts, in cell order."""
+    if not len(rows): return []
+    position = swarm.position[rows]
+    _, cell, counts = np.unique(np.floor(position / cell_size).astype(np.int64), axis=0, return_inverse=True, return_counts=True)
+    cell = cell.ravel()
+    centroid = np.stack([np.bincount(cell, weights=position[:, 0]), np.bincount(cell, weights=position[:, 1])], axis=1) / counts[:, None]
+    team = swarm.team[rows]
+    friendly = np.bincount(cell, weights=team == FRIENDLY, minlength=len(counts)).astype(np.int64)
+    enemy = np.bincount(cell, weights=team == ENEMY, minlength=len(counts)).astype(np.int64)
+    return [{"position": {"x": x, "y": y}, "count": n, "friendly": f, "enemy": e}
+            for (x, y), n, f, e in zip(np.round(centroid, 1).tolist(), counts.tolist(), friendly.tolist(), enemy.tolist())]
+
+
+def build_view_frame(manager, base: Dict, view: Viewport, far: bool) -> Dict:
+    """
+    A frame for one viewport, sharing `base` (frame_serializer.frame_base) with the other subscribers.
+    manager.spatial_index must be synced with the current swarm; `far` adds the out-of-view clusters.
+    """
+    swarm, events = manager.swarm, manager.visual_events
+    rows = manager.spatial_index.query_rect((view.x0, view.y0), (view.x1, view.y1))
+    visible = set(swarm.ids[i] for i in rows.tolist())
+    slots = events.live_slots()
+    # An event is visible when it starts or ends (tracers, comm links) inside the viewport
+    shown = view.contains(events.position[slots]) | (events.has_target[slots] & view.contains(events.target_position[slots]))
+    analysis = {**base["analysis"], "coordination_targets": [t for t in base["analysis"]["coordination_targets"] if t["source_id"] in visible]}
+    summary = {"viewport": view.dict(), "detail": view.detail, "drones_total": len(swarm), "drones_shown": len(rows), "far": far}
+    if far:
+        outside = np.ones(len(swarm), dtype=bool); outside[rows] = False
+        summary["clusters"] = clusters(swarm, np.flatnonzero(outside), config.LOD_CLUSTER_CELL_SIZE * DETAIL_LEVELS[view.detail])
+    return {"simulation_state": base["simulation_state"], "metrics": base["metrics"], "analysis": analysis,
+            "drones": swarm.drone_dicts(rows), "assets": base["assets"], "visual_events": events.to_dicts(slots[shown]),
+            "event_log": base["event_log"], "view": summary}
@@ -0,0 +1,130 @@
+# backend/services/planner_service.py
+from collections import Counter, deque
+from typing import Deque, Dict, Optional, Set, Tuple
+import numpy as np
+
+from core.geometry_cache import GeometryCache
+from core.simulation_settings import SimulationSettings
+from core.spatial_index import SpatialIndex
+from core.swarm_state import SwarmState
+from services import ai_service
+from services.assignment_service import AssignmentEngine
+from services.physics_service import calculate_times_to_intercept
+from services.squad_service import EnemyClusterer
+
+# Levels whose assignment is costly enough to keep across ticks; basic and normal re-decide every drone every tick
+INCREMENTAL_LEVELS = ("advanced", "adaptive", "squad")
+
+
+class IncrementalPlanner:
+    """
+    Keeps every friendly's current assignment across ticks and re-plans a drone only when
+    - it has no assignment yet, or its target is gone,
+    - it is a guardian and the set of enemies in the guardian zone changed (or it just became/stopped being one),
+    - its time-to-intercept got more than PLANNER_TTI_SLACK seconds worse than the best since it was assigned.
+    A change in the top PLANNER_THREAT_RANKS threats, and every PLANNER_REFRESH_TICKS ticks a full refresh,
+    queue all friendlies instead; the queue is worked off PLANNER_REPLAN_BUDGET drones per tick.
+    plan() returns only the decisions that were (re)made this tick; SwarmState keeps the rest.
+    Only INCREMENTAL_LEVELS plan this way; other levels, and AI_PLANNER="full", re-plan every friendly each tick.
+    All thresholds come from the session's SimulationSettings passed to plan().
+    """
+
+    def __init__(self, assignment_engine: AssignmentEngine):
+        self.assignment_engine = assignment_engine
+        self.reset()
+
+    def reset(self):
+        self.decisions: Dict[str, Dict] = {}
+        self._planned_tti: Dict[str, float] = {}
+        self._level: Optional[str] = None
+        self._guardians: Set[str] = set(); self._zone: Set[str] = set()
+        self._ranking: Tuple[str, ...] = ()
+        self._queue: Deque[str] = deque(); self._queued: Set[str] = set()
+        self.clusterer = EnemyClusterer()  # the squad level's enemy formations, warm-started across ticks
+        self.ticks: int = 0
+        self.replanned: int = 0  # drones re-planned on the last tick
+        self.triggers: Counter = Counter()  # re-plans by reason since reset
+
+    def plan(self, state: SwarmState, index: SpatialIndex, geometry: GeometryCache, settings: SimulationSettings) -> Dict[str, Dict]:
+        if settings.AI_PLANNER == "full" or settings.AI_INTELLIGENCE_LEVEL not in INCREMENTAL_LEVELS:
+            self._level = None  # the held assignments are stale once every friendly was re-planned without them
+            return ai_service.get_swarm_decisions(state, index, self.assignment_engine, geometry, settings=settings, clusterer=self.clusterer)
+        geometry.sync(state)
+        ids, friendly = state.ids, geometry.friendly
+        self.ticks += 1
+        if settings.AI_INTELLIGENCE_LEVEL != self._level:
+            self.reset(); self._level = settings.AI_INTELLIGENCE_LEVEL; self.ticks = 1
+        dirty: Dict[int, str] = {}
+        for f in friendly.tolist():
+            decision = self.decisions.get(ids[f])
+            if decision is None: dirty[f] = "new"
+            elif decision.get("target_id") is not None and decision["target_id"] not in state.index: dirty[f] = "target_lost"
+
+        self._check_guardians(state, index, geometry, dirty, settings)
+        self._check_intercept_times(state, geometry, dirty, settings)
+        self._check_ranking(state, geometry, settings)
+        if self.ticks % max(1, settings.PLANNER_REFRESH_TICKS) == 0: self._enqueue(ids[f] for f in friendly.tolist())
+
+        budget = settings.PLANNER_REPLAN_BUDGET
+        while self._queue and budget > 0:
+            drone_id = self._queue.popleft(); self._queued.discard(drone_id)
+            row = state.index.get(drone_id)
+            if row is None or row in dirty: continue
+            dirty[row] = "refresh"; budget -= 1
+
+        self.replanned = len(dirty)
+        if not dirty: return {}
+        self.triggers.update(dirty.values())
+        planned_ids = {ids[f] for f in dirty}
+        held = {drone_id: d for drone_id, d in self.decisions.items() if drone_id not in planned_ids and drone_id in state.index}
+        # Only a re-plan of every friendly warm-starts from the shared engine: prices learned on the full problem
+        # do not fit a subset of its rows, so subsets are solved cold by a throwaway engine
+        engine = self.assignment_engine if len(dirty) == len(friendly) else AssignmentEngine(self.assignment_engine.method, self.assignment_engine.epsilon)
+        decisions = ai_service.get_swarm_decisions(state, index, engine, geometry, np.array(sorted(dirty), dtype=np.int64), held, settings, self.clusterer)
+        self.decisions = {**held, **decisions}
+        self._record_intercept_times(state, decisions, settings)
+        return decisions
+
+    # --- Triggers ---
+    def _check_guardians(self, state: SwarmState, index: SpatialIndex, geometry: GeometryCache, dirty: Dict[int, str], settings: SimulationSettings):
+        ids = state.ids
+        guardian_rows, _ = ai_service.split_roles(state, geometry)
+        guardians = {ids[g] for g in guardian_rows}
+        for drone_id in guardians ^ self._guardians:
+            row = state.index.get(drone_id)
+            if row is not None: dirty.setdefault(row, "role_changed")
+        zone = {ids[e] for e in ai_service.enemies_in_guardian_zone(state, index, settings).tolist()}
+        if zone != self._zone:
+            for g in guardian_rows: dirty.setdefault(g, "guardian_zone")
+        self._guardians, self._zone = guardians, zone
+
+    def _check_intercept_times(self, state: SwarmState, geometry: GeometryCache, dirty: Dict[int, str], settings: SimulationSettings):
+        rows, planned = [], []
+        for f in geometry.friendly.tolist():
+            if f in dirty or state.target[f] < 0: continue
+            planned_tti = self._planned_tti.get(state.ids[f])
+            if planned_tti is not None: rows.append(f); planned.append(planned_tti)
+        if not rows: return
+        rows = np.array(rows, dtype=np.int64); targets = state.target[rows]
+        now = calculate_times_to_intercept(state.position[rows], state.position[targets], state.velocity[targets], settings.FRIENDLY_DRONE_SPEED)
+        worsened = now > np.array(planned) + settings.PLANNER_TTI_SLACK
+        for f in rows[worsened].tolist(): dirty[f] = "intercept_worsened"
+        # The reference is the best intercept time seen since the assignment, so slow drift also triggers eventually
+        for f, tti in zip(rows[~worsened].tolist(), np.minimum(now, planned)[~worsened].tolist()): self._planned_tti[state.ids[f]] = tti
+
+    def _check_ranking(self, state: SwarmState, geometry: GeometryCache, settings: SimulationSettings):
+        ranking = tuple(state.ids[e] for e in ai_service.threat_ranking(state, geometry, settings)[:settings.PLANNER_THREAT_RANKS].tolist())
+        if ranking != self._ranking and self._ranking: self._enqueue(state.ids[f] for f in geometry.friendly.tolist())
+        self._ranking = ranking
+
+    def _enqueue(self, drone_ids):
+        for drone_id in drone_ids:
+            if drone_id not in self._queued: self._queue.append(drone_id); self._queued.add(drone_id)
+
+    def _record_intercept_times(self, state: SwarmState, decisions: Dict[str, Dict], settings: SimulationSettings):
+        rows = np.array([state.index[d] for d, decision in decisions.items() if decision.get("target_id") in state.index], dtype=np.int64)
+        for drone_id in decisions: self._planned_tti.pop(drone_id, None)
+        if not rows.size: return
+        targets = np.array([state.index[decisions[state.ids[f]]["target_id"]] for f in rows.tolist()], dtype=np.int64)
+        times = calculate_times_to_intercept(state.position[rows], state.position[targets], state.velocity[targets], settings.FRIENDLY_DRONE_SPEED)
+        self._planned_tti.update(zip((state.ids[f] for f in rows.tolist()), times.tolist()))
@@ -0,0 +1,163 @@
+# backend/services/recording_service.py
+"""
+Run recordings (*.vrec): enough to replay a run without re-simulating it, and to re-simulate it exactly.
+
+    magic   b"VREC1\n"
+    records u8 type | u32 length | payload, back to back:
+            HEADER  (0) JSON: run seed, start command, scenario name, full config snapshot, start time
+            FRAME   (1) one stream_codec frame per simulated tick, a keyframe every RECORDING_KEYFRAME_INTERVAL ticks
+            COMMAND (2) JSON: {"tick", ...command} for commands applied during the run (pause/resume)
+            CONFIG  (3) JSON: {"tick", "changes"} when the session's settings change during the run (e.g. SPEED_MULTIPLIER)
+            FOOTER  (4) JSON: tick count and final results
+
+Frames use the same keyframe/delta format as the /simulation stream, so replays can be sent to clients
+as they are; seeking decodes forward from the nearest keyframe.
+"""
+import bisect, json, os, struct, time
+from dataclasses import fields
+from typing import Dict, List, Optional, Tuple, Union
+
+from core import config
+from core.simulation_settings import SimulationSettings
+from services.stream_codec import DeltaEncoder, is_keyframe
+
+MAGIC = b"VREC1\n"
+FILE_EXTENSION = ".vrec"
+HEADER, FRAME, COMMAND, CONFIG, FOOTER = range(5)
+_RECORD = struct.Struct("<BI")
+# info() per recording path, keyed by (size, mtime) so a file is only scanned again once it has changed
+_info_cache: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+
+
+def config_snapshot(settings=None) -> Dict:
+    """Every scalar setting in core.config, overridden by the session's SimulationSettings."""
+    snapshot = {name: value for name, value in vars(config).items() if name.isupper() and isinstance(value, (bool, int, float, str))}
+    return {**snapshot, **settings.dict()} if settings is not None else snapshot
+
+
+class RunRecorder:
+    """Writes one run to `path`; call capture() after every tick that advanced the simulation."""
+
+    def __init__(self, path: str, manager, command: Dict, keyframe_interval: int = config.RECORDING_KEYFRAME_INTERVAL):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.ticks = 0
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._encoder = DeltaEncoder()
+        self._config = manager.settings.dict()
+        self._file = open(path, "wb"); self._file.write(MAGIC)
+        self._write_json(HEADER, {"seed": manager.run_seed, "scenario": manager.scenario_id, "command": command,
+                                  "config": config_snapshot(manager.settings), "started_at": time.time()})
+
+    def _write(self, kind: int, payload: bytes):
+        self._file.write(_RECORD.pack(kind, len(payload))); self._file.write(payload)
+
+    def _write_json(self, kind: int, data: Dict):
+        self._write(kind, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+    def capture(self, manager):
+        # The session's settings can change mid-run through /sessions/{id}/config
+        settings = manager.settings.dict()
+        changes = {name: value for name, value in settings.items() if self._config.get(name) != value}
+        if changes:
+            self._write_json(CONFIG, {"tick": self.ticks, "changes": changes}); self._config.update(changes)
+        payload, snapshot = self._encoder.encode(manager, {}, keyframe=self.ticks % self.keyframe_interval == 0)
+        self._encoder.commit(snapshot)
+        self._write(FRAME, payload); self.ticks += 1
+
+    def command(self, command: Dict):
+        self._write_json(COMMAND, {"tick": self.ticks, **command})
+
+    def close(self, results: Optional[Dict] = None):
+        if self._file.closed: return
+        self._write_json(FOOTER, {"ticks": self.ticks, "results": results})
+        self._file.close()
+        print(f"[Recorder] Saved {self.ticks} ticks to {self.path}")
+
+
+class Recording:
+    """Read side of a .vrec file: header/footer, commands and config changes, plus a tick -> frame index."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.header: Dict = {}; self.footer: Optional[Dict] = None
+        self.commands: List[Dict] = []; self.config_changes: List[Dict] = []
+        self._frames: List[Tuple[int, int]] = []  # (offset, length) per tick
+        self.keyframes: List[int] = []             # ticks that hold a keyframe
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC: raise ValueError(f"{path} is not a simulation recording")
+            while True:
+                head = f.read(_RECORD.size)
+                if len(head) < _RECORD.size: break
+                kind, length = _RECORD.unpack(head); offset = f.tell()
+                if offset + length > size: break  # truncated tail: the run is still being written or was cut off
+                if kind == FRAME:
+                    if is_keyframe(f.read(2)): self.keyframes.append(len(self._frames))
+                    self._frames.append((offset, length)); f.seek(offset + length)
+                    continue
+                record = json.loads(f.read(length))
+                if kind == HEADER: self.header = record
+                elif kind == COMMAND: self.commands.append(record)
+                elif kind == CONFIG: self.config_changes.append(record)
+                elif kind == FOOTER: self.footer = record
+        if not self._frames or self.keyframes[:1] != [0]: raise ValueError(f"{path} holds no playable frames")
+        self._file = open(path, "rb")
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def delta_time(self) -> float:
+        return self.header.get("config", {}).get("DELTA_TIME", config.DELTA_TIME)
+
+    def settings(self) -> Dict:
+        """The SimulationSettings values the run started with (the header also snapshots process-wide config)."""
+        names = {f.name for f in fields(SimulationSettings)}
+        return {name: value for name, value in self.header.get("config", {}).items() if name in names}
+
+    def frame(self, tick: int) -> bytes:
+        offset, length = self._frames[tick]
+        self._file.seek(offset)
+        return self._file.read(length)
+
+    def keyframe_at_or_before(self, tick: int) -> int:
+        return self.keyframes[bisect.bisect_right(self.keyframes, tick) - 1]
+
+    def info(self) -> Dict:
+        return {"name": self.name, "scenario": self.header.get("scenario"), "seed": self.header.get("seed"),
+                "ai_level": self.header.get("config", {}).get("AI_INTELLIGENCE_LEVEL"), "ticks": len(self),
+                "started_at": self.header.get("started_at"), "complete": self.footer is not None,
+                "size_bytes": os.path.getsize(self.path)}
+
+    def close(self):
+        self._file.close()
+
+
+def recording_path(name: str, directory: Optional[str] = None) -> Optional[str]:
+    """Path of a recording by file name, or None if `name` is not a recording in `directory`."""
+    directory = directory or config.RECORDINGS_DIR
+    if os.path.basename(name) != name or not name.endswith(FILE_EXTENSION): return None
+    path = os.path.join(directory, name)
+    return path if os.path.isfile(path) else None
+
+def list_recordings(directory: Optional[str] = None) -> List[Dict]:
+    """info() of every recording in `directory`; blocking file I/O, so async callers run it in a thread."""
+    directory = directory or config.RECORDINGS_DIR
+    if not os.path.isdir(directory): return []
+    recordings = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(FILE_EXTENSION): continue
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path); key = (stat.st_size, stat.st_mtime_ns)
+            cached = _info_cache.get(path)
+            if cached is None or cached[0] != key:
+                recording = Recording(path); cached = _info_cache[path] = (key, recording.info()); recording.close()
+            recordings.append(cached[1])
+        except (ValueError, OSError) as e: print(f"[Recorder] Skipping {name}: {e}")
+    return recordings
@@ -0,0 +1,194 @@
+# backend/services/results_sink.py
+"""
+Results sink: SimulationManager and the batch runner submit RunRecords, and one background thread per process
+batches them and writes them through a pluggable backend (config.RESULTS_BACKEND):
+
+    csv      RESULTS_CSV_PATH for runs, <name>_drones.csv for per-drone stats
+    sqlite   RESULTS_SQLITE_PATH with `runs` and `drone_stats` tables
+    parquet  RESULTS_PARQUET_DIR/{runs,drones}/part-*.parquet, one part file per flush (needs pyarrow)
+
+Writers in different processes (server, batch workers) are serialized with an exclusive lock file next to the output.
+"""
+import atexit, contextlib, csv, os, queue, sqlite3, threading, time
+from typing import Dict, List, Optional
+
+from core import config
+from schemas.results_schemas import DRONE_FIELDS, RUN_FIELDS, RunRecord
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    import pyarrow as pa, pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+class _FileLock:
+    """Exclusive advisory lock on `<path>.lock`, held by one writer (thread or process) at a time."""
+
+    def __init__(self, path: str):
+        self.path = path + ".lock"
+
+    def __enter__(self):
+        self._file = open(self.path, "a+")
+        if fcntl is not None: fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            while True:
+                try: msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1); break
+                except OSError: time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None: fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else: self._file.seek(0); msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()
+
+
+def _rows(records: List[RunRecord]):
+    runs, drones = [], []
+    for record in records:
+        data = record.dict()
+        runs.append({name: data[name] for name in RUN_FIELDS})
+        drones += [{"run_id": record.run_id, **drone} for drone in data["drones"]]
+    return runs, drones
+
+
+# --- Backends ---
+class CsvBackend:
+    def __init__(self, path: str):
+        self.path = path
+        self.drones_path = os.path.splitext(path)[0] + "_drones.csv"
+
+    def write(self, records: List[RunRecord]):
+        runs, drones = _rows(records)
+        with _FileLock(self.path):
+            self._append(self.path, RUN_FIELDS, runs)
+            self._append(self.drones_path, DRONE_FIELDS, drones)
+
+    @staticmethod
+    def _append(path: str, fields: List[str], rows: List[Dict]):
+        if not rows: return
+        if os.path.isfile(path) and os.path.getsize(path):
+            with open(path, newline="") as f: header = next(csv.reader(f), [])
+            if header != fields:
+                # Written with an older column layout: keep it aside instead of mixing layouts
+                legacy = f"{os.path.splitext(path)[0]}.{time.strftime('%Y%m%d-%H%M%S')}.csv"
+                os.replace(path, legacy); print(f"[Results] Moved {path} with an older layout to {legacy}")
+        new_file = not os.path.isfile(path) or not os.path.getsize(path)
+        with open(path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            if new_file: writer.writeheader()
+            writer.writerows(rows)
+
+
+class SqliteBackend:
+    def __init__(self, path: str):
+        self.path = path
+        with self._transaction() as connection:
+            connection.execute(f"CREATE TABLE IF NOT EXISTS runs ({', '.join(RUN_FIELDS)}, PRIMARY KEY (run_id))")
+            connection.execute(f"CREATE TABLE IF NOT EXISTS drone_stats ({', '.join(DRONE_FIELDS)})")
+            connection.execute("CREATE INDEX IF NOT EXISTS drone_stats_run ON drone_stats (run_id)")
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """A fresh connection holding one transaction: committed (or rolled back on error), then closed."""
+        with contextlib.closing(sqlite3.connect(self.path, timeout=30)) as connection, connection:
+            yield connection
+
+    def write(self, records: List[RunRecord]):
+        runs, drones = _rows(records)
+        # SQLite serializes writers itself; one transaction per batch
+        with self._transaction() as connection:
+            connection.executemany(f"INSERT OR REPLACE INTO runs VALUES ({', '.join('?' * len(RUN_FIELDS))})", [[r[f] for f in RUN_FIELDS] for r in runs])
+            connection.executemany(f"INSERT INTO drone_stats VALUES ({', '.join('?' * len(DRONE_FIELDS))})", [[d[f] for f in DRONE_FIELDS] for d in drones])
+
+
+class ParquetBackend:
+    def __init__(self, directory: str):
+        if pa is None: raise RuntimeError("The parquet results backend needs pyarrow (pip install pyarrow)")
+        self.directory = directory
+        self._parts = 0
+
+    def write(self, records: List[RunRecord]):
+        runs, drones = _rows(records)
+        # Parquet files are immutable, so every flush adds part files with a name no other process can pick
+        self._parts += 1
+        name = f"part-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._parts:05d}.parquet"
+        for table, rows in (("runs", runs), ("drones", drones)):
+            if not rows: continue
+            os.makedirs(os.path.join(self.directory, table), exist_ok=True)
+            pq.write_table(pa.Table.from_pylist(rows), os.path.join(self.directory, table, name))
+
+
+BACKENDS = {"csv": lambda: CsvBackend(config.RESULTS_CSV_PATH), "sqlite": lambda: SqliteBackend(config.RESULTS_SQLITE_PATH),
+            "parquet": lambda: ParquetBackend(config.RESULTS_PARQUET_DIR)}
+
+
+class ResultsSink:
+    """
+    submit() only enqueues, so callers on the event loop never touch the disk. A single daemon thread
+    writes batches of up to `batch_size` records, or whatever arrived within `flush_interval` seconds.
+    """
+
+    def __init__(self, backend, batch_size: int = config.RESULTS_BATCH_SIZE, flush_interval: float = config.RESULTS_FLUSH_INTERVAL):
+        self.backend = backend
+        self.batch_size, self.flush_interval = max(1, batch_size), flush_interval
+        self.written: int = 0; self.failed: int = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="results-sink", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: RunRecord):
+        if self._closed: raise RuntimeError("Results sink is closed")
+        self._queue.put(record)
+
+    def flush(self):
+        """Blocks until every record submitted so far has been written (or has failed)."""
+        self._queue.join()
+
+    def close(self):
+        if self._closed: return
+        self._closed = True
+        self._queue.put(None); self._thread.join()
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            batch = [] if record is None else [record]
+            deadline = time.monotonic() + self.flush_interval
+            stop = record is None
+            while not stop and len(batch) < self.batch_size:
+                try: record = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty: break
+                if record is None: stop = True
+                else: batch.append(record)
+            if batch:
+                try: self.backend.write(batch); self.written += len(batch)
+                except Exception as e: self.failed += len(batch); print(f"[Results] Failed to write {len(batch)} record(s): {e}")
+            for _ in range(len(batch) + (1 if stop else 0)): self._queue.task_done()
+            if stop: return
+
+
+_sink: Optional[ResultsSink] = None
+_sink_lock = threading.Lock()
+
+def get_results_sink() -> ResultsSink:
+    """The process-wide sink for config.RESULTS_BACKEND, created on first use and flushed at exit."""
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            if config.RESULTS_BACKEND not in BACKENDS: raise ValueError(f"Unknown results backend: {config.RESULTS_BACKEND}")
+            _sink = ResultsSink(BACKENDS[config.RESULTS_BACKEND]())
+            atexit.register(_sink.close)
+        return _sink
+
+def close_results_sink():
+    global _sink
+    with _sink_lock:
+        if _sink is not None: _sink.close(); _sink = None
@@ -1,12 +1,10 @@
 # services/scenario_service.py
-from typing import Dict, List
+from typing import Dict, List, Optional
 from schemas.api_schemas import ScenarioInfo
-from core import config # <-- Import config
+from core.simulation_settings import SimulationSettings
 import random
 
-# Use world dimensions from the central config file
-WORLD_WIDTH = config.WORLD_WIDTH
-WORLD_HEIGHT = config.WORLD_HEIGHT
+# World dimensions and the custom battle cap come from the session's settings
 SPAWN_PADDING = 100
 
 SCENARIOS_BLUEPRINT: Dict[str, Dict] = {
@@ -27,11 +25,13 @@ SCENARIOS_BLUEPRINT: Dict[str, Dict] = {
     },
 }
 
-def generate_custom_scenario(num_friendly: int, num_enemy: int) -> Dict:
-    """Creates a scenario dynamically based on user-defined drone counts."""
-    # Clamp values to a max of 20 to prevent performance issues
-    num_friendly = min(num_friendly, 20)
-    num_enemy = min(num_enemy, 20)
+def generate_custom_scenario(num_friendly: int, num_enemy: int, rng: Optional[random.Random] = None, settings: Optional[SimulationSettings] = None) -> Dict:
+    """Creates a scenario dynamically based on user-defined drone counts; spawn positions come from `rng`."""
+    rng = rng or random.Random(); settings = settings or SimulationSettings.defaults()
+    WORLD_WIDTH, WORLD_HEIGHT = settings.WORLD_WIDTH, settings.WORLD_HEIGHT
+    # Clamp values to prevent performance issues (see benchmarks/ before raising the limit)
+    num_friendly = min(num_friendly, settings.MAX_CUSTOM_DRONES_PER_TEAM)
+    num_enemy = min(num_enemy, settings.MAX_CUSTOM_DRONES_PER_TEAM)
 
     # Default to 2 assets for custom battles
     assets = [{"id": f"A{i+1}", "position": {
@@ -57,8 +57,8 @@ def generate_custom_scenario(num_friendly: int, num_enemy: int) -> Dict:
         enemy_drones.append({
             "id": drone_id, "team": "enemy", "type": drone_type,
             "position": {
-                "x": random.uniform(SPAWN_PADDING, WORLD_WIDTH - SPAWN_PADDING),
-                "y": random.uniform(SPAWN_PADDING, SPAWN_PADDING + 150)
+                "x": rng.uniform(SPAWN_PADDING, WORLD_WIDTH - SPAWN_PADDING),
+                "y": rng.uniform(SPAWN_PADDING, SPAWN_PADDING + 150)
             }
         })
     
@@ -72,10 +72,12 @@ def generate_custom_scenario(num_friendly: int, num_enemy: int) -> Dict:
 def get_scenario_list() -> List[ScenarioInfo]:
     return [ScenarioInfo(**{"id": sc["id"], "name": sc["name"]}) for sc in SCENARIOS_BLUEPRINT.values()]
 
-def get_scenario(scenario_id: str) -> Dict:
+def get_scenario(scenario_id: str, rng: Optional[random.Random] = None, settings: Optional[SimulationSettings] = None) -> Dict:
     blueprint = SCENARIOS_BLUEPRINT.get(scenario_id)
     if not blueprint:
         return None
+    rng = rng or random.Random(); settings = settings or SimulationSettings.defaults()
+    WORLD_WIDTH, WORLD_HEIGHT = settings.WORLD_WIDTH, settings.WORLD_HEIGHT
     
     # Spawn assets on the friendly side (bottom of the screen)
     assets = [{"id": f"A{i+1}", "position": {
@@ -99,8 +101,8 @@ def get_scenario(scenario_id: str) -> Dict:
         enemy_drones.append({
             "id": drone_id, "team": "enemy", "type": drone_type,
             "position": {
-                "x": random.uniform(SPAWN_PADDING, WORLD_WIDTH - SPAWN_PADDING),
-                "y": random.uniform(SPAWN_PADDING, SPAWN_PADDING + 150)
+                "x": rng.uniform(SPAWN_PADDING, WORLD_WIDTH - SPAWN_PADDING),
+                "y": rng.uniform(SPAWN_PADDING, SPAWN_PADDING + 150)
             }
         })
     
@@ -0,0 +1,70 @@
+# backend/services/squad_service.py
+from typing import Tuple
+import numpy as np
+
+from core.simulation_settings import SimulationSettings
+from core.swarm_state import SwarmState
+
+
+class EnemyClusterer:
+    """
+    Incremental k-means over enemy formations for the squad AI level. Each enemy is a point
+    (x, y, vx * SQUAD_LOOKAHEAD, vy * SQUAD_LOOKAHEAD), so formations flying apart split even while they overlap.
+    There are ceil(enemies / SQUAD_SIZE) clusters; the previous tick's centroids seed the next run (warm start)
+    and any missing seeds are taken evenly along the enemies' grid-cell order, so SQUAD_KMEANS_ITERATIONS
+    Lloyd steps are enough and the cost is O(enemies x clusters). Fully deterministic.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.centroids = np.zeros((0, 4))
+
+    def cluster(self, state: SwarmState, enemy: np.ndarray, settings: SimulationSettings) -> Tuple[np.ndarray, np.ndarray]:
+        """(labels, centroids): a cluster index per enemy row in `enemy`, and each cluster's mean feature vector."""
+        if not len(enemy): self.reset(); return np.zeros(0, dtype=np.int64), self.centroids
+        features = np.hstack([state.position[enemy], state.velocity[enemy] * settings.SQUAD_LOOKAHEAD])
+        k = -(-len(enemy) // settings.SQUAD_SIZE)
+        centroids = self.centroids[:k]
+        if len(centroids) < k:
+            cells = np.floor(features[:, :2] / settings.SPATIAL_CELL_SIZE).astype(np.int64)
+            order = np.lexsort((cells[:, 1], cells[:, 0]))
+            seeds = order[np.linspace(0, len(enemy) - 1, k - len(centroids)).round().astype(np.int64)]
+            centroids = np.vstack([centroids, features[seeds]])
+        for _ in range(settings.SQUAD_KMEANS_ITERATIONS):
+            labels = np.argmin(((features[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2), axis=1)
+            # Clusters that lost every member are dropped, so labels stay dense
+            _, labels = np.unique(labels, return_inverse=True)
+            labels = labels.ravel(); counts = np.bincount(labels)
+            centroids = np.stack([np.bincount(labels, weights=features[:, d]) for d in range(features.shape[1])], axis=1) / counts[:, None]
+        self.centroids = centroids
+        return labels, centroids
+
+
+def form_squads(positions: np.ndarray, centroids: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Splits the drones at `positions` into one squad per cluster, sized in proportion to the cluster weights
+    (largest remainder, at least one drone for the heaviest clusters while drones last). Heaviest cluster first,
+    each squad takes the drones nearest its centroid that are still free. Returns the cluster index per drone.
+    """
+    squad = np.full(len(positions), -1, dtype=np.int64)
+    if not len(positions) or not len(centroids): return squad
+    order = np.argsort(-weights, kind='stable')
+    share = len(positions) * weights / weights.sum()
+    quota = np.floor(share).astype(np.int64)
+    quota[order[np.argsort(-(share - quota)[order], kind='stable')[:len(positions) - quota.sum()]]] += 1
+    # Every cluster gets a drone before any gets a second, as far as the drones go
+    for k in order[:len(positions)]:
+        if quota[k] == 0:
+            donor = order[np.argmax(quota[order])]
+            if quota[donor] > 1: quota[donor] -= 1; quota[k] = 1
+    free = np.ones(len(positions), dtype=bool)
+    for k in order.tolist():
+        if quota[k] == 0: continue
+        candidates = np.flatnonzero(free)
+        distance = np.linalg.norm(positions[candidates] - centroids[k, :2], axis=1)
+        nearest = np.argpartition(distance, quota[k] - 1)[:quota[k]] if quota[k] < len(candidates) else np.arange(len(candidates))
+        chosen = candidates[nearest]
+        squad[chosen] = k; free[chosen] = False
+    return squad
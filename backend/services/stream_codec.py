@@ -0,0 +1,234 @@
+# backend/services/stream_codec.py
+"""
+Binary keyframe + delta encoding for the /simulation stream (opt-in with ?encoding=delta).
+
+Every frame is one binary message, little-endian:
+
+    header   u8 version, u8 kind (0 keyframe / 1 delta), u16 reserved, u32 frame number,
+             u32 metadata length, u32 drone count                                   (16 bytes)
+    metadata UTF-8 JSON, space-padded to a multiple of 4 bytes
+    drones   column blocks, `count` entries each:
+             u32 uid | f32 x,y | f32 vx,vy | i32 target | i16 health | u8 status | u8 team | u8 type
+
+A keyframe carries every drone plus the uid -> id table, enum tables, assets, all live visual events
+and the last 20 log lines. A delta carries only drones whose packed values changed, the uids that
+were removed, new/expired visual events, new log lines, and assets/analysis when they changed.
+Targets are drone uids, -1 for none, or -2 - asset_index for an asset.
+Visual events are sent once, with the ttl they have at that moment (the client animates from it).
+"""
+import json, struct
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from core.swarm_state import SwarmState, TEAMS, DRONE_TYPES, STATUSES, NO_TARGET
+from services.analytics_service import empty_analysis
+
+PROTOCOL_VERSION = 1
+KEYFRAME, DELTA = 0, 1
+_HEADER = struct.Struct("<BBHIII")
+# (name, dtype, values per drone) in wire order
+_COLUMNS = (("uid", "<u4", 1), ("position", "<f4", 2), ("velocity", "<f4", 2), ("target", "<i4", 1),
+            ("health", "<i2", 1), ("status", "u1", 1), ("team", "u1", 1), ("type", "u1", 1))
+LOG_TAIL = 20
+
+
+class _Snapshot:
+    """What the client holds after decoding a frame; deltas are computed against it."""
+
+    def __init__(self, swarm: SwarmState, columns: Dict[str, np.ndarray], event_ids: np.ndarray, event_log: List[Dict], log_length: int, assets: str, analysis: str):
+        self.swarm, self.columns, self.event_ids = swarm, columns, event_ids
+        self.event_log, self.log_length, self.assets, self.analysis = event_log, log_length, assets, analysis
+
+
+def _pack_columns(swarm: SwarmState) -> Dict[str, np.ndarray]:
+    target = np.full(len(swarm), NO_TARGET, dtype=np.int32)
+    has_drone = swarm.target != NO_TARGET; has_asset = ~has_drone & (swarm.target_asset != NO_TARGET)
+    target[has_drone] = swarm.uid[swarm.target[has_drone]]
+    target[has_asset] = -2 - swarm.target_asset[has_asset]
+    return {
+        "uid": swarm.uid.astype(np.uint32), "position": swarm.position.astype(np.float32), "velocity": swarm.velocity.astype(np.float32),
+        "target": target, "health": np.clip(swarm.health, -32768, 32767).astype(np.int16),
+        "status": swarm.status.astype(np.uint8), "team": swarm.team.astype(np.uint8), "type": swarm.type.astype(np.uint8),
+    }
+
+def _json_bytes(data: Dict) -> bytes:
+    payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return payload + b" " * (-len(payload) % 4)
+
+def _pack_frame(kind: int, frame_number: int, meta: Dict, columns: Dict[str, np.ndarray], rows: np.ndarray) -> bytes:
+    metadata_bytes = _json_bytes(meta)
+    parts = [_HEADER.pack(PROTOCOL_VERSION, kind, 0, frame_number, len(metadata_bytes), len(rows)), metadata_bytes]
+    parts += [columns[name][rows].tobytes() for name, _, _ in _COLUMNS]
+    return b"".join(parts)
+
+def _unpack_frame(payload: bytes) -> Tuple[int, int, Dict, Dict[str, np.ndarray]]:
+    """(kind, frame number, metadata, columns); the columns are read-only views into `payload`."""
+    version, kind, _, frame_number, meta_length, count = _HEADER.unpack_from(payload, 0)
+    if version != PROTOCOL_VERSION: raise ValueError(f"Unsupported stream protocol version {version}")
+    offset = _HEADER.size
+    meta = json.loads(payload[offset:offset + meta_length]); offset += meta_length
+    columns = {}
+    for name, dtype, width in _COLUMNS:
+        values = np.frombuffer(payload, dtype=dtype, count=count * width, offset=offset); offset += values.nbytes
+        columns[name] = values.reshape(count, width) if width > 1 else values
+    return kind, frame_number, meta, columns
+
+def is_keyframe(payload: bytes) -> bool:
+    return payload[1] == KEYFRAME
+
+def restamp(payload: bytes, simulation_state: Dict) -> bytes:
+    """The same frame with extra fields merged into its simulation_state."""
+    kind, frame_number, meta, columns = _unpack_frame(payload)
+    meta["simulation_state"] = {**meta["simulation_state"], **simulation_state}
+    return _pack_frame(kind, frame_number, meta, columns, np.arange(len(columns["uid"])))
+
+
+class DeltaEncoder:
+    """
+    Encodes one delta chain. encode() diffs against the committed baseline; commit() makes the returned
+    snapshot the new baseline once the frame is on its way to the clients. encode(keyframe=True)
+    builds a standalone frame for a client that joined late or missed a delta, without touching the chain.
+    """
+
+    def __init__(self):
+        self.frame_number = 0
+        self._baseline: Optional[_Snapshot] = None
+
+    def reset(self):
+        self._baseline = None
+
+    def commit(self, snapshot: _Snapshot):
+        self._baseline = snapshot; self.frame_number += 1
+
+    def encode(self, manager, simulation_state: Dict, keyframe: bool = False) -> Tuple[bytes, _Snapshot]:
+        swarm = manager.swarm
+        metadata = manager.frame_metadata()
+        columns = _pack_columns(swarm)
+        events = manager.visual_events; event_slots = events.live_slots(); event_ids = events.id[event_slots]
+        assets = json.dumps(swarm.asset_dicts(), separators=(",", ":"))
+        analysis = metadata["analysis"]
+        analysis_json = json.dumps(analysis, separators=(",", ":"))
+        base = self._baseline
+        keyframe = keyframe or base is None or base.swarm is not swarm or base.event_log is not manager.event_log
+        meta = {"simulation_state": {**metadata["simulation_state"], **simulation_state}, "metrics": metadata["metrics"]}
+
+        if keyframe:
+            rows = np.arange(len(swarm))
+            meta.update({
+                "tables": {"teams": TEAMS, "types": DRONE_TYPES, "statuses": STATUSES},
+                "ids": {str(u): swarm.ids[i] for i, u in enumerate(swarm.uid.tolist())},
+                "assets": json.loads(assets), "analysis": analysis,
+                "events": events.to_dicts(event_slots), "log": manager.event_log[-LOG_TAIL:],
+            })
+        else:
+            previous = base.columns
+            known = np.zeros(len(swarm), dtype=bool); changed = np.ones(len(swarm), dtype=bool)
+            if len(previous["uid"]):
+                # uids are ascending in both snapshots, so a searchsorted lines rows up by drone
+                slot = np.minimum(np.searchsorted(previous["uid"], columns["uid"]), len(previous["uid"]) - 1)
+                known = previous["uid"][slot] == columns["uid"]
+                changed = ~known
+                for name in ("position", "velocity", "target", "health", "status"):
+                    differs = previous[name][slot] != columns[name]
+                    changed |= differs.any(axis=1) if differs.ndim > 1 else differs
+            rows = np.flatnonzero(changed)
+            removed = np.setdiff1d(previous["uid"], columns["uid"], assume_unique=True)
+            meta.update({
+                "removed": removed.tolist(),
+                # Event ids only grow, so anything above the baseline's newest id is new
+                "events": events.to_dicts(event_slots[event_ids > (base.event_ids[-1] if len(base.event_ids) else -1)]),
+                "expired": np.setdiff1d(base.event_ids, event_ids, assume_unique=True).tolist(),
+                "log": manager.event_log[base.log_length:],
+            })
+            new_uids = ~known[rows]
+            if new_uids.any(): meta["ids"] = {str(int(columns["uid"][r])): swarm.ids[r] for r in rows[new_uids]}
+            if assets != base.assets: meta["assets"] = json.loads(assets)
+            if analysis_json != base.analysis: meta["analysis"] = analysis
+
+        payload = _pack_frame(KEYFRAME if keyframe else DELTA, self.frame_number + 1, meta, columns, rows)
+        snapshot = _Snapshot(swarm, columns, event_ids, manager.event_log, len(manager.event_log), assets, analysis_json)
+        return payload, snapshot
+
+
+class DeltaDecoder:
+    """
+    Rebuilds full frames from a keyframe/delta stream (the Python twin of frontend/src/hooks/deltaDecoder.js).
+    Used to replay recordings: frame() gives the JSON frame shape, keyframe() re-encodes the current state.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.frame_number = 0
+        self.tables: Optional[Dict] = None
+        self.columns: Dict[str, np.ndarray] = {name: np.zeros((0, width) if width > 1 else 0, dtype=dtype) for name, dtype, width in _COLUMNS}
+        self.ids: Dict[int, str] = {}
+        self.simulation_state: Dict = {}; self.metrics: Dict = {}; self.analysis: Dict = empty_analysis()
+        self.assets: List[Dict] = []; self.events: Dict[str, Dict] = {}; self.log: List[Dict] = []
+
+    def decode(self, payload: bytes) -> Dict:
+        """Applies one frame and returns its metadata."""
+        kind, frame_number, meta, update = _unpack_frame(payload)
+        if kind == KEYFRAME:
+            self.reset(); self.tables = meta["tables"]
+        elif self.tables is None:
+            raise ValueError("Delta frame received before any keyframe")
+        columns = self.columns
+        if meta.get("removed"):
+            keep = ~np.isin(columns["uid"], meta["removed"])
+            columns = {name: values[keep] for name, values in columns.items()}
+            for uid in meta["removed"]: self.ids.pop(uid, None)
+        self.ids.update({int(uid): drone_id for uid, drone_id in meta.get("ids", {}).items()})
+
+        # Rows are kept in uid order, which is also the simulation's row order
+        slot = np.searchsorted(columns["uid"], update["uid"])
+        known = slot < len(columns["uid"])
+        known[known] = columns["uid"][slot[known]] == update["uid"][known]
+        columns = {name: values.copy() for name, values in columns.items()}
+        for name, values in columns.items(): values[slot[known]] = update[name][known]
+        if not known.all():
+            columns = {name: np.concatenate([values, update[name][~known]]) for name, values in columns.items()}
+            order = np.argsort(columns["uid"], kind="stable")
+            columns = {name: values[order] for name, values in columns.items()}
+        self.columns = columns
+
+        self.frame_number = frame_number
+        self.simulation_state, self.metrics = meta["simulation_state"], meta["metrics"]
+        if "assets" in meta: self.assets = meta["assets"]
+        if "analysis" in meta: self.analysis = meta["analysis"]
+        for event_id in meta.get("expired", []): self.events.pop(event_id, None)
+        self.events.update((e["id"], e) for e in meta.get("events", []))
+        self.log = (self.log + meta.get("log", []))[-LOG_TAIL:]
+        return meta
+
+    def _target_id(self, target: int) -> Optional[str]:
+        if target == NO_TARGET: return None
+        if target >= 0: return self.ids.get(target)
+        asset = -2 - target
+        return self.assets[asset]["id"] if asset < len(self.assets) else None
+
+    def frame(self) -> Dict:
+        """The current state in the same shape as SimulationManager.get_current_state().dict()."""
+        c, teams, types, statuses = self.columns, self.tables["teams"], self.tables["types"], self.tables["statuses"]
+        drones = [
+            {"id": self.ids[uid], "team": teams[team], "type": types[kind], "position": {"x": pos[0], "y": pos[1]},
+             "velocity": {"x": vel[0], "y": vel[1]}, "status": statuses[status], "health": health, "target_id": self._target_id(target)}
+            for uid, team, kind, pos, vel, status, health, target in zip(
+                c["uid"].tolist(), c["team"].tolist(), c["type"].tolist(), c["position"].tolist(), c["velocity"].tolist(),
+                c["status"].tolist(), c["health"].tolist(), c["target"].tolist())
+        ]
+        return {"simulation_state": dict(self.simulation_state), "drones": drones, "assets": self.assets, "visual_events": list(self.events.values()),
+                "metrics": self.metrics, "event_log": self.log, "analysis": self.analysis}
+
+    def matches(self, swarm: SwarmState) -> bool:
+        """True if the decoded drones are exactly what `swarm` would encode to."""
+        columns = _pack_columns(swarm)
+        return all(np.array_equal(columns[name], self.columns[name]) for name, _, _ in _COLUMNS)
+
+    def keyframe(self, simulation_state: Optional[Dict] = None) -> bytes:
+        """Re-encodes the current state as a standalone keyframe."""
+        meta = {"simulation_state": {**self.simulation_state, **(simulation_state or {})}, "metrics": self.metrics, "tables": self.tables,
+                "ids": {str(uid): self.ids[uid] for uid in self.columns["uid"].tolist()}, "assets": self.assets, "analysis": self.analysis,
+                "events": list(self.events.values()), "log": self.log}
+        return _pack_frame(KEYFRAME, self.frame_number, meta, self.columns, np.arange(len(self.columns["uid"])))
@@ -0,0 +1,46 @@
+# backend/tests/test_ai_service.py
+import numpy as np
+import pytest
+
+from core.geometry_cache import distance_matrix
+from core.swarm_state import AIR_TO_AIR, GROUND_ATTACK
+from manager.simulation_manager import SimulationManager
+from services import ai_service
+
+
+def battle(level, seed, ticks):
+    manager = SimulationManager(save_results=False)
+    manager.configure(AI_INTELLIGENCE_LEVEL=level)
+    manager.start_custom(60, 60, seed=seed)
+    for _ in range(ticks):
+        if manager.status == "running": manager.step()
+    manager.spatial_index.sync(manager.swarm); manager.geometry.sync(manager.swarm)
+    return manager
+
+
+def dense_enemy_targets(state, friendly, enemy):
+    """The friendly x enemy matrix version: nearest friendly per enemy, then ground attackers, then the focus-fire half."""
+    ids, pos = state.ids, state.position
+    friendly_enemy = distance_matrix(pos[friendly], pos[enemy]); drone_asset = distance_matrix(pos, state.asset_position)
+    targets = [ids[f] for f in friendly[np.argmin(friendly_enemy, axis=0)]]
+    ground = np.flatnonzero(state.type[enemy] == GROUND_ATTACK)
+    for column in ground: targets[column] = state.asset_ids[np.argmin(drone_asset[enemy[column]])]
+    primary = np.argmin(drone_asset[friendly].min(axis=1))
+    for column in np.argsort(friendly_enemy[primary], kind='stable')[:len(enemy) // 2]: targets[column] = ids[friendly[primary]]
+    return targets
+
+
+@pytest.mark.parametrize("seed, ticks, ground_attackers", [(1, 0, True), (2, 150, True), (3, 400, True), (4, 100, False)])
+def test_enemy_and_normal_decisions_match_dense_matrices(seed, ticks, ground_attackers):
+    manager = battle("normal", seed, ticks)
+    state, index, geometry = manager.swarm, manager.spatial_index, manager.geometry
+    if not ground_attackers: state.type[state.type == GROUND_ATTACK] = AIR_TO_AIR  # the normal level falls back to the nearest enemy
+    friendly, enemy = geometry.friendly, geometry.enemy
+    decisions = ai_service.get_enemy_decisions(state, index, geometry)
+    assert [decisions[state.ids[e]]["target_id"] for e in enemy] == dense_enemy_targets(state, friendly, enemy)
+
+    friendly_enemy = distance_matrix(state.position[friendly], state.position[enemy])
+    asset_threat = np.where(state.type[enemy] == GROUND_ATTACK, distance_matrix(state.position[enemy], state.asset_position).min(axis=1), np.inf)
+    decisions = ai_service.get_swarm_decisions(state, index, geometry=geometry, settings=manager.settings)
+    for slot, f in enumerate(friendly):
+        assert decisions[state.ids[f]]["target_id"] == state.ids[enemy[np.lexsort((friendly_enemy[slot], asset_threat))[0]]]
@@ -0,0 +1,81 @@
+# backend/tests/test_assignment_service.py
+import itertools
+
+import numpy as np
+import pytest
+
+from services.assignment_service import AssignmentEngine, solve_auction, solve_auction_batch, solve_hungarian
+
+EPSILON = 0.01
+
+
+def total(cost, columns):
+    return cost[np.arange(len(columns)), columns].sum()
+
+
+def test_warm_start_after_price_jump_stays_epsilon_optimal():
+    """
+    A stale price far above the benefit range must not start a price war: with a 300 round budget the war
+    (one epsilon per round over ~68 units) would run out of rounds and end in the greedy fallback.
+    """
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        cost = rng.uniform(0, 9, (9, 9))
+        prices = rng.uniform(0, 1, 9); prices[rng.integers(9)] = 68.15
+        columns, _ = solve_auction(cost, prices, rng.permutation(9), EPSILON, max_rounds=300)
+        assert sorted(columns.tolist()) == list(range(9))
+        assert total(cost, columns) <= total(cost, solve_hungarian(cost)) + 9 * EPSILON + 1e-9
+
+
+def test_engine_warm_start_on_changed_columns():
+    rng = np.random.default_rng(11)
+    engine = AssignmentEngine("auction", EPSILON)
+    row_ids = [f"f{i}" for i in range(6)]
+    for tick in range(20):
+        column_ids = [f"e{j}" for j in range(tick % 3, tick % 3 + 8)]
+        cost = rng.uniform(0, 5 + 50 * (tick % 2), (6, 8))
+        pairs = engine.assign(row_ids, column_ids, cost)
+        columns = np.array([j for _, j in sorted(pairs)])
+        assert len(set(columns.tolist())) == 6
+        assert total(cost, columns) <= total(cost, solve_hungarian(cost)) + 6 * EPSILON + 1e-9
+
+
+def brute_force(cost):
+    """Cheapest total over every injective row -> column map."""
+    n, m = cost.shape
+    return min(cost[np.arange(n), list(p)].sum() for p in itertools.permutations(range(m), n))
+
+
+@pytest.mark.parametrize("n,m", [(1, 1), (3, 3), (4, 6), (6, 6), (5, 7)])
+def test_solvers_match_brute_force(n, m):
+    rng = np.random.default_rng(n * 10 + m)
+    for _ in range(10):
+        cost = rng.uniform(0, 20, (n, m))
+        best = brute_force(cost)
+        hungarian = solve_hungarian(cost)
+        assert len(set(hungarian.tolist())) == n and np.isclose(total(cost, hungarian), best)
+        auction, _ = solve_auction(cost, epsilon=EPSILON)
+        assert len(set(auction.tolist())) == n and total(cost, auction) <= best + n * EPSILON + 1e-9
+
+
+def test_engine_transposes_more_rows_than_columns():
+    rng = np.random.default_rng(5)
+    cost = rng.uniform(0, 10, (7, 4))
+    for method in ("auction", "hungarian"):
+        pairs = AssignmentEngine(method, EPSILON).assign([f"f{i}" for i in range(7)], [f"e{j}" for j in range(4)], cost)
+        assert len(pairs) == 4 and len({j for _, j in pairs}) == 4 and len({i for i, _ in pairs}) == 4
+        assert sum(cost[i, j] for i, j in pairs) <= brute_force(cost.T) + 4 * EPSILON + 1e-9
+
+
+def test_batch_auction_matches_brute_force_per_problem():
+    rng = np.random.default_rng(9)
+    shapes = [(3, 5), (5, 5), (1, 2), (4, 6)]
+    cost = np.full((len(shapes), 5, 6), np.inf)
+    for b, (n, m) in enumerate(shapes): cost[b, :n, :m] = rng.uniform(0, 15, (n, m))
+    columns = solve_auction_batch(cost, EPSILON)
+    assert columns.shape == (len(shapes), 5)
+    for b, (n, m) in enumerate(shapes):
+        assert (columns[b, n:] == -1).all()
+        assigned = columns[b, :n]
+        assert len(set(assigned.tolist())) == n and ((assigned >= 0) & (assigned < m)).all()
+        assert total(cost[b, :n, :m], assigned) <= brute_force(cost[b, :n, :m]) + n * EPSILON + 1e-9
@@ -0,0 +1,55 @@
+# backend/tests/test_batch_runner.py
+import json
+
+from core import config
+from manager import batch_runner
+from manager.simulation_manager import SimulationManager
+
+
+def comparable(result):
+    """Everything a run reports except how long it took on this machine."""
+    return result.dict(exclude={"wall_time_sec"})
+
+
+def test_grid_is_the_product_of_scenarios_levels_and_overrides():
+    specs = batch_runner.build_grid(["small_swarm"], [(4, 6)], ["basic", "advanced"], {"FIRING_RANGE": [200, 250], "ENEMY_DRONE_SPEED": [40.0]}, seeds=3, base_seed=10)
+    assert len(specs) == 2 * 2 * 2 * 3 and [s.run_id for s in specs] == list(range(len(specs)))
+    assert [s.seed for s in specs[:4]] == [10, 11, 12, 10]
+    assert {(s.scenario_id, s.num_friendly, s.num_enemy) for s in specs} == {("small_swarm", None, None), (None, 4, 6)}
+    assert {json.dumps(s.config_overrides, sort_keys=True) for s in specs} == {'{"ENEMY_DRONE_SPEED": 40.0, "FIRING_RANGE": 200}', '{"ENEMY_DRONE_SPEED": 40.0, "FIRING_RANGE": 250}'}
+
+
+def test_process_pool_runs_match_in_process_runs_and_a_plain_manager():
+    specs = batch_runner.build_grid(custom_counts=[(6, 6)], ai_levels=["basic", "advanced"], overrides={"FIRING_RANGE": [200, 300]}, max_ticks=3000)
+    defaults = (config.FIRING_RANGE, config.AI_INTELLIGENCE_LEVEL)
+    pooled, local = batch_runner.run_batch(specs, workers=2), batch_runner.run_batch(specs, workers=1)
+    assert [comparable(r) for r in pooled] == [comparable(r) for r in local]
+    # Each run is the same battle a manager configured by hand plays, and its overrides never reach the module config
+    for result in local:
+        spec = result.spec
+        manager = SimulationManager(save_results=False)
+        manager.configure(AI_INTELLIGENCE_LEVEL=spec.ai_level, **spec.config_overrides)
+        manager.start_custom(6, 6, seed=spec.seed)
+        ticks = 0
+        while manager.status == "running" and ticks < spec.max_ticks: manager.step(); ticks += 1
+        assert (result.ticks, result.neutralizations, result.friendly_remaining, result.enemy_remaining) == (ticks, *(manager.results()[k] for k in ("neutralizations", "friendly_remaining", "enemy_remaining")))
+        assert result.outcome != "timeout"
+    assert (config.FIRING_RANGE, config.AI_INTELLIGENCE_LEVEL) == defaults
+
+
+def test_runs_past_max_ticks_time_out():
+    result = batch_runner.run_single(batch_runner.build_grid(custom_counts=[(6, 6)], max_ticks=30)[0])
+    assert result.outcome == "timeout" and result.ticks == 30
+
+
+def test_aggregate_and_cli_report(tmp_path):
+    out = tmp_path / "sweep.json"
+    batch_runner.main(["--custom", "5v5", "3v8", "--ai-levels", "basic", "--seeds", "3", "--max-ticks", "3000", "--workers", "1", "--out", str(out)])
+    report = json.loads(out.read_text())
+    runs, aggregates = report["runs"], report["aggregates"]
+    assert len(runs) == 6 and [a["scenario"] for a in aggregates] == ["custom_5v5", "custom_3v8"]
+    for cell in aggregates:
+        mine = [r for r in runs if f"custom_{r['spec']['num_friendly']}v{r['spec']['num_enemy']}" == cell["scenario"]]
+        assert cell["runs"] == 3 and sum(cell["outcomes"].values()) == 3
+        assert cell["win_rate"] == sum(r["outcome"] == "friendly_victory" for r in mine) / 3
+        assert abs(cell["mean_neutralizations"] - sum(r["neutralizations"] for r in mine) / 3) < 1e-9
@@ -0,0 +1,73 @@
+# backend/tests/test_event_buffer.py
+import numpy as np
+import pytest
+
+from core.event_buffer import COMM_LINK, EVENT_TYPES, NEUTRALIZATION, NO_TEAM, WEAPON_FIRE, VisualEventBuffer
+from core.swarm_state import ENEMY, FRIENDLY, TEAMS
+
+
+class ListOfEvents:
+    """The list of event dicts the ring buffer replaced, plus the ring's rule that only the newest `capacity` ids survive."""
+
+    def __init__(self, capacity):
+        self.capacity, self.events, self.next_id, self.dropped = capacity, [], 0, 0
+
+    def emit(self, kind, position, ttl, team, target_position):
+        self.events.append({"id": self.next_id, "type": EVENT_TYPES[kind], "position": {"x": position[0], "y": position[1]}, "ttl": ttl,
+                            "team": None if team == NO_TEAM else TEAMS[team],
+                            "target_position": None if target_position is None else {"x": target_position[0], "y": target_position[1]}})
+        self.next_id += 1
+        overwritten = [e for e in self.events if e["id"] < self.next_id - self.capacity]
+        self.dropped += len(overwritten)
+        self.events = [e for e in self.events if e["id"] >= self.next_id - self.capacity]
+
+    def decay(self, dt):
+        self.events = [e for e in self.events if e["ttl"] > 0]
+        for e in self.events: e["ttl"] -= dt
+
+
+@pytest.mark.parametrize("capacity", [4096, 16, 3])
+def test_ring_buffer_matches_a_list_of_events(capacity):
+    rng = np.random.default_rng(capacity)
+    buffer, reference = VisualEventBuffer(capacity), ListOfEvents(capacity)
+    for _ in range(300):
+        action = rng.integers(3)
+        if action == 0:
+            position, target = rng.uniform(0, 1000, 2), rng.uniform(0, 1000, 2) if rng.random() < 0.5 else None
+            team = int(rng.choice([NO_TEAM, FRIENDLY, ENEMY]))
+            assert buffer.emit(COMM_LINK, position, 0.5, team, target_position=target) == reference.next_id
+            reference.emit(COMM_LINK, position.tolist(), 0.5, team, None if target is None else target.tolist())
+        elif action == 1:
+            count = int(rng.integers(0, 2 * capacity if capacity < 100 else 40))
+            kind = int(rng.choice([WEAPON_FIRE, NEUTRALIZATION]))
+            positions, targets, teams = rng.uniform(0, 1000, (count, 2)), rng.uniform(0, 1000, (count, 2)), rng.integers(0, 2, count)
+            ttl = float(rng.choice([0.25, 1.5]))
+            ids = buffer.emit_many(kind, positions, ttl, teams, targets if kind == WEAPON_FIRE else None)
+            for position, target, team in zip(positions.tolist(), targets.tolist(), teams.tolist()):
+                reference.emit(kind, position, ttl, team, target if kind == WEAPON_FIRE else None)
+            assert ids.tolist() == list(range(reference.next_id - min(count, capacity), reference.next_id))
+        else:
+            dt = float(rng.uniform(0.01, 0.3))
+            buffer.decay(dt); reference.decay(dt)
+        assert_same_events(buffer.to_dicts(), reference.events)
+        assert len(buffer) == len(reference.events) and buffer.dropped == reference.dropped
+        assert buffer.ids().tolist() == [e["id"] for e in reference.events]
+
+
+def assert_same_events(events, expected):
+    """Equal dicts, ttls compared up to rounding."""
+    assert [{**e, "ttl": None} for e in events] == [{**e, "ttl": None} for e in expected]
+    np.testing.assert_allclose([e["ttl"] for e in events], [e["ttl"] for e in expected], rtol=0, atol=1e-12)
+
+
+def test_full_buffer_overwrites_the_oldest_live_events():
+    buffer = VisualEventBuffer(4)
+    for n in range(3): buffer.emit(COMM_LINK, (n, n), 1.0, FRIENDLY)
+    buffer.emit_many(WEAPON_FIRE, np.arange(12.0).reshape(6, 2), 0.25, ENEMY)  # ids 3..8: 3 and 4 never fit, 5..8 overwrite the three links
+    assert buffer.ids().tolist() == [5, 6, 7, 8] and buffer.dropped == 3 + 2 and buffer.next_id == 9
+    assert [e["position"] for e in buffer.to_dicts()] == [{"x": x, "y": x + 1} for x in (4.0, 6.0, 8.0, 10.0)]
+    assert buffer.live_slots().tolist() == [1, 2, 3, 0]  # slots wrap, emission order doesn't
+    buffer.decay(0.25); buffer.decay(0.0)  # ttl reaches 0 on the first decay and the event goes on the next
+    assert len(buffer) == 0 and buffer.to_dicts() == []
+    buffer.emit(NEUTRALIZATION, (1, 1), 1.5)
+    assert buffer.to_dicts() == [{"id": 9, "type": "neutralization", "position": {"x": 1.0, "y": 1.0}, "ttl": 1.5, "team": None, "target_position": None}]
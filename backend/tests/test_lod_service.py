@@ -0,0 +1,78 @@
+# backend/tests/test_lod_service.py
+import numpy as np
+import pytest
+
+from core import config
+from core.event_buffer import COMM_LINK
+from core.swarm_state import FRIENDLY
+from manager.simulation_manager import SimulationManager
+from manager.simulation_runner import ViewportSubscriber
+from services.frame_serializer import build_frame, frame_base
+from services.lod_service import DETAIL_LEVELS, Viewport, build_view_frame
+
+
+def battle(ticks=120):
+    """A battle under way, so there are visual events (tracers and comm links) to cut to the viewport too."""
+    manager = SimulationManager(save_results=False)
+    manager.configure(AI_INTELLIGENCE_LEVEL="advanced")
+    manager.start_custom(80, 80, seed=7)
+    for _ in range(ticks): manager.step()
+    # Plus links across the whole world, so events start, end, cross or miss any viewport
+    rng = np.random.default_rng(7)
+    manager.visual_events.emit_many(COMM_LINK, rng.uniform(0, 1500, (200, 2)), 0.5, FRIENDLY, rng.uniform(0, 1500, (200, 2)))
+    manager.spatial_index.sync(manager.swarm)
+    return manager
+
+
+def inside(view, point):
+    return point is not None and view.x0 <= point["x"] <= view.x1 and view.y0 <= point["y"] <= view.y1
+
+
+@pytest.mark.parametrize("bounds, detail", [((200, 300, 700, 900), "medium"), ((0, 0, 400, 400), "high"), ((350, 0, 380, 800), "low")])
+def test_view_frame_is_the_full_frame_cut_to_the_viewport(bounds, detail):
+    manager = battle()
+    view = Viewport.create(list(bounds), detail)
+    base = frame_base(manager)
+    full, near, far = build_frame(manager, base=base), build_view_frame(manager, base, view, far=False), build_view_frame(manager, base, view, far=True)
+    # Inside the viewport: the full frame's drones and events, unchanged and in the same order
+    assert near["drones"] == [d for d in full["drones"] if inside(view, d["position"])]
+    assert near["visual_events"] == [e for e in full["visual_events"] if inside(view, e["position"]) or inside(view, e["target_position"])]
+    assert 0 < len(near["visual_events"]) < len(full["visual_events"])
+    assert len(near["drones"]) < len(full["drones"]) and near["view"]["drones_shown"] == len(near["drones"]) and near["view"]["drones_total"] == len(full["drones"])
+    shown = {d["id"] for d in near["drones"]}
+    assert near["analysis"]["coordination_targets"] == [t for t in full["analysis"]["coordination_targets"] if t["source_id"] in shown]
+    assert {key: near[key] for key in ("simulation_state", "metrics", "assets", "event_log")} == {key: full[key] for key in ("simulation_state", "metrics", "assets", "event_log")}
+    # Outside it: clusters only on far frames, one per occupied cell, accounting for every other drone
+    assert "clusters" not in near["view"] and far["drones"] == near["drones"]
+    clusters, cell = far["view"]["clusters"], config.LOD_CLUSTER_CELL_SIZE * DETAIL_LEVELS[detail]
+    outside = [d for d in full["drones"] if not inside(view, d["position"])]
+    assert sum(c["count"] for c in clusters) == len(outside) and all(c["count"] == c["friendly"] + c["enemy"] for c in clusters)
+    assert sum(c["enemy"] for c in clusters) == sum(d["team"] == "enemy" for d in outside)
+    cells = {(np.floor(d["position"]["x"] / cell), np.floor(d["position"]["y"] / cell)) for d in outside}
+    assert len(clusters) == len(cells)
+    for c in clusters:
+        members = [d["position"] for d in outside if (np.floor(d["position"]["x"] / cell), np.floor(d["position"]["y"] / cell)) == (np.floor(c["position"]["x"] / cell), np.floor(c["position"]["y"] / cell))]
+        assert len(members) == c["count"]
+        assert c["position"] == pytest.approx({"x": np.mean([m["x"] for m in members]), "y": np.mean([m["y"] for m in members])}, abs=0.05)
+
+
+def test_whole_world_viewport_matches_the_full_frame():
+    manager = battle()
+    settings = manager.settings
+    base = frame_base(manager)
+    view = Viewport.parse(f"-1000,-1000,{settings.WORLD_WIDTH + 1000},{settings.WORLD_HEIGHT + 1000}")
+    frame, full = build_view_frame(manager, base, view, far=True), build_frame(manager, base=base)
+    assert frame["view"]["clusters"] == [] and {k: v for k, v in frame.items() if k != "view"} == full
+
+
+@pytest.mark.parametrize("bounds, detail", [([0, 0, 10], None), ([0, 0, 10, "x"], None), ([10, 0, 0, 10], None), ([0, 0, float("nan"), 10], None), ([0, 0, 10, 10], "ultra")])
+def test_invalid_viewports_are_rejected(bounds, detail):
+    with pytest.raises(ValueError): Viewport.create(bounds, detail)
+
+
+def test_out_of_view_clusters_are_sent_every_far_interval_and_after_a_view_change(monkeypatch):
+    monkeypatch.setattr(config, "LOD_FAR_INTERVAL", 3)
+    subscriber = ViewportSubscriber(Viewport.parse("0,0,10,10"))
+    assert [subscriber.next_is_far() for _ in range(7)] == [True, False, False, True, False, False, True]
+    subscriber.set_view(Viewport.parse("5,5,20,20", "high"))
+    assert subscriber.viewport.detail == "high" and [subscriber.next_is_far() for _ in range(2)] == [True, False]
@@ -0,0 +1,130 @@
+# backend/tests/test_planner_service.py
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from core.swarm_state import GROUND_ATTACK
+from manager.simulation_manager import SimulationManager
+from services import ai_service
+from services.assignment_service import AssignmentEngine
+from services.planner_service import IncrementalPlanner
+
+
+class Planning:
+    """A custom battle frozen in place, planned tick by tick by its own IncrementalPlanner (nothing moves unless a test moves it)."""
+
+    def __init__(self, level="advanced", seed=0, **settings):
+        self.manager = SimulationManager(save_results=False)
+        self.manager.configure(**{"AI_INTELLIGENCE_LEVEL": level, "PLANNER_REFRESH_TICKS": 10_000, "PLANNER_THREAT_RANKS": 1, **settings})
+        self.manager.start_custom(12, 12, seed=seed)
+        self.state, self.settings = self.manager.swarm, self.manager.settings
+        self.planner = IncrementalPlanner(AssignmentEngine(self.settings.ASSIGNMENT_SOLVER))
+
+    def tick(self):
+        """(decisions made this tick, re-plans by reason this tick)."""
+        state, manager = self.state, self.manager
+        manager.spatial_index.sync(state); manager.geometry.sync(state)
+        before = Counter(self.planner.triggers)
+        decisions = self.planner.plan(state, manager.spatial_index, manager.geometry, self.settings)
+        state.apply_decisions(decisions)
+        return decisions, self.planner.triggers - before
+
+    def friendly_ids(self):
+        return {self.state.ids[f] for f in self.manager.geometry.friendly.tolist()}
+
+    def roles(self):
+        self.manager.geometry.sync(self.state)
+        guardians, hunters = ai_service.split_roles(self.state, self.manager.geometry)
+        return [self.state.ids[g] for g in guardians], [self.state.ids[h] for h in hunters]
+
+
+def settled(**settings):
+    planning = Planning(**settings)
+    decisions, triggers = planning.tick()
+    assert set(decisions) == planning.friendly_ids() and triggers == Counter(new=12)
+    assert planning.tick() == ({}, Counter())  # nothing changed, so nobody is re-planned
+    return planning
+
+
+@pytest.mark.parametrize("level", ["basic", "normal"])
+def test_cheap_levels_replan_every_friendly_every_tick(level):
+    planning = Planning(level)
+    for _ in range(3):
+        decisions, triggers = planning.tick()
+        assert set(decisions) == planning.friendly_ids() and not triggers
+
+
+def test_target_lost():
+    planning = settled()
+    _, hunters = planning.roles()
+    target = planning.planner.decisions[hunters[0]]["target_id"]
+    chasers = {d for d, decision in planning.planner.decisions.items() if decision.get("target_id") == target}
+    planning.state.remove(np.array([planning.state.index[target]]))
+    decisions, triggers = planning.tick()
+    assert triggers["target_lost"] == len(chasers) and chasers <= set(decisions)
+
+
+def test_role_changed():
+    planning = settled()
+    guardians, hunters = planning.roles()
+    # A hunter parked on an asset becomes a guardian and pushes the farthest guardian out
+    planning.state.position[planning.state.index[hunters[-1]]] = planning.state.asset_position[0]
+    new_guardians, _ = planning.roles()
+    swapped = set(guardians) ^ set(new_guardians)
+    decisions, triggers = planning.tick()
+    assert hunters[-1] in swapped and len(swapped) == 2
+    assert triggers == Counter(role_changed=2) and set(decisions) == swapped
+
+
+def untargeted_enemies(planning):
+    taken = {d.get("target_id") for d in planning.planner.decisions.values()}
+    return [e for e in planning.manager.geometry.enemy.tolist() if planning.state.ids[e] not in taken]
+
+
+def test_guardian_zone():
+    planning = settled()
+    guardians, _ = planning.roles()
+    state = planning.state
+    # An enemy nobody chases (and not a ground attacker, so the threat ranking stays) leaves the zone around the assets
+    leaving = next(e for e in untargeted_enemies(planning) if state.type[e] != GROUND_ATTACK)
+    state.position[leaving] = (-5000.0, -5000.0)
+    decisions, triggers = planning.tick()
+    assert triggers == Counter(guardian_zone=3) and set(decisions) == set(guardians)
+
+
+def test_intercept_worsened():
+    planning = settled()
+    _, hunters = planning.roles()
+    state = planning.state
+    hunter = state.index[hunters[0]]; target = state.target[hunter]
+    # Pushed straight away from its target, 10 seconds of flight farther than when it was assigned
+    away = state.position[hunter] - state.position[target]
+    state.position[hunter] += away / np.linalg.norm(away) * planning.settings.FRIENDLY_DRONE_SPEED * 10
+    decisions, triggers = planning.tick()
+    assert triggers == Counter(intercept_worsened=1) and set(decisions) == {hunters[0]}
+
+
+def test_ranking_change_queues_every_friendly_within_the_budget():
+    planning = settled(PLANNER_REPLAN_BUDGET=3)
+    state = planning.state
+    # An enemy nobody chases turns into a ground attacker right on an asset: the new top threat
+    newcomer = untargeted_enemies(planning)[-1]
+    state.type[newcomer] = GROUND_ATTACK; state.position[newcomer] = state.asset_position[0] + 5.0
+    refreshed = []
+    for _ in range(4):  # all 12 friendlies are queued, 3 re-planned per tick
+        decisions, triggers = planning.tick()
+        assert triggers == Counter(refresh=3) and len(decisions) == 3
+        refreshed += list(decisions)
+    assert sorted(refreshed) == sorted(planning.friendly_ids())
+    assert planning.tick() == ({}, Counter())
+
+
+def test_periodic_refresh_works_through_every_friendly_within_the_budget():
+    planning = settled(PLANNER_REPLAN_BUDGET=2, PLANNER_REFRESH_TICKS=3)
+    refreshed = []
+    for _ in range(6):  # the refresh on tick 3 queues all 12 friendlies; 2 per tick take 6 ticks
+        decisions, triggers = planning.tick()
+        assert triggers == Counter(refresh=2) and len(decisions) == 2
+        refreshed += list(decisions)
+    assert sorted(refreshed) == sorted(planning.friendly_ids())
@@ -0,0 +1,30 @@
+# backend/tests/test_results_sink.py
+import gc
+import os
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from manager.simulation_manager import SimulationManager
+from services.results_sink import SqliteBackend
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="counts open file descriptors through /proc")
+def test_sqlite_backend_closes_its_connections(tmp_path):
+    manager = SimulationManager(save_results=False)
+    manager.start_custom(3, 3, seed=1)
+    for _ in range(10): manager.step()
+    record = manager.result_record()
+    path = str(tmp_path / "results.db")
+    gc.disable()  # a leaked connection must not be rescued by the collector
+    try:
+        backend = SqliteBackend(path)
+        open_files = len(os.listdir("/proc/self/fd"))
+        for _ in range(20): backend.write([record])
+        assert len(os.listdir("/proc/self/fd")) == open_files
+    finally:
+        gc.enable()
+    with closing(sqlite3.connect(path)) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 1
+        assert connection.execute("SELECT COUNT(*) FROM drone_stats").fetchone()[0] == 20 * len(record.drones)
@@ -0,0 +1,12 @@
+# backend/tests/test_simulation_endpoints.py
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+def test_malformed_commands_keep_the_connection():
+    with TestClient(app) as client, client.websocket_connect("/simulation") as websocket:
+        for message in ("[1, 2]", "5", "not json", '"start"', '{"command": "nope"}'): websocket.send_text(message)
+        websocket.send_json({"command": "start", "num_friendly": 3, "num_enemy": 3, "seed": 1})
+        for _ in range(5): frame = websocket.receive_json()
+        assert frame["simulation_state"]["status"] == "running"
@@ -0,0 +1,104 @@
+# backend/tests/test_simulation_runner.py
+import asyncio
+
+import pytest
+
+from manager.simulation_manager import SimulationManager
+from manager.simulation_runner import SimulationRunner
+from core import config
+
+REAL_SLEEP = asyncio.sleep
+
+
+class Session:
+    """A runner on a virtual clock: its sleeps advance the clock instantly, so pacing is exact and the test takes no wall time."""
+
+    def __init__(self, monkeypatch, **settings):
+        self.manager = SimulationManager(save_results=False)
+        if settings: self.manager.configure(**settings)
+        self.manager.start_custom(20, 20, seed=3)
+        self.runner = SimulationRunner(self.manager)
+        self.now = 0.0
+        self.frames = []  # (clock, runner ticks) at every published frame
+        self.runner._publish = lambda: self.frames.append((self.now, self.runner.ticks))
+
+        async def sleep(delay):
+            self.now += max(delay, 1e-9); await REAL_SLEEP(0)  # a vanishing sleep still moves the clock on
+        monkeypatch.setattr(asyncio, "sleep", sleep)
+
+    def run(self, seconds, at=None):
+        """Runs the session until the clock reaches `seconds`; `at` is a {clock: callback} schedule."""
+        async def main():
+            asyncio.get_running_loop().time = lambda: self.now
+            pending = dict(at or {})
+            self.runner.start()
+            while self.now < seconds:
+                for when in [w for w in pending if self.now >= w]: pending.pop(when)()
+                await REAL_SLEEP(0)
+            await self.runner.stop()
+        asyncio.run(main())
+
+    def ticks_per_frame(self):
+        ticks = [t for _, t in self.frames]
+        return [b - a for a, b in zip(ticks, ticks[1:])]
+
+
+def per_frame(speed, frame_rate, dt):
+    return speed / frame_rate / dt
+
+
+@pytest.mark.parametrize("speed, frame_rate", [(4.0, 10.0), (1.0, 60.0), (5.0, 4.0)])
+def test_fast_forward_runs_speed_over_frame_rate_ticks_per_frame(monkeypatch, speed, frame_rate):
+    session = Session(monkeypatch)
+    session.runner.set_playback(speed, frame_rate)
+    session.run(1.0)  # at most 5 simulated seconds, so the battle is still running
+    dt = session.manager.settings.DELTA_TIME
+    # Frames keep to the frame rate, each carrying a frame's worth of fixed DELTA_TIME ticks (one may carry over to the next)
+    assert abs(len(session.frames) - frame_rate) <= 1
+    assert all(abs(n - per_frame(speed, frame_rate, dt)) <= 1 for n in session.ticks_per_frame())
+    assert abs(session.runner.ticks - speed / dt) <= per_frame(speed, frame_rate, dt) + 1
+    assert session.manager.sim_time == pytest.approx(session.runner.ticks * dt)
+    assert session.runner.skipped_ticks == 0
+
+
+def test_playback_change_applies_from_the_next_wake_up(monkeypatch):
+    session = Session(monkeypatch)
+    session.runner.set_playback(4.0, 20.0)
+    session.run(1.5, at={0.5: lambda: session.runner.set_playback(1.0, 4.0)})
+    dt = session.manager.settings.DELTA_TIME
+    early = [n for (when, _), n in zip(session.frames[1:], session.ticks_per_frame()) if when <= 0.5]
+    late = [n for (when, _), n in zip(session.frames[1:], session.ticks_per_frame()) if when > 0.8]
+    assert len(early) >= 9 and all(abs(n - 4.0 / 20.0 / dt) <= 1 for n in early)
+    assert len(late) >= 2 and all(abs(n - 1.0 / 4.0 / dt) <= 1 for n in late)
+    assert session.runner.playback() == {"speed": 1.0, "frame_rate": 4.0}
+    # Speeds are clamped to config.MAX_FAST_FORWARD and frame rates to at least one per second
+    assert session.runner.set_playback(1e6, 0.0) == {"speed": 20.0, "frame_rate": 1.0}
+
+
+def test_ticks_are_paced_by_the_session_delta_time(monkeypatch):
+    session = Session(monkeypatch, DELTA_TIME=1 / 30)
+    session.runner.set_playback(1.0, 60.0)
+    session.run(1.0, at={0.5: lambda: session.runner.configure({"DELTA_TIME": 1 / 20})})
+    # 15 ticks of 1/30 s in the first half second and 10 of 1/20 s in the second, not the global 1/60
+    assert session.runner.ticks == pytest.approx(25, abs=1)
+    assert session.manager.sim_time == pytest.approx(1.0, abs=1 / 20)
+    assert config.DELTA_TIME == 1 / 60 and SimulationManager(save_results=False).settings.DELTA_TIME == 1 / 60
+
+
+@pytest.mark.parametrize("speed, frame_rate, budget", [(1.0, 60.0, 5), (2.0, 30.0, 20)])
+def test_catch_up_after_a_stall_is_capped_and_the_rest_skipped(monkeypatch, speed, frame_rate, budget):
+    session = Session(monkeypatch)
+    session.runner.set_playback(speed, frame_rate)
+    step = session.manager.step
+
+    def stalling_step():
+        step()
+        if session.runner.ticks == 10: session.now += 1.0  # this tick took a whole second of wall time
+    session.manager.step = stalling_step
+    session.run(1.5)
+    dt = session.manager.settings.DELTA_TIME
+    # config.MAX_CATCHUP_TICKS frames' worth of ticks run right after the stall, the rest of the second's backlog is dropped
+    assert budget in session.ticks_per_frame() and max(session.ticks_per_frame()) == budget
+    assert session.runner.skipped_ticks == pytest.approx(speed / dt - budget, abs=per_frame(speed, frame_rate, dt) + 1)
+    assert session.runner.ticks + session.runner.skipped_ticks == pytest.approx(1.5 * speed / dt, abs=per_frame(speed, frame_rate, dt) + 1)
+    assert session.runner.stats()["lag_ms"] < dt * 1000
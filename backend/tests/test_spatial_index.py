@@ -0,0 +1,39 @@
+# backend/tests/test_spatial_index.py
+import numpy as np
+import pytest
+
+from core.spatial_index import SpatialIndex
+from core.swarm_state import ENEMY, FRIENDLY, SwarmState
+
+
+def make_state(position, team):
+    state = SwarmState()
+    state.position = np.asarray(position, dtype=float).reshape(-1, 2)
+    state.team = np.asarray(team, dtype=np.int8)
+    state.ids = [f"d{i}" for i in range(len(state.team))]
+    return state
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("size, extent", [(300, 2000), (3000, 300)])
+def test_nearest_each_matches_nearest(seed, size, extent):
+    rng = np.random.default_rng(seed)
+    # A cluster (sparse, or dense enough to split cells), far outliers and duplicated points, so ties are exercised
+    position = np.concatenate([rng.uniform(0, extent, (size, 2)), rng.uniform(-5000, 9000, (10, 2))]).round(0)
+    position[10:20] = position[0]
+    team = rng.integers(0, 2, len(position))
+    index = SpatialIndex(cell_size=100.0); index.sync(make_state(position, team))
+    points = np.concatenate([rng.uniform(-1000, 3000, (200, 2)), position[:30]])
+    for t in (FRIENDLY, ENEMY, None):
+        expected = [index.nearest(p, k=1, team=t)[0] for p in points]
+        assert index.nearest_each(points, team=t).tolist() == expected
+
+
+def test_nearest_each_small_and_empty_teams():
+    index = SpatialIndex(cell_size=10.0)
+    index.sync(make_state([[0, 0], [1000, 1000], [5, 5]], [FRIENDLY, ENEMY, FRIENDLY]))
+    assert index.nearest_each([[4, 4], [-9000, 0]], team=FRIENDLY).tolist() == [2, 0]
+    assert index.nearest_each([[0, 0]], team=ENEMY).tolist() == [1]
+    index.sync(make_state([[0, 0]], [FRIENDLY]))
+    assert index.nearest_each([[1, 1], [2, 2]], team=ENEMY).tolist() == [-1, -1]
+    assert index.nearest_each(np.zeros((0, 2)), team=FRIENDLY).tolist() == []
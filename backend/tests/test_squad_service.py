@@ -0,0 +1,58 @@
+# backend/tests/test_squad_service.py
+import numpy as np
+
+from core.simulation_settings import SimulationSettings
+from core.swarm_state import ENEMY
+from manager.simulation_manager import SimulationManager
+from services.squad_service import EnemyClusterer, form_squads
+
+
+def started(num_friendly, num_enemy, **settings):
+    manager = SimulationManager(save_results=False, settings=SimulationSettings.defaults(AI_INTELLIGENCE_LEVEL="squad", MAX_CUSTOM_DRONES_PER_TEAM=200, **settings))
+    manager.start_custom(num_friendly, num_enemy, seed=5)
+    return manager
+
+
+def test_cluster_shapes_and_warm_start():
+    manager = started(60, 100, SQUAD_SIZE=24)
+    swarm, settings = manager.swarm, manager.settings
+    enemy = swarm.team_indices(ENEMY)
+    clusterer = EnemyClusterer()
+    labels, centroids = clusterer.cluster(swarm, enemy, settings)
+    assert labels.shape == (100,) and centroids.shape[1] == 4
+    assert 1 <= len(centroids) <= 5  # ceil(100 / 24) seeds, minus any that ended up empty
+    assert set(labels.tolist()) == set(range(len(centroids)))  # dense labels
+    for k in range(len(centroids)):
+        assert np.allclose(centroids[k, :2], swarm.position[enemy[labels == k]].mean(axis=0))
+    # Deterministic; warm starts on an unchanged swarm keep refining (Lloyd steps) until the clusters are fixed
+    again, _ = EnemyClusterer().cluster(swarm, enemy, settings)
+    assert (again == labels).all()
+    for _ in range(20): warm, warm_centroids = clusterer.cluster(swarm, enemy, settings)
+    assert len(warm_centroids) <= len(centroids)
+    assert (clusterer.cluster(swarm, enemy, settings)[0] == warm).all()
+    empty, _ = clusterer.cluster(swarm, enemy[:0], settings)
+    assert empty.shape == (0,) and len(clusterer.centroids) == 0
+
+
+def test_form_squads_quotas():
+    rng = np.random.default_rng(2)
+    positions = rng.uniform(0, 1000, (50, 2))
+    centroids = np.hstack([rng.uniform(0, 1000, (4, 2)), np.zeros((4, 2))])
+    squads = form_squads(positions, centroids, np.array([1.0, 3.0, 0.2, 5.8]))
+    sizes = np.bincount(squads, minlength=4)
+    assert squads.shape == (50,) and (squads >= 0).all() and sizes.sum() == 50
+    assert sizes.tolist() == [5, 15, 1, 29]  # largest remainder of 50 * weights / 10, every cluster at least one
+    # Fewer drones than clusters: the heaviest clusters get one each
+    assert sorted(form_squads(positions[:2], centroids, np.array([1.0, 3.0, 0.2, 5.8])).tolist()) == [1, 3]
+    assert (form_squads(positions[:0], centroids, np.ones(4)) == -1).all()
+
+
+def test_squad_decisions_cover_every_friendly():
+    manager = started(60, 100)
+    for _ in range(30): manager.step()
+    swarm = manager.swarm
+    friendly_ids = {swarm.ids[f] for f in np.flatnonzero(swarm.team != ENEMY)}
+    decisions = manager.planner.decisions
+    assert set(decisions) == friendly_ids
+    enemy_ids = {swarm.ids[e] for e in swarm.team_indices(ENEMY)} | set(swarm.asset_ids)
+    assert all(d.get("target_id") is None or d["target_id"] in enemy_ids for d in decisions.values())
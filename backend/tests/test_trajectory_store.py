@@ -0,0 +1,58 @@
+# backend/tests/test_trajectory_store.py
+import numpy as np
+import pytest
+
+from core import config
+from core.swarm_state import DRONE_TYPES, TEAMS
+from core.trajectory_store import DEAD, TrajectoryStore, TrajectoryWriter
+from manager.simulation_manager import SimulationManager
+
+
+def test_recorded_run_reads_back_tick_by_tick_and_drone_by_drone(tmp_path, monkeypatch):
+    # A chunk size that is no multiple of the stride, so the run ends on a partly filled chunk
+    monkeypatch.setattr(config, "TRAJECTORY_DIR", str(tmp_path)); monkeypatch.setattr(config, "TRAJECTORY_CHUNK_TICKS", 7); monkeypatch.setattr(config, "TRAJECTORY_STRIDE", 2)
+    manager = SimulationManager(save_results=False)
+    manager.start_custom(15, 15, seed=5)
+    ids, teams, types = list(manager.swarm.ids), manager.swarm.team.tolist(), manager.swarm.type.tolist()
+    expected = []  # every recorded tick as {drone id: (position, velocity, health, status)}
+    for tick in range(400):
+        if manager.status != "running": break
+        manager.step()
+        swarm = manager.swarm
+        if tick % 2 == 0: expected.append((manager.sim_time, {d: (swarm.position[r].copy(), swarm.velocity[r].copy(), swarm.health[r], swarm.status[r]) for r, d in enumerate(swarm.ids)}))
+    manager.reset()  # closes the trajectory if the battle is still going
+
+    store = TrajectoryStore(str(next(tmp_path.iterdir())))
+    assert len(store) == len(expected) and store.meta["complete"] and store.ids == ids
+    assert store.meta["teams"] == [TEAMS[t] for t in teams] and store.meta["types"] == [DRONE_TYPES[t] for t in types]
+    for tick, (sim_time, drones) in enumerate(expected):
+        record = store.at_tick(tick)
+        assert record["time"] == sim_time
+        assert store.alive(tick).tolist() == [d in drones for d in ids]
+        for d, (position, velocity, health, status) in drones.items():
+            slot = store.slot(d)
+            np.testing.assert_array_equal(record["position"][slot], position.astype(np.float32))
+            np.testing.assert_array_equal(record["velocity"][slot], velocity.astype(np.float32))
+            assert record["health"][slot] == int(health) and record["status"][slot] == status
+    # A drone's history is the same records sliced the other way; after its removal the slot stays DEAD
+    lost = next(d for d in ids if d not in expected[-1][1])
+    history = store.drone(lost)
+    gone = [lost not in drones for _, drones in expected].index(True)
+    assert (history["status"][gone:] == DEAD).all() and np.isnan(history["position"][gone:]).all()
+    assert (history["status"][:gone] != DEAD).all()
+    np.testing.assert_array_equal(history["time"], [sim_time for sim_time, _ in expected])
+    with pytest.raises(KeyError): store.slot("nobody")
+
+
+def test_a_reader_sees_every_flushed_chunk_while_the_run_is_still_written(tmp_path):
+    manager = SimulationManager(save_results=False)
+    manager.start_custom(5, 5, seed=1)
+    writer = TrajectoryWriter(str(tmp_path / "live.traj"), manager.swarm, manager.settings.DELTA_TIME, chunk_ticks=10)
+    for tick in range(25):
+        manager.step(); writer.append(manager.swarm, manager.sim_time)
+        if tick == 14: assert len(TrajectoryStore(writer.path)) == 10 and not TrajectoryStore(writer.path).meta["complete"]
+    assert len(TrajectoryStore(writer.path)) == 20  # the last five ticks are still buffered
+    writer.close({"winner": "none"})
+    store = TrajectoryStore(writer.path)
+    assert len(store) == 25 and store.meta["complete"] and store.meta["results"] == {"winner": "none"}
+    np.testing.assert_array_equal(store.position[-1][manager.swarm.uid], manager.swarm.position.astype(np.float32))
@@ -10,7 +10,7 @@ import CommunicationPanel from './components/CommunicationPanel';
 
 function App() {
     const [worldDimensions, setWorldDimensions] = useState(null);
-    const { data, isConnected, startGame, pauseGame, resumeGame, resetGame } = useSimulation();
+    const { data, isConnected, startGame, pauseGame, resumeGame, resetGame, setSpeed, configure } = useSimulation();
 
     useEffect(() => {
         const fetchWorldConfig = async () => {
@@ -69,7 +69,7 @@ function App() {
                 <div className="flex-grow flex flex-col gap-4 w-3/5">
                     <ControlPanel
                         status={data.simulation_state.status}
-                        onStart={startGame} onPause={pauseGame} onResume={resumeGame} onReset={resetGame}
+                        onStart={startGame} onPause={pauseGame} onResume={resumeGame} onReset={resetGame} onSpeed={setSpeed} onConfigure={configure}
                     />
                     <div className="flex-grow relative border-2 border-gray-700 rounded-lg">
                         <SimulationScreen
@@ -3,15 +3,38 @@ import React from 'react';
 
 const AnalysisPanel = ({ analysisData }) => {
     const targets = analysisData?.coordination_targets ?? [];
+    const counts = analysisData?.swarm_state ?? [];
+    const coverage = analysisData?.asset_coverage ?? [];
+    const killRate = analysisData?.kill_rate;
     return (
         <div className="bg-gray-800 p-4 rounded-lg h-1/2 flex flex-col">
             <h2 className="text-xl font-bold mb-2 border-b border-gray-600 pb-2">Coordination Targets</h2>
+            {(counts.length > 0 || killRate) && (
+                <div className="text-sm mb-2 border-b border-gray-700 pb-2">
+                    {counts.map((c, i) => (
+                        <span key={i} className={`mr-3 ${c.team === 'enemy' ? 'text-red-400' : 'text-cyan-400'}`}>
+                            {c.status}: {c.count}
+                        </span>
+                    ))}
+                    {killRate && (
+                        <p className="text-gray-300">
+                            Kills/min ({killRate.window_sec}s): {killRate.neutralizations_per_min} · Losses/min: {killRate.losses_per_min}
+                        </p>
+                    )}
+                    {coverage.map((a) => (
+                        <p key={a.asset_id} className="text-gray-300">
+                            {a.asset_id}: {a.defenders} defenders / <span className="text-red-400">{a.threats} threats</span>
+                            {a.nearest_threat !== null && ` (nearest ${Math.round(a.nearest_threat)}m)`}
+                        </p>
+                    ))}
+                </div>
+            )}
             <div className="overflow-y-auto">
                 {targets.length > 0 ? (
                     targets.map((t, i) => (
                         <p key={i} className="text-base">
-                            F:[<span className="text-cyan-400">{t.source_id.slice(-4)}</span>] → 
-                            E:[<span className="text-red-400">{t.target_id.slice(-4)}</span>] 
+                            F:[<span className="text-cyan-400">{t.source_id.slice(-4)}</span>] →
+                            E:[<span className="text-red-400">{t.target_id.slice(-4)}</span>]
                             @ {t.distance}m
                         </p>
                     ))
@@ -23,4 +46,4 @@ const AnalysisPanel = ({ analysisData }) => {
     );
 };
 
-export default AnalysisPanel;
\ No newline at end of file
+export default AnalysisPanel;
@@ -1,21 +1,11 @@
 // frontend/src/components/ControlPanel.js
 import React, { useState } from 'react';
 
-const ControlPanel = ({ status, onStart, onPause, onResume, onReset }) => {
+const ControlPanel = ({ status, onStart, onPause, onResume, onReset, onSpeed, onConfigure }) => {
     const [friendlyCount, setFriendlyCount] = useState(8);
     const [enemyCount, setEnemyCount] = useState(12);
 
-    const sendConfig = async (endpoint, value) => {
-        try {
-            await fetch(`http://localhost:8000/config/${endpoint}`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(value),
-            });
-        } catch (error) { console.error(`Failed to set ${endpoint}:`, error); }
-    };
-    const setSpeed = (speed) => sendConfig('speed', { multiplier: speed });
-    const setAiLevel = (level) => sendConfig('ai_level', { level: level });
+    const setAiLevel = (level) => onConfigure({ AI_INTELLIGENCE_LEVEL: level });
 
     const handleStart = () => {
         onStart({
@@ -58,12 +48,14 @@ const ControlPanel = ({ status, onStart, onPause, onResume, onReset }) => {
                     <button onClick={() => setAiLevel('basic')} className="bg-gray-600 hover:bg-gray-500 px-3 py-1 rounded">Basic</button>
                     <button onClick={() => setAiLevel('normal')} className="bg-gray-600 hover:bg-gray-500 px-3 py-1 rounded">Normal</button>
                     <button onClick={() => setAiLevel('advanced')} className="bg-gray-600 hover:bg-gray-500 px-3 py-1 rounded">Advanced</button>
+                    <button onClick={() => setAiLevel('squad')} className="bg-gray-600 hover:bg-gray-500 px-3 py-1 rounded">Squad</button>
                 </div>
                 <div className="flex items-center gap-2">
                     <span className="font-bold">Speed:</span>
-                    <button onClick={() => setSpeed(0.5)} className="bg-gray-600 hover:bg-gray-500 px-3 py-1 rounded">0.5x</button>
-                    <button onClick={() => setSpeed(1)} className="bg-gray-600 hover:bg-gray-500 px-3 py-1 rounded">1x</button>
-                    <button onClick={() => setSpeed(2)} className="bg-gray-600 hover:bg-gray-500 px-3 py-1 rounded">2x</button>
+                    <button onClick={() => onSpeed(0.5)} className="bg-gray-600 hover:bg-gray-500 px-3 py-1 rounded">0.5x</button>
+                    <button onClick={() => onSpeed(1)} className="bg-gray-600 hover:bg-gray-500 px-3 py-1 rounded">1x</button>
+                    <button onClick={() => onSpeed(2)} className="bg-gray-600 hover:bg-gray-500 px-3 py-1 rounded">2x</button>
+                    <button onClick={() => onSpeed(10)} className="bg-gray-600 hover:bg-gray-500 px-3 py-1 rounded">10x</button>
                 </div>
             </div>
         </div>
@@ -0,0 +1,87 @@
+// frontend/src/hooks/deltaDecoder.js
+// Decodes the binary keyframe/delta stream (see backend/services/stream_codec.py) back into
+// the same frame shape the JSON stream delivers, so components don't care which one is in use.
+
+const HEADER_BYTES = 16;
+const KEYFRAME = 0;
+const LOG_TAIL = 20;
+const textDecoder = new TextDecoder();
+
+export const createDeltaDecoder = () => {
+    let drones = new Map(); // uid -> drone (target kept as the raw packed value)
+    let ids = new Map();    // uid -> drone id string
+    let events = new Map();
+    let log = [];
+    let tables = null;
+    let assets = [];
+    let analysis = { coordination_targets: [], swarm_state: [] };
+
+    const resolveTarget = (target) => {
+        if (target === -1) return null;
+        if (target >= 0) return ids.get(target) ?? null;
+        return assets[-2 - target]?.id ?? null;
+    };
+
+    return (buffer) => {
+        const view = new DataView(buffer);
+        const kind = view.getUint8(1);
+        const metaLength = view.getUint32(8, true);
+        const count = view.getUint32(12, true);
+        const meta = JSON.parse(textDecoder.decode(new Uint8Array(buffer, HEADER_BYTES, metaLength)));
+
+        // Column blocks; every offset stays 4-byte aligned so typed-array views work directly
+        let offset = HEADER_BYTES + metaLength;
+        const column = (ArrayType, width = 1) => {
+            const values = new ArrayType(buffer, offset, count * width);
+            offset += values.byteLength;
+            return values;
+        };
+        const uid = column(Uint32Array);
+        const position = column(Float32Array, 2);
+        const velocity = column(Float32Array, 2);
+        const target = column(Int32Array);
+        const health = column(Int16Array);
+        const status = column(Uint8Array);
+        const team = column(Uint8Array);
+        const type = column(Uint8Array);
+
+        if (kind === KEYFRAME) {
+            drones = new Map();
+            ids = new Map();
+            events = new Map();
+            log = [];
+            tables = meta.tables;
+        }
+        Object.entries(meta.ids || {}).forEach(([key, id]) => ids.set(Number(key), id));
+        if (meta.assets) assets = meta.assets;
+        if (meta.analysis) analysis = meta.analysis;
+        (meta.removed || []).forEach((removedUid) => drones.delete(removedUid));
+
+        for (let i = 0; i < count; i++) {
+            drones.set(uid[i], {
+                id: ids.get(uid[i]),
+                team: tables.teams[team[i]],
+                type: tables.types[type[i]],
+                position: { x: position[2 * i], y: position[2 * i + 1] },
+                velocity: { x: velocity[2 * i], y: velocity[2 * i + 1] },
+                status: tables.statuses[status[i]],
+                health: health[i],
+                target: target[i],
+            });
+        }
+
+        (meta.expired || []).forEach((eventId) => events.delete(eventId));
+        (meta.events || []).forEach((event) => events.set(event.id, event));
+        log = log.concat(meta.log || []).slice(-LOG_TAIL);
+
+        return {
+            simulation_state: meta.simulation_state,
+            metrics: meta.metrics,
+            analysis,
+            drones: Array.from(drones.values(), ({ target: packedTarget, ...drone }) => ({ ...drone, target_id: resolveTarget(packedTarget) })),
+            assets,
+            visual_events: Array.from(events.values()),
+            event_log: log,
+        };
+    };
+};
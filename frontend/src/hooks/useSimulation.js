@@ -1,11 +1,18 @@
 // frontend/src/hooks/useSimulation.js
 import { useState, useEffect, useCallback } from 'react';
+import { createDeltaDecoder } from './deltaDecoder';
 
 const wsClient = {
     instance: null,
 };
 
-const SIMULATION_WEBSOCKET_URL = "ws://localhost:8000/simulation";
+// Ask for the compact binary keyframe/delta stream; plain JSON frames are still understood
+// in case the server doesn't support it.
+const STREAM_ENCODING = "delta";
+// Open the app with ?session=<id> to watch a shared session (created with POST /sessions)
+const SESSION_ID = new URLSearchParams(window.location.search).get("session");
+const SIMULATION_WEBSOCKET_URL = `ws://localhost:8000/simulation?encoding=${STREAM_ENCODING}`
+    + (SESSION_ID ? `&session_id=${encodeURIComponent(SESSION_ID)}` : "");
 
 export const useSimulation = () => {
     const [isConnected, setIsConnected] = useState(false);
@@ -25,7 +32,9 @@ export const useSimulation = () => {
         }
 
         const ws = new WebSocket(SIMULATION_WEBSOCKET_URL);
+        ws.binaryType = "arraybuffer";
         wsClient.instance = ws;
+        const decodeFrame = createDeltaDecoder();
 
         ws.onopen = () => {
             console.log("WebSocket Connection Established.");
@@ -33,7 +42,7 @@ export const useSimulation = () => {
         };
 
         ws.onmessage = (event) => {
-            const receivedData = JSON.parse(event.data);
+            const receivedData = typeof event.data === "string" ? JSON.parse(event.data) : decodeFrame(event.data);
             setData(receivedData);
         };
 
@@ -64,6 +73,12 @@ export const useSimulation = () => {
     const startGame = (payload) => sendCommand('start', payload);
     const pauseGame = () => sendCommand('pause');
     const resumeGame = () => sendCommand('resume');
+    // Replay sessions only: jump to a recorded tick
+    const seekTo = (tick) => sendCommand('seek', { tick });
+    // Fast-forward / slow motion: more fixed-size ticks per streamed frame, physics unchanged
+    const setSpeed = (speed) => sendCommand('speed', { speed });
+    // Settings (AI level, ranges, ...) belong to this connection's session, not the whole server
+    const configure = (settings) => sendCommand('configure', { settings });
 
     // --- THE FIX: The resetGame function is now much simpler ---
     // It no longer manually sets the data to null.
@@ -73,5 +88,5 @@ export const useSimulation = () => {
     };
     // -----------------------------------------------------------
 
-    return { data, isConnected, startGame, pauseGame, resumeGame, resetGame };
+    return { data, isConnected, startGame, pauseGame, resumeGame, resetGame, seekTo, setSpeed, configure };
 };
\ No newline at end of file